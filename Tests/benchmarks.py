@@ -0,0 +1,242 @@
+"""Benchmarks for linear_algebra module.
+Run from Tests directory:
+  python benchmarks.py - compare algorithms (blocked and Strassen multiplication, worker processes)
+  python benchmarks.py suite [--output results.json] [--quick] - measure ops/sec and allocations of hot paths
+  python benchmarks.py compare base.json new.json [--threshold 0.1] - flag regressions of new run (exit code 1)
+"""
+import sys
+import os
+import gc
+import json
+import platform
+import random
+import timeit
+import argparse
+try:
+  import tracemalloc
+except ImportError:
+  tracemalloc = None
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+
+
+def randomMatrix(m, n):
+  """Get Matrix m x n with random components"""
+  return Matrix([[random.uniform(-50, 50) for j in range(n)] for i in range(m)])
+
+def randomVector(n):
+  """Get Vector of size n with random components"""
+  return Vector([random.uniform(-50, 50) for i in range(n)])
+
+def bestTime(func, repeat=3):
+  """Get best of several wall times (in seconds) of single func() call"""
+  return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def opsPerSec(func, repeat=5, minTime=0.2):
+  """Get calls of func per second: number of calls per timing is doubled until it takes minTime, best of repeat"""
+  number = 1
+  while timeit.timeit(func, number=number) < minTime:
+    number *= 2
+  return number / min(timeit.repeat(func, number=number, repeat=repeat))
+
+def allocations(func):
+  """
+    Get tuple (allocations, peakBytes) of single func() call with its result kept alive:
+    memory blocks allocated and peak traced memory if tracemalloc is available (Python 3),
+    otherwise new objects tracked by garbage collector and None
+  """
+  gc.collect()
+  if tracemalloc is not None:
+    tracemalloc.start()
+    try:
+      before = tracemalloc.take_snapshot()
+      if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+      result = func()
+      after = tracemalloc.take_snapshot()
+      peak = tracemalloc.get_traced_memory()[1]
+    finally:
+      tracemalloc.stop()
+    ignored = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    after, before = after.filter_traces(ignored), before.filter_traces(ignored)
+    return sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno")), peak
+  before = len(gc.get_objects())
+  result = func()
+  return len(gc.get_objects()) - before, None
+
+
+#=============
+#  References
+#=============
+
+def naiveMul(a, b):
+  """Matrix product by element-wise triple loop (Matrix.__mul__ before the blocked kernel)"""
+  res = Matrix(a.m, b.n)
+  for x in range(res.m):
+    for y in range(res.n):
+      res[x,y] = sum([a[x,z]*b[z,y] for z in range(a.n)])
+  return res
+
+
+#=============
+#  Benchmarks
+#=============
+
+def benchMul(sizes=(50, 100, 200)):
+  """Compare Matrix.__mul__ with the naive triple loop"""
+  for size in sizes:
+    a = randomMatrix(size, size)
+    b = randomMatrix(size, size)
+    naive = bestTime(lambda: naiveMul(a, b))
+    blocked = bestTime(lambda: a*b)
+    print("mul {0}x{0}: naive {1:.4f}s, blocked {2:.4f}s, speedup {3:.1f}x".format(size, naive, blocked, naive/blocked))
+
+def benchStrassen(sizes=(32, 48, 64, 96, 128, 192, 256)):
+  """
+    Compare one level of Strassen-Winograd recursion with the classical kernel.
+    Reports the smallest size where Strassen wins: a good crossover for setMulAlgorithm
+  """
+  algorithm = getMulAlgorithm()
+  crossover = None
+  try:
+    for size in sizes:
+      a = randomMatrix(size, size)
+      b = randomMatrix(size, size)
+      setMulAlgorithm("classical")
+      classical = bestTime(lambda: a*b)
+      setMulAlgorithm("strassen", size - 1)
+      strassen = bestTime(lambda: a*b)
+      print("mul {0}x{0}: classical {1:.4f}s, strassen {2:.4f}s, speedup {3:.2f}x".format(size, classical, strassen, classical/strassen))
+      if crossover is None and strassen < classical:
+        crossover = size
+  finally:
+    setMulAlgorithm(*algorithm)
+  if crossover is None:
+    print("strassen crossover: not reached up to {0}".format(sizes[-1]))
+  else:
+    print("strassen crossover: {0} (use setMulAlgorithm(\"strassen\", {1}))".format(crossover, crossover - 1))
+
+def benchParallel(size=300, processes=(2, 4)):
+  """Compare serial Matrix.__mul__ with row blocks computed in worker processes"""
+  parallel = getParallel()
+  a = randomMatrix(size, size)
+  b = randomMatrix(size, size)
+  try:
+    setParallel(1)
+    serial = bestTime(lambda: a*b)
+    print("mul {0}x{0}: serial {1:.4f}s".format(size, serial))
+    for count in processes:
+      setParallel(count, 1)
+      elapsed = bestTime(lambda: a*b)
+      print("mul {0}x{0}: {1} processes {2:.4f}s, speedup {3:.2f}x".format(size, count, elapsed, serial/elapsed))
+  finally:
+    setParallel(*parallel)
+
+
+#========
+#  Suite
+#========
+
+def suiteCases(quick=False):
+  """Get list of (name, size, func) of hot paths of Vector and Matrix with parametrized sizes"""
+  vectorSizes = (10, 1000) if quick else (10, 1000, 100000)
+  matrixSizes = (10, 30) if quick else (10, 50, 100)
+  cases = []
+  for n in vectorSizes:
+    values = [random.uniform(-50, 50) for i in range(n)]
+    x, y = randomVector(n), randomVector(n)
+    cases += [
+      ("Vector(list)", n, lambda values=values: Vector(values)),
+      ("Vector.dot", n, lambda x=x, y=y: x.dot(y)),
+      ("Vector.normalize", n, lambda x=x: x.normalize()),
+      ("Vector.__eq__", n, lambda x=x, y=x.copy(): x == y),
+    ]
+  x, y = randomVector(3), randomVector(3)
+  cases.append(("Vector.cross", 3, lambda: x.cross(y)))
+  for n in matrixSizes:
+    rows = [[random.uniform(-50, 50) for j in range(n)] for i in range(n)]
+    a, b = Matrix(rows), randomMatrix(n, n)
+    cases += [
+      ("Matrix(list)", n, lambda rows=rows: Matrix(rows)),
+      ("Matrix.__mul__", n, lambda a=a, b=b: a*b),
+      ("Matrix.transpose", n, lambda a=a: a.transpose()),
+      ("Matrix.det", n, lambda a=a: a.det()),
+      ("Matrix.getCol", n, lambda a=a, n=n: a.getCol(n // 2)),
+      ("Matrix.__eq__", n, lambda a=a, b=a.copy(): a == b),
+    ]
+    if n <= 50:
+      symmetric = a + a.transpose()
+      cases.append(("Matrix.eigenvalues", n, lambda a=symmetric: a.eigenvalues()))
+  return cases
+
+def runSuite(quick=False, repeat=5, minTime=0.2):
+  """
+    Get results of benchmark suite as dict: "meta" (interpreter, backend) and "results" with
+    {"opsPerSec", "allocations", "peakBytes"} by case "name[size]". Caching is disabled, so each
+    call recomputes derived results (det, eigenvalues, magnitude)
+  """
+  caching = getCaching()
+  setCaching(False)
+  results = {}
+  try:
+    for name, size, func in suiteCases(quick):
+      key = "{0}[{1}]".format(name, size)
+      allocated, peak = allocations(func)
+      results[key] = {"opsPerSec": opsPerSec(func, repeat, minTime), "allocations": allocated, "peakBytes": peak}
+      print("{0:28} {1:14.1f} ops/sec {2:8} allocations".format(key, results[key]["opsPerSec"], allocated))
+  finally:
+    setCaching(caching)
+  meta = {"python": platform.python_version(), "implementation": platform.python_implementation(), "backend": getBackend()}
+  return {"meta": meta, "results": results}
+
+def compareRuns(base, new, threshold=0.1):
+  """
+    Get list of regressions of new run against base run (dicts returned by runSuite): cases which
+    ops/sec dropped or allocations grew by more than threshold (relative). Prints comparison table
+  """
+  regressions = []
+  for key in sorted(set(base["results"]) & set(new["results"])):
+    old, cur = base["results"][key], new["results"][key]
+    ratio = cur["opsPerSec"] / old["opsPerSec"]
+    flags = []
+    if ratio < 1 - threshold:
+      flags.append("slower")
+    if cur["allocations"] > old["allocations"]*(1 + threshold) and cur["allocations"] - old["allocations"] > 1:
+      flags.append("more allocations")
+    if flags:
+      regressions.append((key, flags))
+    print("{0:28} {1:6.2f}x ops/sec {2:8} -> {3:<8} allocations {4}".format(key, ratio, old["allocations"], cur["allocations"], ", ".join(flags)))
+  if base["meta"] != new["meta"]:
+    print("warning: runs differ in {0} and {1}".format(base["meta"], new["meta"]))
+  return regressions
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="Benchmarks for linear_algebra module")
+  commands = parser.add_subparsers(dest="command")
+  suite = commands.add_parser("suite", help="measure ops/sec and allocations of hot paths")
+  suite.add_argument("--output", help="JSON file to write results to")
+  suite.add_argument("--quick", action="store_true", help="use small sizes only")
+  compare = commands.add_parser("compare", help="compare two runs of the suite")
+  compare.add_argument("base")
+  compare.add_argument("new")
+  compare.add_argument("--threshold", type=float, default=0.1, help="relative change treated as regression")
+  args = parser.parse_args() if len(sys.argv) > 1 else None
+  if args is None:
+    benchMul()
+    benchStrassen()
+    benchParallel()
+  elif args.command == "suite":
+    results = runSuite(args.quick)
+    if args.output:
+      with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+  else:
+    with open(args.base) as f:
+      base = json.load(f)
+    with open(args.new) as f:
+      new = json.load(f)
+    regressions = compareRuns(base, new, args.threshold)
+    for key, flags in regressions:
+      print("REGRESSION {0}: {1}".format(key, ", ".join(flags)))
+    sys.exit(1 if regressions else 0)
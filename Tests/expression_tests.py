@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+import linear_algebra
+
+def randomMatrix(m, n):
+  """Get Matrix m x n with random integer components"""
+  return Matrix([[random.randint(-9, 9) for j in range(n)] for i in range(m)])
+
+class TestExpressionConstructor(unittest.TestCase):
+
+  def test_lazy(self):
+    a = randomMatrix(2, 3)
+    self.assertIsInstance(a.lazy(), Expression)
+    self.assertIsInstance(Vector([1,2]).lazy(), Expression)
+    self.assertEqual(a.lazy().evaluate(), a)
+    self.assertIsNot(a.lazy().evaluate(), a)
+    with self.assertRaises(TypeError):
+      Expression([[1,2]])
+
+
+class TestExpressionOperators(unittest.TestCase):
+
+  def setUp(self):
+    self.a = randomMatrix(3, 4)
+    self.b = randomMatrix(3, 4)
+    self.c = randomMatrix(4, 2)
+    self.d = randomMatrix(3, 2)
+
+  def test_elementwise(self):
+    a, b = self.a, self.b
+    self.assertEqual((a.lazy() + b).evaluate(), a + b)
+    self.assertEqual((a.lazy() - b - a).evaluate(), a - b - a)
+    self.assertEqual((b + a.lazy()).evaluate(), b + a)
+    self.assertEqual((b - a.lazy()).evaluate(), b - a)
+    self.assertEqual((-a.lazy() + 2*b.lazy() - a.lazy()/2).evaluate(), -a + 2*b - a/2)
+    self.assertEqual(sum([a.lazy(), b, a]).evaluate(), a + b + a)
+    self.assertEqual((Vector([1,2]).lazy()*3 - Vector([4,5])).evaluate(), Vector([-1,1]))
+    with self.assertRaises(MatrixError):
+      a.lazy() + self.c
+    with self.assertRaises(VectorError):
+      Vector([1,2]).lazy() + Vector([1,2,3])
+    with self.assertRaises(TypeError):
+      a.lazy() + Vector([1,2])
+    with self.assertRaises(TypeError):
+      a.lazy() + 5
+
+  def test_mul(self):
+    a, b, c, d = self.a, self.b, self.c, self.d
+    self.assertEqual(((a.lazy() + b)*c - 2*d).evaluate(), (a + b)*c - 2*d)
+    self.assertEqual((a.lazy()*c*Vector([1,2])).evaluate(), a*c*Vector([1,2]))
+    self.assertEqual((Vector([1,2,3])*a.lazy()).evaluate(), Vector([1,2,3])*a)
+    self.assertEqual((Vector([1,2]).lazy()*Vector([3,4])).evaluate(), 11)
+    with self.assertRaises(MatrixError):
+      a.lazy()*b
+    with self.assertRaises(VectorError):
+      Vector([1,2]).lazy()*Vector([1,2,3])
+    with self.assertRaises(TypeError):
+      a.lazy()*"asd"
+
+  def test_chain(self):
+    m = [randomMatrix(10, 30), randomMatrix(30, 5), randomMatrix(5, 20), randomMatrix(20, 2)]
+    self.assertEqual((m[0].lazy()*m[1]*m[2]*m[3]).evaluate(), m[0]*m[1]*m[2]*m[3])
+    self.assertEqual(linear_algebra._chainOrder([10, 100, 5, 50])[0][2], 1)
+    self.assertEqual(linear_algebra._chainOrder([50, 5, 100, 10])[0][2], 0)
+
+  def test_operands_referenced(self):
+    a = randomMatrix(2, 2)
+    e = a.lazy() + a
+    a[0,0] = 100
+    self.assertEqual(e.evaluate()[0,0], 200)
+
+  def test_scalar_expression_is_lazy(self):
+    x, y = Vector([1,2]), Vector([3,4])
+    e = (x.lazy()*y)*self.a + 2*(self.a.lazy()*(y.lazy()*x))
+    self.assertEqual(repr(e), "((Vector<2> * Vector<2>) * Matrix<3x4> + 2.0 * (Vector<2> * Vector<2>) * Matrix<3x4>)")
+    x[0] = 2
+    self.assertEqual(e.evaluate(), 42*self.a)
+
+  def test_repr(self):
+    e = (self.a.lazy() + self.b)*self.c
+    self.assertEqual(repr(e), "((Matrix<3x4> + Matrix<3x4>) * Matrix<4x2>)")
+
+if __name__ == '__main__':
+  unittest.main()
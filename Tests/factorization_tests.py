@@ -0,0 +1,149 @@
+import unittest
+import sys
+import os
+import random
+import math
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+
+def randomSPD(n):
+  """Get random symmetric positive-definite matrix"""
+  x = Matrix([[random.uniform(-5, 5) for j in range(n)] for i in range(n+3)])
+  return x.transpose()*x + Matrix.Identity(n)
+
+class TestLUFactorization(unittest.TestCase):
+
+  def test_constructor(self):
+    with self.assertRaises(TypeError):
+      LUFactorization([[1,2], [3,4]])
+    with self.assertRaises(NotImplementedError):
+      LUFactorization(Matrix(2,3))
+    self.assertEqual(LUFactorization(Matrix(3,3)).size, 3)
+
+  def test_det(self):
+    self.assertAlmostEqual(LUFactorization(Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]])).det(), 452)
+    self.assertEqual(LUFactorization(Matrix([[1,2], [2,4]])).det(), 0)
+
+  def test_logdet(self):
+    self.assertAlmostEqual(LUFactorization(Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]])).logdet(), math.log(452))
+    self.assertAlmostEqual(LUFactorization(Matrix([[0,1], [-1,0]])).logdet(), 0)
+    with self.assertRaises(MatrixError):
+      LUFactorization(Matrix([[0,1], [1,0]])).logdet()
+    with self.assertRaises(MatrixError):
+      LUFactorization(Matrix([[1,2], [2,4]])).logdet()
+
+  def test_solve(self):
+    m = Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]])
+    f = LUFactorization(m)
+    for i in range(10):
+      x = Vector([random.uniform(-10, 10) for j in range(4)])
+      for u, v in zip(f.solve((m*x).asVector()), x):
+        self.assertAlmostEqual(u, v)
+    b = Matrix([[random.uniform(-10, 10) for j in range(3)] for i in range(4)])
+    for u, v in zip((m*f.solve(b)).asList(), b.asList()):
+      for x, y in zip(u, v):
+        self.assertAlmostEqual(x, y)
+    with self.assertRaises(MatrixError):
+      f.solve(Vector(3))
+    with self.assertRaises(MatrixError):
+      f.solve(Matrix(3,3))
+    with self.assertRaises(TypeError):
+      f.solve([1,2,3,4])
+
+  def test_singular(self):
+    f = LUFactorization(Matrix([[1,2], [2,4]]))
+    self.assertTrue(f.isSingular())
+    with self.assertRaises(MatrixError):
+      f.solve(Vector([1,2]))
+    with self.assertRaises(MatrixError):
+      f.inverse()
+
+  def test_inverse(self):
+    m = Matrix([[0,2,1,3], [1,0,2,1], [2,1,0,4], [3,1,2,0]])
+    self.assertEqual((m*LUFactorization(m).inverse()).round(10), Matrix.Identity(4))
+
+
+class TestCholeskyFactorization(unittest.TestCase):
+
+  def test_constructor(self):
+    with self.assertRaises(TypeError):
+      CholeskyFactorization([[2,1], [1,2]])
+    with self.assertRaises(MatrixError):
+      CholeskyFactorization(Matrix([[2,1], [0,2]]))
+    with self.assertRaises(MatrixError):
+      CholeskyFactorization(Matrix([[1,2], [2,1]]))
+    with self.assertRaises(MatrixError):
+      CholeskyFactorization(Matrix(2,3))
+    self.assertFalse(CholeskyFactorization(Matrix([[2,1], [1,2]])).isSingular())
+
+  def test_det(self):
+    self.assertAlmostEqual(CholeskyFactorization(Matrix([[4,2], [2,3]])).det(), 8)
+    m = randomSPD(6)
+    self.assertAlmostEqual(CholeskyFactorization(m).det() / m.det(), 1)
+
+  def test_logdet(self):
+    self.assertAlmostEqual(CholeskyFactorization(Matrix([[4,2], [2,3]])).logdet(), math.log(8))
+    m = 1e100*Matrix.Identity(10)
+    self.assertEqual(CholeskyFactorization(m).det(), float("inf"))
+    self.assertAlmostEqual(CholeskyFactorization(m).logdet(), 1000*math.log(10))
+
+  def test_solve(self):
+    m = randomSPD(8)
+    f = CholeskyFactorization(m)
+    for i in range(10):
+      x = Vector([random.uniform(-10, 10) for j in range(8)])
+      for u, v in zip(f.solve((m*x).asVector()), x):
+        self.assertAlmostEqual(u, v)
+    b = Matrix([[random.uniform(-10, 10) for j in range(3)] for i in range(8)])
+    for u, v in zip((m*f.solve(b)).asList(), b.asList()):
+      for x, y in zip(u, v):
+        self.assertAlmostEqual(x, y)
+
+  def test_inverse(self):
+    m = randomSPD(5)
+    self.assertTrue(((m*CholeskyFactorization(m).inverse()) - Matrix.Identity(5)).round(8).isZero())
+
+
+class TestLDLFactorization(unittest.TestCase):
+
+  def test_constructor(self):
+    with self.assertRaises(TypeError):
+      LDLFactorization([[2,1], [1,2]])
+    with self.assertRaises(MatrixError):
+      LDLFactorization(Matrix([[2,1], [0,2]]))
+    with self.assertRaises(MatrixError):
+      LDLFactorization(Matrix([[0,1], [1,0]]))
+    self.assertEqual(LDLFactorization(Matrix([[4,2], [2,3]])).d, Vector([4,2]))
+    self.assertTrue(LDLFactorization(Matrix([[1,1], [1,1]])).isSingular())
+
+  def test_det(self):
+    m = Matrix([[1,2,0], [2,1,1], [0,1,-3]])
+    self.assertAlmostEqual(LDLFactorization(m).det(), m.det())
+    self.assertAlmostEqual(LDLFactorization(m).logdet(), math.log(8))
+    with self.assertRaises(MatrixError):
+      LDLFactorization(Matrix([[1,2], [2,1]])).logdet()
+    m = randomSPD(6)
+    self.assertAlmostEqual(LDLFactorization(m).logdet(), CholeskyFactorization(m).logdet())
+
+  def test_solve(self):
+    for m in (randomSPD(8), randomSPD(8) - 10*Matrix.Identity(8)):
+      f = LDLFactorization(m)
+      x = Vector([random.uniform(-10, 10) for j in range(8)])
+      for u, v in zip(f.solve((m*x).asVector()), x):
+        self.assertAlmostEqual(u, v)
+    b = Matrix([[random.uniform(-10, 10) for j in range(3)] for i in range(8)])
+    self.assertTrue((m*f.solve(b) - b).round(8).isZero())
+    with self.assertRaises(MatrixError):
+      LDLFactorization(Matrix([[1,1], [1,1]])).solve(Vector([1,2]))
+
+  def test_matrix(self):
+    m = randomSPD(4)
+    self.assertIsInstance(m.cholesky(), CholeskyFactorization)
+    self.assertIsInstance(m.ldlt(), LDLFactorization)
+    self.assertIs(m.cholesky(), m.cholesky())
+    self.assertAlmostEqual(m.ldlt().det() / m.det(), 1)
+    with self.assertRaises(MatrixError):
+      Matrix([[1,2], [2,1]]).cholesky()
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+
+def poisson(n):
+  """Get SparseMatrix of 1-D Poisson problem (tridiagonal 2, -1), symmetric positive-definite"""
+  return SparseMatrix(n, n, [(i, j, 2 if i == j else -1) for i in range(n) for j in range(max(0, i-1), min(n, i+2))])
+
+def randomNonsymmetric(n):
+  """Get random diagonally dominant non-symmetric sparse matrix"""
+  triplets = [(i, i, 10 + random.uniform(0, 5)) for i in range(n)]
+  triplets += [(random.randrange(n), random.randrange(n), random.uniform(-1, 1)) for k in range(3*n)]
+  return SparseMatrix(n, n, triplets)
+
+SOLVERS = (solveCG, solveGMRES, solveBiCGSTAB)
+
+class TestKrylovSolvers(unittest.TestCase):
+
+  def assertSolution(self, operator, x, b, places=6):
+    res = operator*x
+    for u, v in zip(res.asVector() if isinstance(res, Matrix) else res, b):
+      self.assertAlmostEqual(u, v, places)
+
+  def test_sparse(self):
+    a = poisson(30)
+    b = Vector([random.uniform(-1, 1) for i in range(30)])
+    for solve in SOLVERS:
+      for preconditioner in (None, "jacobi", "ilu"):
+        self.assertSolution(a, solve(a, b, tolerance=1e-12, preconditioner=preconditioner), b)
+    history = []
+    solveCG(a, b, preconditioner="ilu", callback=lambda *args: history.append(args))
+    self.assertEqual(len(history), 1)
+
+  def test_nonsymmetric(self):
+    a = randomNonsymmetric(40)
+    b = Vector([random.uniform(-1, 1) for i in range(40)])
+    for solve in (solveGMRES, solveBiCGSTAB):
+      for preconditioner in (None, "jacobi", "ilu"):
+        self.assertSolution(a, solve(a, b, tolerance=1e-12, preconditioner=preconditioner), b)
+    self.assertSolution(a, solveGMRES(a, b, tolerance=1e-12, restart=5), b)
+
+  def test_dense(self):
+    x = Matrix([[random.uniform(-1, 1) for j in range(10)] for i in range(12)])
+    a = x.transpose()*x + Matrix.Identity(10)
+    b = Vector([random.uniform(-1, 1) for i in range(10)])
+    for solve in SOLVERS:
+      for u, v in zip(solve(a, b, tolerance=1e-12), a.solve(b)):
+        self.assertAlmostEqual(u, v)
+    s = BandedMatrix(poisson(20).asDense(), 1, 1)
+    b = Vector([1]*20)
+    self.assertSolution(s, solveCG(s, b, tolerance=1e-12, preconditioner="ilu"), b)
+
+  def test_tiled(self):
+    a = poisson(30)
+    t = TiledMatrix.FromMatrix(None, a.asDense(), tileSize=8)
+    try:
+      b = Vector([random.uniform(-1, 1) for i in range(30)])
+      for solve in SOLVERS:
+        self.assertSolution(a, solve(t, b, tolerance=1e-12, preconditioner="jacobi"), b)
+      with self.assertRaises(TypeError):
+        solveCG(t, b, preconditioner="ilu")
+    finally:
+      t.close()
+
+  def test_callable(self):
+    a = poisson(30)
+    calls = []
+    def product(v):
+      calls.append(v)
+      self.assertIsInstance(v, Vector)
+      return a*v
+    b = Vector([1]*30)
+    for solve in SOLVERS:
+      self.assertSolution(a, solve(product, b, tolerance=1e-12), b)
+    self.assertTrue(calls)
+    jacobi = lambda r: r/2
+    self.assertSolution(a, solveCG(lambda v: list(a*v), b, tolerance=1e-12, preconditioner=jacobi), b)
+    with self.assertRaises(TypeError):
+      solveCG(product, b, preconditioner="jacobi")
+    with self.assertRaises(MatrixError):
+      solveCG(lambda v: Vector([1, 2]), b)
+
+  def test_callback(self):
+    a = poisson(20)
+    b = Vector([1]*20)
+    for solve in SOLVERS:
+      history = []
+      x = solve(a, b, callback=lambda iteration, residual: history.append((iteration, residual)))
+      self.assertEqual([i for i, r in history], list(range(1, len(history)+1)))
+      self.assertTrue(history[-1][1] <= 1e-8*b.magnitude)
+      self.assertSolution(a, x, b)
+
+  def test_arguments(self):
+    a = poisson(20)
+    b = Vector([1]*20)
+    exact = solveCG(a, b, tolerance=1e-14)
+    for solve in SOLVERS:
+      self.assertEqual(solve(a, Vector(20)), Vector(20))
+      history = []
+      solve(a, b, x0=exact, callback=lambda *args: history.append(args))
+      self.assertEqual(history, [])
+      with self.assertRaises(MatrixError):
+        solve(a, b, maxIterations=2)
+      with self.assertRaises(MatrixError):
+        solve(a, Vector([1]*3))
+      with self.assertRaises(MatrixError):
+        solve(a, b, x0=Vector(3))
+      with self.assertRaises(TypeError):
+        solve(a, [1]*20)
+      with self.assertRaises(TypeError):
+        solve("matrix", b)
+      with self.assertRaises(ValueError):
+        solve(a, b, preconditioner="lu")
+      with self.assertRaises(ValueError):
+        solve(a, b, maxIterations=0)
+    with self.assertRaises(ValueError):
+      solveGMRES(a, b, restart=0)
+    with self.assertRaises(MatrixError):
+      solveCG(SparseMatrix(2, 2, [(0, 1, 1), (1, 0, 1)]), Vector([1, 1]), preconditioner="ilu")
+
+if __name__ == '__main__':
+  unittest.main()
@@ -3,35 +3,48 @@ import sys
 import os
 import random
 import math
+import struct
+import ctypes
+import tempfile
+import io
+import json
+from functools import reduce
+from array import array
 sys.path.append(os.path.abspath(".."))
 from linear_algebra import *
+if sys.version_info[0] >= 3:
+  long = int
+try:
+  import numpy
+except ImportError:
+  numpy = None
 
 class TestMatrixConstructor(unittest.TestCase):
 
   def test_int_int(self):
-    for i in xrange(100):
-      for j in xrange(100):
+    for i in range(100):
+      for j in range(100):
         with self.assertRaises(ValueError):
             Matrix(-i, -j)
         with self.assertRaises(ValueError):
             Matrix(-i, j)
         with self.assertRaises(ValueError):
             Matrix(i, -j)
-    for i in xrange(1, 100):
-      for j in xrange(1, 100):
+    for i in range(1, 100):
+      for j in range(1, 100):
         self.assertEqual(Matrix(i,j).asList(), [[0]*j]*i)
 
   def test_long_long(self):
-    for i in xrange(100):
-      for j in xrange(100):
+    for i in range(100):
+      for j in range(100):
         with self.assertRaises(ValueError):
             Matrix(-long(i), -long(j))
         with self.assertRaises(ValueError):
             Matrix(-long(i), long(j))
         with self.assertRaises(ValueError):
             Matrix(long(i), -long(j))
-    for i in xrange(1, 100):
-      for j in xrange(1, 100):
+    for i in range(1, 100):
+      for j in range(1, 100):
         self.assertEqual(Matrix(long(i),long(j)).asList(), [[0]*j]*i)
 
   def test_list(self):
@@ -46,16 +59,14 @@ class TestMatrixConstructor(unittest.TestCase):
       Matrix([[1,2],[]])
 
   def test_str(self):
-    with self.assertRaises(NotImplementedError):
+    with self.assertRaises(MatrixError):
       Matrix("")
-    with self.assertRaises(NotImplementedError):
-      Matrix("1,2,3;4,5,6")
+    self.assertEqual(Matrix("1,2,3;4,5,6").asList(), [[1,2,3], [4,5,6]])
 
   def test_unicode(self):
-    with self.assertRaises(NotImplementedError):
+    with self.assertRaises(MatrixError):
       Matrix(u"")
-    with self.assertRaises(NotImplementedError):
-      Matrix(u"1,2,3;4,5,6")
+    self.assertEqual(Matrix(u"1,2,3;4,5,6").asList(), [[1,2,3], [4,5,6]])
 
   def test_float(self):
     with self.assertRaises(ValueError):
@@ -69,8 +80,8 @@ class TestMatrixConstructor(unittest.TestCase):
 class TestMatrixFactories(unittest.TestCase):
 
   def test_Zero(self):
-    for i in xrange(1, 100):
-      for j in xrange(1, 100):
+    for i in range(1, 100):
+      for j in range(1, 100):
         self.assertEqual(Matrix.Zero(i,j).asList(), [[0]*j]*i)
 
   def test_Identity(self):
@@ -95,11 +106,87 @@ class TestMatrixFactories(unittest.TestCase):
     self.assertEqual(Matrix.Diagonal([5,6]).asList(), [[5,0], [0,6]])
     self.assertEqual(Matrix.Diagonal([4,7,8]).asList(), [[4,0,0], [0,7,0], [0,0,8]])
 
+  def test_FromBuffer(self):
+    buf = array('d', [1,2,3,4,5,6])
+    a = Matrix.FromBuffer(2, 3, buf)
+    self.assertEqual(a.asList(), [[1,2,3], [4,5,6]])
+    buf[5] = 9
+    self.assertEqual(a[1,2], 9)
+    self.assertEqual(Matrix.FromBuffer(3, 2, buf).asList(), [[1,2], [3,4], [5,9]])
+    with self.assertRaises(MatrixError):
+      Matrix.FromBuffer(2, 2, buf)
+    with self.assertRaises(ValueError):
+      Matrix.FromBuffer(0, 6, buf)
+    with self.assertRaises(TypeError):
+      Matrix.FromBuffer(2, 3, [1,2,3,4,5,6])
+    if numpy is not None:
+      buf = numpy.arange(6.).reshape(2, 3)
+      a = Matrix.FromBuffer(2, 3, buf)
+      self.assertEqual(a.backend, "numpy")
+      buf[0,1] = 7
+      self.assertEqual(a[0,1], 7)
+      self.assertEqual(Matrix.FromBuffer(2, 3, buf, backend="python").asList(), [[0,7,2], [3,4,5]])
+
+  def test_buffer(self):
+    buf = (ctypes.c_double*3*2)((1,2,3), (4,5,6))
+    self.assertEqual(Matrix(buf).asList(), [[1,2,3], [4,5,6]])
+    self.assertEqual(Matrix(memoryview(buf)).size, (2, 3))
+    with self.assertRaises(MatrixError):
+      Matrix((ctypes.c_double*3)(1,2,3))
+    for backend in ("python", "numpy") if numpy is not None else ("python",):
+      a = Matrix([[1,2,3], [4,5,6]], backend=backend)
+      view = a.asMemoryview()
+      self.assertEqual(view.shape, (2, 3))
+      self.assertEqual(struct.unpack("<6d", view.tobytes()), (1,2,3,4,5,6))
+      self.assertEqual(Matrix(view, backend=backend), a)
+      if numpy is not None:
+        numpy.asarray(view)[1,0] = 7
+        self.assertEqual(a[1,0], 7)
+        self.assertEqual(numpy.asarray(a.getSubmatrix(0, 2, 1, 3).asMemoryview()).tolist(), [[2,3], [5,6]])
+        self.assertEqual(numpy.asarray(a.getCol(2).asMemoryview()).tolist(), [3,6])
+
+  @unittest.skipIf(numpy is not None or sys.version_info[0] < 3, "numpy is installed or memoryview of array isn't supported")
+  def test_buffer_without_numpy(self):
+    a = Matrix([[1,2,3], [4,5,6]])
+    view = a.asMemoryview()
+    self.assertEqual(view.format, "d")
+    self.assertEqual(view[0,1], 2)
+    self.assertEqual(view.tolist(), [[1,2,3], [4,5,6]])
+    self.assertEqual(struct.unpack("6d", view.tobytes()), (1,2,3,4,5,6))
+    view[1,0] = 7
+    self.assertEqual(a[1,0], 7)
+    row = a.getSubmatrix(1, 2, 0, 3).asMemoryview()
+    row[0,2] = 8
+    self.assertEqual(a[1,2], 8)
+    col = a.getCol(1).asMemoryview()
+    self.assertEqual(col.tolist(), [2,5])
+    col[1] = 9
+    self.assertEqual(a[1,1], 9)
+    self.assertEqual(a.getSubmatrix(0, 2, 1, 3).asMemoryview().tolist(), [[2,3], [9,8]])
+
   def test_Parse(self):
-    self.assertEqual(Matrix.Parse(""), NotImplemented)
-    self.assertEqual(Matrix.Parse("1,2,3;4,5,6"), NotImplemented)
-    self.assertEqual(Matrix.Parse(u""), NotImplemented)
-    self.assertEqual(Matrix.Parse(u"1,2,3;4,5,6"), NotImplemented)
+    a = Matrix([[1,2.5,3], [-4,5e-3,6]])
+    self.assertEqual(Matrix.Parse(repr(a)), a)
+    self.assertEqual(Matrix.Parse(str(a)), a)
+    self.assertEqual(Matrix.Parse("1,2.5,3\n-4,5e-3,6\n"), a)
+    self.assertEqual(Matrix.Parse(u"1\t2.5\t3\r\n-4\t5e-3\t6"), a)
+    self.assertEqual(Matrix.Parse(" 1 2.5 3 \n\n -4  5e-3 6 "), a)
+    self.assertEqual(Matrix.Parse("1,2.5,3;-4,5e-3,6", backend="numpy"), a)
+    for value in ["", "1,2;3", "1,,2;3,4,5", "1,x", "[[1,2],[3]]", "[1,2]", "Matrix([])"]:
+      with self.assertRaises(MatrixError):
+        Matrix.Parse(value)
+    with self.assertRaises(TypeError):
+      Matrix.Parse([[1,2], [3,4]])
+
+  def test_ParseStream(self):
+    self.assertEqual(Matrix.ParseStream(io.StringIO(u"1,2\n\n3,4\n")).asList(), [[1,2], [3,4]])
+    self.assertEqual(Matrix.ParseStream(["1 2 3"]).asList(), [[1,2,3]])
+    lines = iter(["1,2\n", "3\n", "5,6\n"])
+    with self.assertRaises(MatrixError):
+      Matrix.ParseStream(lines)
+    self.assertEqual(next(lines), "5,6\n")
+    with self.assertRaises(MatrixError):
+      Matrix.ParseStream(io.StringIO(u""))
 
 
 class TestMatrixProperties(unittest.TestCase):
@@ -160,6 +247,10 @@ class TestMatrixProperties(unittest.TestCase):
     with self.assertRaises(AttributeError):
       del Matrix(5,3).cols
 
+  def test_slots(self):
+    with self.assertRaises(AttributeError):
+      Matrix(5,3).name = "A"
+
 
 class TestMatrixTestingMethods(unittest.TestCase):
 
@@ -287,7 +378,52 @@ class TestMatrixGetModifiedMethods(unittest.TestCase):
     self.assertEqual(Matrix.Diagonal([3,4,2,5,-4]).det(), -480)
     self.assertEqual(Matrix([[3,6], [2,5]]).det(), 3)
     self.assertEqual(Matrix([[3,6,2], [1,0,5], [7,2,1]]).det(), 178)
-    self.assertEqual(Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]]).det(), 452)
+    self.assertAlmostEqual(Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]]).det(), 452)
+    self.assertAlmostEqual(Matrix([[0,2,1,3], [1,0,2,1], [2,1,0,4], [3,1,2,0]]).det(), -45)
+    self.assertEqual(Matrix([[1,2,3,4], [2,4,6,8], [7,2,1,4], [1,2,3,5]]).det(), 0)
+    big = Matrix([[(1 if i == j else 0) + (i+1)*(j+1)/100. for j in range(20)] for i in range(20)])
+    self.assertAlmostEqual(big.det(), 1 + sum((i+1)**2 for i in range(20))/100.)
+
+  def test_factorize(self):
+    self.assertIsInstance(Matrix([[4,2], [2,3]]).factorize(), CholeskyFactorization)
+    self.assertIsInstance(Matrix([[1,2], [2,1]]).factorize(), LUFactorization)
+    self.assertIsInstance(Matrix([[1,2], [3,4]]).factorize(), LUFactorization)
+
+  def test_solve(self):
+    m = Matrix([[3,6,2], [1,0,5], [7,2,1]])
+    self.assertEqual(m.solve(Vector([21,16,14])).round(10), Vector([1,2,3]))
+    self.assertEqual(m.solve(Matrix([[21,11], [16,6], [14,10]])).round(10), Matrix([[1,1], [2,1], [3,1]]))
+    self.assertEqual(Matrix([[4,2], [2,3]]).solve(Vector([8,7])).round(10), Vector([1.25,1.5]))
+    with self.assertRaises(MatrixError):
+      Matrix([[1,2], [2,4]]).solve(Vector([1,2]))
+    with self.assertRaises(NotImplementedError):
+      Matrix(2,3).solve(Vector(2))
+
+  def test_inverse(self):
+    self.assertEqual(Matrix([[4,7], [2,6]]).inverse().round(10), Matrix([[0.6,-0.7], [-0.2,0.4]]))
+    m = Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]])
+    self.assertEqual((m*m.inverse()).round(10), Matrix.Identity(4))
+    with self.assertRaises(MatrixError):
+      Matrix([[1,2], [2,4]]).inverse()
+
+  def test_lu(self):
+    with self.assertRaises(NotImplementedError):
+      Matrix(2,3).lu()
+
+    m = Matrix([[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]])
+    P, L, U = m.lu()
+    self.assertEqual((P*m).round(10), (L*U).round(10))
+    for i in range(4):
+      self.assertEqual(L[i,i], 1)
+      self.assertEqual(sorted(P.getRow(i)), [0,0,0,1])
+      for j in range(i+1, 4):
+        self.assertEqual(L[i,j], 0)
+        self.assertEqual(U[j,i], 0)
+    self.assertEqual(P.getRow(0), Vector([0,0,1,0]))
+
+    P, L, U = Matrix([[1,2], [2,4]]).lu()
+    self.assertEqual(U[1,1], 0)
+    self.assertEqual(P*Matrix([[1,2], [2,4]]), L*U)
   
   def test_eigenvalues(self):
     with self.assertRaises(NotImplementedError):
@@ -305,10 +441,38 @@ class TestMatrixGetModifiedMethods(unittest.TestCase):
     self.assertAlmostEqual(vals[1], -0.14659863242975)
     self.assertAlmostEqual(vals[2], -6.0316796699311)
 
-    with self.assertRaises(NotImplementedError):
-      Matrix([[3,6,2], [6,0,7], [2,5,1]]).eigenvalues()
-    with self.assertRaises(NotImplementedError):
-      Matrix([[3,6,2,4], [6,0,7,1], [2,5,1,3], [7,3,2,1]]).eigenvalues()
+    vals = Matrix([[3,6,2], [6,0,7], [2,5,1]]).eigenvalues()
+    self.assertAlmostEqual(vals[0], 10.733813062670794)
+    self.assertAlmostEqual(vals[1], -0.041764582926263394)
+    self.assertAlmostEqual(vals[2], -6.692048479744522)
+
+    vals = Matrix([[0,-1], [1,0]]).eigenvalues()
+    self.assertEqual(vals, [1j, -1j])
+    vals = Matrix([[0,0,1], [1,0,0], [0,1,0]]).eigenvalues()
+    self.assertAlmostEqual(vals[0], 1)
+    self.assertAlmostEqual(vals[1], complex(-0.5, math.sqrt(3)/2))
+    self.assertAlmostEqual(vals[2], complex(-0.5, -math.sqrt(3)/2))
+
+    m = Matrix([[3,6,2,4], [6,0,7,1], [2,5,1,3], [7,3,2,1]])
+    vals = m.eigenvalues()
+    self.assertAlmostEqual(sum(vals), m.trace())
+    self.assertAlmostEqual(reduce(lambda x, y: x*y, vals), m.det())
+    for v in vals:
+      if not isinstance(v, complex):
+        self.assertAlmostEqual((m - v*Matrix.Identity(4)).det(), 0)
+
+    m = Matrix([[(i+j) % 7 + (i == j)*10 for j in range(12)] for i in range(12)])
+    vals = m.eigenvalues()
+    self.assertEqual(vals, sorted(vals, reverse=True))
+    self.assertAlmostEqual(sum(vals), m.trace())
+    self.assertAlmostEqual(sum(v*v for v in vals), (m*m).trace())
+
+    m = Matrix([[(i*j) % 5 - 2*(i > j) for j in range(10)] for i in range(10)])
+    vals = m.eigenvalues()
+    self.assertAlmostEqual(sum(vals), m.trace())
+    self.assertAlmostEqual(sum(v*v for v in vals), (m*m).trace())
+    with self.assertRaises(MatrixError):
+      m.eigenvalues(maxIterations=0)
 
 
 class TestMatrixBuiltinFunctions(unittest.TestCase):
@@ -322,7 +486,7 @@ class TestMatrixBuiltinFunctions(unittest.TestCase):
     self.assertEqual(repr(Matrix([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])), "Matrix([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])")
 
   def test_getitem(self):
-    myList = [[random.uniform(-50, 50) for j in xrange(10)] for i in xrange(10)]
+    myList = [[random.uniform(-50, 50) for j in range(10)] for i in range(10)]
     m = Matrix(myList)
     for i, row in enumerate(myList):
       for j, v in enumerate(row):
@@ -331,6 +495,10 @@ class TestMatrixBuiltinFunctions(unittest.TestCase):
     self.assertEqual(m[-5,-3], myList[-5][-3])
     with self.assertRaises(IndexError):
       m[100,20]
+    with self.assertRaises(IndexError):
+      m[0,10]
+    with self.assertRaises(IndexError):
+      m[1,-11]
     with self.assertRaises(TypeError):
       m[5]
     with self.assertRaises(TypeError):
@@ -392,6 +560,7 @@ class TestMatrixOperators(unittest.TestCase):
       Matrix(5,5) == -1.6
     self.assertTrue(Matrix([[4,5,6], [1,2,3]]) == Matrix([[4,5,6], [1,2,3]]))
     self.assertFalse(Matrix([[4,5,6], [1,2,3]]) == Matrix([[10,5,6], [1,2,3]]))
+    self.assertFalse(Matrix([[4,5,6], [1,2,3]]) == Matrix([[4,5], [6,1], [2,3]]))
   
   def test_ne(self):
     self.assertFalse(Matrix(5,4) != Matrix(5,4))
@@ -448,6 +617,11 @@ class TestMatrixOperators(unittest.TestCase):
     self.assertEqual((Matrix([[1,2,3]]) * Matrix([[4],[5],[6]])).asList(), [[32]])
     self.assertEqual((Matrix([[1,2,3], [4,5,6]]) * Matrix([[4,7], [5,8], [6,9]])).asList(), [[32, 50], [77, 122]])
 
+    a = [[random.randint(-9, 9) for j in range(70)] for i in range(150)]
+    b = [[random.randint(-9, 9) for j in range(130)] for i in range(70)]
+    expected = [[sum(a[i][k]*b[k][j] for k in range(70)) for j in range(130)] for i in range(150)]
+    self.assertEqual((Matrix(a) * Matrix(b)).asList(), expected)
+
     self.assertEqual((Matrix([[2],[5]]) * Vector([4])).asList(), [[8],[20]])
     self.assertEqual((Matrix([[2,5]]) * Vector([4,7])).asList(), [[43]])
     self.assertEqual((Matrix([[1,2,3]]) * Vector([4,5,6])).asList(), [[32]])
@@ -468,6 +642,24 @@ class TestMatrixOperators(unittest.TestCase):
     with self.assertRaises(TypeError):
       Matrix(5,3) * [1,2,3]
   
+  def test_mul_strassen(self):
+    algorithm = getMulAlgorithm()
+    try:
+      setMulAlgorithm("strassen", 4)
+      self.assertEqual(getMulAlgorithm(), ("strassen", 4))
+      for m, k, n in [(16,16,16), (21,9,13), (9,30,7)]:
+        a = [[random.randint(-9, 9) for j in range(k)] for i in range(m)]
+        b = [[random.randint(-9, 9) for j in range(n)] for i in range(k)]
+        expected = [[sum(a[i][z]*b[z][j] for z in range(k)) for j in range(n)] for i in range(m)]
+        self.assertEqual((Matrix(a) * Matrix(b)).asList(), expected)
+      self.assertEqual((Matrix([[1,2,3], [4,5,6]]) * Matrix([[4,7], [5,8], [6,9]])).asList(), [[32, 50], [77, 122]])
+      with self.assertRaises(ValueError):
+        setMulAlgorithm("winograd")
+      with self.assertRaises(ValueError):
+        setMulAlgorithm("strassen", 0)
+    finally:
+      setMulAlgorithm(*algorithm)
+  
   def test_rmul(self):
     self.assertEqual((Vector([2]) * Matrix([[4,8]])).asList(), [[8,16]])
     self.assertEqual((Vector([2,5]) * Matrix([[4],[7]])).asList(), [[43]])
@@ -514,5 +706,320 @@ class TestMatrixOperators(unittest.TestCase):
     with self.assertRaises(TypeError):
       [1,2,3] / Matrix(5,4)
 
+  def test_iadd(self):
+    m = Matrix([[1,2,3], [4,5,6]])
+    a = m
+    m += Matrix([[4,-5,6], [-1,2,-3]])
+    self.assertIs(m, a)
+    self.assertEqual(m.asList(), [[5,-3,9], [3,7,3]])
+    with self.assertRaises(MatrixError):
+      m += Matrix(3,2)
+    with self.assertRaises(TypeError):
+      m += 4
+
+  def test_isub(self):
+    m = Matrix([[1,2,3], [4,5,6]])
+    a = m
+    m -= Matrix([[4,-5,6], [-1,2,-3]])
+    self.assertIs(m, a)
+    self.assertEqual(m.asList(), [[-3,7,-3], [5,3,9]])
+    with self.assertRaises(MatrixError):
+      m -= Matrix(3,2)
+    with self.assertRaises(TypeError):
+      m -= None
+
+  def test_imul(self):
+    m = Matrix([[1,2,3], [4,5,6]])
+    a = m
+    m *= 5
+    self.assertIs(m, a)
+    self.assertEqual(m.asList(), [[5,10,15], [20,25,30]])
+    m *= Matrix([[1,0], [0,1], [1,1]])
+    self.assertIs(m, a)
+    self.assertEqual(m.asList(), [[20,25], [50,55]])
+    self.assertEqual(m.size, (2,2))
+    with self.assertRaises(MatrixError):
+      m *= Matrix(3,3)
+    with self.assertRaises(TypeError):
+      m *= "asd"
+
+  def test_idiv(self):
+    m = Matrix([[1,2,5]])
+    a = m
+    m /= 5
+    self.assertIs(m, a)
+    self.assertEqual(m.asList(), [[0.2,0.4,1]])
+    with self.assertRaises(ZeroDivisionError):
+      m /= 0
+    with self.assertRaises(TypeError):
+      m /= None
+
+
+class TestMatrixCache(unittest.TestCase):
+
+  def test_cache(self):
+    a = Matrix([[3,6,2], [1,0,5], [7,2,1]])
+    self.assertEqual(a.getCache(), {})
+    self.assertEqual(a.det(), 178)
+    self.assertEqual(a.trace(), 4)
+    self.assertEqual(a.getCache(), {"det": 178, "trace": 4, "isDiagonal": False})
+    a[1,1] = 1
+    self.assertEqual(a.getCache(), {})
+    self.assertEqual(a.trace(), 5)
+    a += Matrix.Identity(3)
+    self.assertEqual(a.trace(), 8)
+    a *= 2
+    self.assertEqual(a.trace(), 16)
+    a.getRow(0)[0] = 0
+    self.assertEqual(a.trace(), 8)
+    self.assertEqual(a.getSubmatrix(1, 3, 1, 3).trace(), 8)
+    a[2,2] = 0
+    self.assertEqual(a.getSubmatrix(1, 3, 1, 3).trace(), 4)
+    a.solve(Vector([1,2,3]))
+    self.assertIs(a.factorize(), a.factorize())
+    values = a.eigenvalues()
+    values.append(0)
+    self.assertEqual(len(a.eigenvalues()), 3)
+
+  def test_setCaching(self):
+    a = Matrix([[4,2], [2,3]])
+    self.assertTrue(getCaching())
+    try:
+      setCaching(False)
+      self.assertFalse(getCaching())
+      self.assertEqual(a.det(), 8)
+      self.assertEqual(a.getCache(), {})
+      self.assertIsNot(a.factorize(), a.factorize())
+    finally:
+      setCaching(True)
+    a.det()
+    a.clearCache()
+    self.assertEqual(a.getCache(), {})
+
+
+class TestMatrixInstrumentation(unittest.TestCase):
+
+  def tearDown(self):
+    setInstrumentation(False)
+    resetCounters()
+
+  def test_instrumentation(self):
+    mul = Matrix.__dict__["__mul__"]
+    a = Matrix([[1,2], [3,4]])
+    self.assertFalse(getInstrumentation())
+    with instrumentation() as counters:
+      self.assertTrue(getInstrumentation())
+      b = a*a
+      a.transpose()
+      a.getCol(0).dot(Vector([1,1]))
+    self.assertFalse(getInstrumentation())
+    self.assertIs(Matrix.__dict__["__mul__"], mul)
+    self.assertNotIn("__new__", Matrix.__dict__)
+    self.assertEqual(b, Matrix([[7,10], [15,22]]))
+    self.assertEqual(counters["operations"]["Matrix.__mul__"]["calls"], 1)
+    self.assertEqual(counters["operations"]["Matrix.__mul__"]["elements"], 8)
+    self.assertEqual(counters["operations"]["Matrix.__mul__"]["objects"], 1)
+    self.assertGreater(counters["operations"]["Matrix.__mul__"]["seconds"], 0)
+    self.assertEqual(counters["operations"]["Vector.dot"]["calls"], 1)
+    self.assertEqual(counters["constructed"]["Matrix"], 2)
+    self.assertEqual(counters, getCounters())
+    a*a
+    self.assertEqual(getCounters()["operations"]["Matrix.__mul__"]["calls"], 1)
+    resetCounters()
+    self.assertEqual(getCounters(), {"operations": {}, "constructed": {}})
+
+  def test_exportCounters(self):
+    setInstrumentation(True)
+    Vector([1,2,3]).magnitude
+    self.assertEqual(json.loads(exportCounters())["operations"]["Vector.magnitude"]["elements"], 3)
+    text = exportCounters("prometheus")
+    self.assertIn("# TYPE linear_algebra_calls_total counter\n", text)
+    self.assertIn('linear_algebra_calls_total{operation="Vector.magnitude"} 1\n', text)
+    self.assertIn('linear_algebra_constructed_total{class="Vector"} 1\n', text)
+    with self.assertRaises(ValueError):
+      exportCounters("xml")
+
+
+class TestMatrixViews(unittest.TestCase):
+
+  def checkViews(self, backend):
+    m = Matrix([[1,2,3,4], [5,6,7,8], [9,10,11,12]], backend=backend)
+    row, col = m.getRow(1), m.getCol(2)
+    self.assertEqual(row, Vector([5,6,7,8]))
+    self.assertEqual(col, Vector([3,7,11]))
+    self.assertEqual(m.rows[2], Vector([9,10,11,12]))
+    self.assertEqual(m.cols[0], Vector([1,5,9]))
+    row[2] = 70
+    self.assertEqual(m[1,2], 70)
+    self.assertEqual(col[1], 70)
+    col *= 2
+    self.assertEqual(m.getCol(2), Vector([6,140,22]))
+    self.assertEqual(row + Vector([1,1,1,1]), Vector([6,7,141,9]))
+    sub = m.getSubmatrix(1, 3, 1, 3)
+    self.assertEqual(sub.asList(), [[6,140], [10,22]])
+    self.assertEqual(sub.transpose().asList(), [[6,10], [140,22]])
+    self.assertEqual(sub.getCol(1), Vector([140,22]))
+    self.assertEqual((sub*Matrix([[1],[1]])).asList(), [[146], [32]])
+    sub[1,0] = 0
+    self.assertEqual(m[2,1], 0)
+    sub += Matrix([[1,1], [1,1]])
+    self.assertEqual(m.asList(), [[1,2,6,4], [5,7,141,8], [9,1,23,12]])
+    own = sub.copy()
+    own[0,0] = 100
+    self.assertEqual(m[1,1], 7)
+    own = m.getRow(0).copy()
+    own[0] = 100
+    self.assertEqual(m[0,0], 1)
+    with self.assertRaises(IndexError):
+      m.getCol(4)
+    with self.assertRaises(IndexError):
+      m.getSubmatrix(1, 1, 0, 2)
+    with self.assertRaises(IndexError):
+      m.getSubmatrix(0, 2, 0, 5)
+    p = Matrix([[1,2], [3,4]], backend=backend)
+    self.assertEqual(p.trace(), 5)
+    top = p.getSubmatrix(0, 1, 0, 2)
+    top *= Matrix([[0,1], [1,0]])
+    self.assertEqual(p.asList(), [[2,1], [3,4]])
+    self.assertEqual(p.trace(), 6)
+    with self.assertRaises(MatrixError):
+      top *= Matrix([[1], [1]])
+    with self.assertRaises(MatrixError):
+      p *= Matrix([[1], [1]])
+
+  def test_views(self):
+    self.checkViews("python")
+
+  @unittest.skipIf(numpy is None, "numpy is not installed")
+  def test_views_numpy(self):
+    self.checkViews("numpy")
+
+
+class TestMatrixSerialization(unittest.TestCase):
+
+  def setUp(self):
+    handle, self.path = tempfile.mkstemp()
+    os.close(handle)
+
+  def tearDown(self):
+    os.remove(self.path)
+
+  def test_save_load(self):
+    a = Matrix([[random.uniform(-50, 50) for j in range(7)] for i in range(5)])
+    a.save(self.path)
+    self.assertEqual(os.path.getsize(self.path), 24 + 8*35)
+    with open(self.path, "rb") as f:
+      self.assertEqual(struct.unpack("<4sBc2xQQ", f.read(24)), (b"LAMX", 1, b"d", 5, 7))
+      self.assertEqual(struct.unpack("<7d", f.read(56)), tuple(a.getRow(0)))
+    self.assertEqual(Matrix.Load(self.path), a)
+    a.getSubmatrix(1, 4, 2, 7).save(self.path)
+    self.assertEqual(Matrix.Load(self.path), a.getSubmatrix(1, 4, 2, 7).copy())
+    for backend in ("python", "numpy"):
+      b = Matrix.Load(self.path, mmap=True, backend=backend)
+      self.assertEqual(b.backend, backend if numpy is not None else "python")
+      self.assertEqual(b, a.getSubmatrix(1, 4, 2, 7).copy())
+      b[0,0] = 1000
+      self.assertEqual(Matrix.Load(self.path, backend=backend)[0,0], a[1,2])
+
+  def test_corrupted(self):
+    with open(self.path, "wb") as f:
+      f.write(b"not a matrix file")
+    with self.assertRaises(MatrixError):
+      Matrix.Load(self.path)
+    Matrix([[1,2], [3,4]]).save(self.path)
+    with open(self.path, "ab") as f:
+      f.write(b"\0")
+    with self.assertRaises(MatrixError):
+      Matrix.Load(self.path)
+
+
+class TestMatrixParallel(unittest.TestCase):
+
+  def test_parallel(self):
+    a = Matrix([[random.uniform(-50, 50) for j in range(20)] for i in range(37)])
+    b = Matrix([[random.uniform(-50, 50) for j in range(23)] for i in range(20)])
+    c = Matrix([[random.uniform(-50, 50) for j in range(20)] for i in range(37)])
+    expected = [a*b, a+c, a-c, a.round(2), a.floor()]
+    parallel = getParallel()
+    try:
+      setParallel(3, 10)
+      self.assertEqual(getParallel(), (3, 10))
+      self.assertEqual([a*b, a+c, a-c, a.round(2), a.floor()], expected)
+      with self.assertRaises(ValueError):
+        setParallel(0)
+      with self.assertRaises(ValueError):
+        setParallel(2, -1)
+    finally:
+      setParallel(*parallel)
+
+
+class TestMatrixBackend(unittest.TestCase):
+
+  def test_default(self):
+    self.assertEqual(getBackend(), "python")
+    self.assertEqual(Matrix(2,3).backend, "python")
+    with self.assertRaises(ValueError):
+      Matrix(2,3, backend="fortran")
+    with self.assertRaises(ValueError):
+      setBackend("fortran")
+    with self.assertRaises(TypeError):
+      Matrix(2,3, storage="numpy")
+
+  @unittest.skipIf(numpy is not None, "numpy is installed")
+  def test_fallback(self):
+    self.assertEqual(Matrix(2,3, backend="numpy").backend, "python")
+    self.assertEqual(Matrix([[1,2],[3,4]], backend="numpy").asList(), [[1,2],[3,4]])
+
+  @unittest.skipIf(numpy is None, "numpy is not installed")
+  def test_numpy(self):
+    a = [[3,6,2,1], [1,0,5,3], [7,2,1,4], [1,2,3,4]]
+    b = [[1,2,0,1], [4,1,5,3], [7,0,1,2], [0,2,3,1]]
+    ma, mb = Matrix(a, backend="numpy"), Matrix(b, backend="numpy")
+    pa, pb = Matrix(a), Matrix(b)
+    self.assertEqual(ma.backend, "numpy")
+    self.assertIsInstance(ma._vals, numpy.ndarray)
+    self.assertEqual(ma.size, (4,4))
+    self.assertEqual(ma.asList(), a)
+    self.assertEqual(ma, pa)
+    self.assertEqual(repr(ma), repr(pa))
+    self.assertEqual(ma.rows, pa.rows)
+    self.assertEqual(ma.cols, pa.cols)
+    self.assertEqual((ma+mb).asList(), (pa+pb).asList())
+    self.assertEqual((ma-mb).asList(), (pa-pb).asList())
+    self.assertEqual((ma*mb).asList(), (pa*pb).asList())
+    self.assertEqual((ma*mb).backend, "numpy")
+    self.assertEqual((ma*Vector([1,2,3,4])).asList(), (pa*Vector([1,2,3,4])).asList())
+    self.assertEqual((Vector([1,2,3,4])*ma).asList(), (Vector([1,2,3,4])*pa).asList())
+    self.assertEqual((ma*2.5).asList(), (pa*2.5).asList())
+    self.assertEqual(ma.transpose().asList(), pa.transpose().asList())
+    self.assertAlmostEqual(ma.det(), 452)
+    self.assertEqual(Matrix(2,3, backend="numpy"), 0)
+    self.assertTrue(Matrix([[1,0], [0,2]], backend="numpy").isDiagonal())
+    self.assertFalse(ma.isDiagonal())
+    self.assertFalse(ma.isSymmetric())
+    self.assertTrue(Matrix([[2,3], [3,4]], backend="numpy").isSymmetric())
+    with self.assertRaises(MatrixError):
+      Matrix([[1,2],[3,4,5]], backend="numpy")
+    with self.assertRaises(MatrixError):
+      Matrix([[]], backend="numpy")
+
+    vals = Matrix([[3,6,2], [6,0,5], [2,5,1]], backend="numpy").eigenvalues()
+    self.assertAlmostEqual(vals[0], 10.178278302361)
+    self.assertAlmostEqual(vals[1], -0.14659863242975)
+    self.assertAlmostEqual(vals[2], -6.0316796699311)
+    vals = Matrix([[0,-1], [1,0]], backend="numpy").eigenvalues()
+    self.assertAlmostEqual(vals[0], 1j)
+    self.assertAlmostEqual(vals[1], -1j)
+
+  @unittest.skipIf(numpy is None, "numpy is not installed")
+  def test_setBackend(self):
+    try:
+      setBackend("numpy")
+      self.assertEqual(getBackend(), "numpy")
+      self.assertEqual(Matrix(2,3).backend, "numpy")
+      self.assertEqual(Matrix(2,3, backend="python").backend, "python")
+    finally:
+      setBackend("python")
+
 if __name__ == '__main__':
   unittest.main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+
+def randomSparse(m, n, count):
+  """Get list of random COO triplets"""
+  return [(random.randrange(m), random.randrange(n), random.uniform(-50, 50)) for k in range(count)]
+
+class TestSparseMatrixConstructor(unittest.TestCase):
+
+  def test_int_int(self):
+    a = SparseMatrix(2, 3)
+    self.assertEqual(a.size, (2, 3))
+    self.assertEqual(a.nnz, 0)
+    self.assertEqual(a.asDense(), Matrix(2, 3))
+    with self.assertRaises(ValueError):
+      SparseMatrix(0, 3)
+
+  def test_triplets(self):
+    a = SparseMatrix(2, 3, [(1, 2, 5), (0, 0, 1), (1, 2, 2), (0, 1, 0)])
+    self.assertEqual(a.nnz, 2)
+    self.assertEqual(a.asDense(), Matrix([[1,0,0], [0,0,7]]))
+    self.assertEqual(a.asTriplets(), [(0, 0, 1.0), (1, 2, 7.0)])
+    with self.assertRaises(IndexError):
+      SparseMatrix(2, 3, [(2, 0, 1)])
+    with self.assertRaises(MatrixError):
+      SparseMatrix(2, 3, [(0, 0)])
+    with self.assertRaises(MatrixError):
+      SparseMatrix(2, 3, [(0.5, 0, 1)])
+
+  def test_FromDense(self):
+    m = Matrix([[1,0,2], [0,0,0], [0,3,0]])
+    a = SparseMatrix.FromDense(m)
+    self.assertEqual(a.nnz, 3)
+    self.assertEqual(a.asDense(), m)
+    self.assertTrue(a == m)
+    with self.assertRaises(TypeError):
+      SparseMatrix.FromDense([[1,2]])
+
+
+class TestSparseMatrixMethods(unittest.TestCase):
+
+  def setUp(self):
+    self.a = SparseMatrix(6, 5, randomSparse(6, 5, 10))
+    self.b = SparseMatrix(6, 5, randomSparse(6, 5, 10))
+    self.c = SparseMatrix(5, 4, randomSparse(5, 4, 8))
+
+  def test_getitem(self):
+    a = SparseMatrix(2, 3, [(1, 2, 5)])
+    self.assertEqual(a[1,2], 5)
+    self.assertEqual(a[-1,-1], 5)
+    self.assertEqual(a[0,1], 0)
+    with self.assertRaises(IndexError):
+      a[2,0]
+
+  def test_tests(self):
+    self.assertTrue(SparseMatrix(3, 3, [(0, 0, 1), (2, 2, 3)]).isDiagonal())
+    self.assertFalse(SparseMatrix(3, 3, [(0, 1, 1)]).isDiagonal())
+    self.assertTrue(SparseMatrix(3, 3, [(0, 1, 2), (1, 0, 2), (2, 2, 1)]).isSymmetric())
+    self.assertFalse(SparseMatrix(3, 3, [(0, 1, 2), (1, 0, 3)]).isSymmetric())
+    self.assertFalse(SparseMatrix(2, 3).isSymmetric())
+
+  def test_transpose(self):
+    self.assertEqual(self.a.transpose().asDense(), self.a.asDense().transpose())
+    self.assertEqual(self.a.transpose().transpose(), self.a)
+
+  def test_add(self):
+    self.assertEqual((self.a + self.b).asDense().round(8), (self.a.asDense() + self.b.asDense()).round(8))
+    self.assertEqual((self.a - self.b).asDense().round(8), (self.a.asDense() - self.b.asDense()).round(8))
+    self.assertEqual((self.a + self.b.asDense()).round(8), (self.a.asDense() + self.b.asDense()).round(8))
+    self.assertEqual((self.b.asDense() + self.a).round(8), (self.a.asDense() + self.b.asDense()).round(8))
+    self.assertTrue((self.a - self.a).isZero())
+    with self.assertRaises(MatrixError):
+      self.a + self.c
+
+  def test_add_structured(self):
+    s = SparseMatrix(3, 3, [(0, 1, 5), (2, 0, -1), (1, 1, 2)])
+    for m in (DiagonalMatrix([1, 2, 3]), TriangularMatrix([[1,0,0], [2,3,0], [4,5,6]]),
+              BandedMatrix([[1,2,0], [3,4,5], [0,6,7]], 1, 1), SymmetricMatrix([[1,2,3], [2,4,5], [3,5,6]])):
+      dense = Matrix(m.asList())
+      self.assertEqual(s + m, s.asDense() + dense)
+      self.assertEqual(m + s, s.asDense() + dense)
+      self.assertEqual(s - m, s.asDense() - dense)
+      self.assertEqual(m - s, dense - s.asDense())
+
+  def test_mul_scalar(self):
+    self.assertEqual((self.a*2).asDense(), self.a.asDense()*2)
+    self.assertEqual((2*self.a).asDense(), self.a.asDense()*2)
+    self.assertEqual((self.a/2).asDense(), self.a.asDense()/2)
+    self.assertEqual((self.a*0).nnz, 0)
+
+  def test_mul_vector(self):
+    x = Vector([random.uniform(-50, 50) for i in range(5)])
+    self.assertEqual((self.a*x).round(8), (self.a.asDense()*x).asVector().round(8))
+    y = Vector([random.uniform(-50, 50) for i in range(6)])
+    self.assertEqual((y*self.a).round(8), (self.a.asDense().transpose()*y).asVector().round(8))
+    with self.assertRaises(MatrixError):
+      self.a*y
+
+  def test_mul_matrix(self):
+    self.assertEqual((self.a*self.c.asDense()).round(8), (self.a.asDense()*self.c.asDense()).round(8))
+    self.assertEqual((self.a*self.c).asDense().round(8), (self.a.asDense()*self.c.asDense()).round(8))
+    d = self.b.asDense().transpose()
+    self.assertEqual((d*self.a).round(8), (d*self.a.asDense()).round(8))
+    with self.assertRaises(MatrixError):
+      self.a*self.b
+
+  def test_repr(self):
+    a = SparseMatrix(2, 3, [(1, 2, 5)])
+    self.assertEqual(repr(a), "SparseMatrix(2, 3, [(1, 2, 5.0)])")
+    self.assertEqual(eval(repr(self.a)), self.a)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,269 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+
+def randomBanded(n, lower, upper):
+  """Get random square Matrix with specified bandwidths"""
+  return Matrix([[(random.uniform(-5, 5) if -lower <= j-i <= upper else 0) for j in range(n)] for i in range(n)])
+
+def assertMatrixAlmostEqual(test, a, b, places=7):
+  """Check that matrices have same size and almost equal components"""
+  test.assertEqual(a.size, b.size)
+  for u, v in zip(a.asList(), b.asList()):
+    for x, y in zip(u, v):
+      test.assertAlmostEqual(x, y, places)
+
+class TestDiagonalMatrix(unittest.TestCase):
+
+  def test_constructor(self):
+    d = DiagonalMatrix([1,2,3])
+    self.assertEqual(d.size, (3, 3))
+    self.assertEqual(d, Matrix.Diagonal([1,2,3]))
+    self.assertEqual(DiagonalMatrix(2), Matrix(2,2))
+    self.assertEqual(DiagonalMatrix(Vector([4,5])), Matrix([[4,0], [0,5]]))
+    self.assertEqual(DiagonalMatrix(Matrix([[4,0], [0,5]])).getDiagonal(), Vector([4,5]))
+    self.assertEqual(DiagonalMatrix.Identity(3), Matrix.Identity(3))
+    with self.assertRaises(MatrixError):
+      DiagonalMatrix(Matrix([[4,1], [0,5]]))
+    with self.assertRaises(MatrixError):
+      DiagonalMatrix([])
+    with self.assertRaises(ValueError):
+      DiagonalMatrix(0)
+
+  def test_items(self):
+    d = DiagonalMatrix([1,2,3])
+    self.assertEqual(d[1,1], 2)
+    self.assertEqual(d[0,2], 0)
+    self.assertEqual(d[-1,-1], 3)
+    d[2,2] = 7
+    d[0,1] = 0
+    self.assertEqual(d.getDiagonal(), Vector([1,2,7]))
+    with self.assertRaises(MatrixError):
+      d[0,1] = 1
+    with self.assertRaises(IndexError):
+      d[3,0]
+    self.assertEqual(d.getRow(2), Vector([0,0,7]))
+    self.assertEqual(d.getCol(0), Vector([1,0,0]))
+
+  def test_mul(self):
+    d = DiagonalMatrix([1,2,3])
+    m = Matrix([[1,2], [3,4], [5,6]])
+    self.assertEqual(d*m, Matrix.Diagonal([1,2,3])*m)
+    self.assertEqual(m.transpose()*d, m.transpose()*Matrix.Diagonal([1,2,3]))
+    self.assertEqual(d*Vector([1,1,1]), Matrix([[1], [2], [3]]))
+    self.assertEqual(Vector([1,1,1])*d, Matrix([[1,2,3]]))
+    self.assertEqual(d*d, DiagonalMatrix([1,4,9]))
+    self.assertIsInstance(d*d, DiagonalMatrix)
+    self.assertIsInstance(2*d, DiagonalMatrix)
+    self.assertEqual(d/2, DiagonalMatrix([0.5,1,1.5]))
+    with self.assertRaises(MatrixError):
+      d*Matrix(2,2)
+
+  def test_linear_algebra(self):
+    d = DiagonalMatrix([4,-2,3])
+    self.assertEqual(d.det(), -24)
+    self.assertEqual(d.trace(), 5)
+    self.assertEqual(d.eigenvalues(), [4,3,-2])
+    self.assertIsInstance(d.transpose(), DiagonalMatrix)
+    self.assertEqual(d.inverse(), DiagonalMatrix([0.25,-0.5,1./3]))
+    self.assertEqual(d.solve(Vector([4,2,3])), Vector([1,-1,1]))
+    self.assertTrue(d.isDiagonal())
+    self.assertTrue(d.isSymmetric())
+    with self.assertRaises(MatrixError):
+      DiagonalMatrix([1,0]).inverse()
+    with self.assertRaises(MatrixError):
+      DiagonalMatrix([1,0]).solve(Vector([1,1]))
+
+
+class TestTriangularMatrix(unittest.TestCase):
+
+  def test_constructor(self):
+    t = TriangularMatrix([[1,0], [2,3]])
+    self.assertTrue(t.lower)
+    self.assertEqual(t, Matrix([[1,0], [2,3]]))
+    u = TriangularMatrix([[1,2], [0,3]], lower=False)
+    self.assertFalse(u.lower)
+    self.assertEqual(u, Matrix([[1,2], [0,3]]))
+    self.assertEqual(TriangularMatrix(3, lower=False), Matrix(3,3))
+    with self.assertRaises(MatrixError):
+      TriangularMatrix([[1,2], [0,3]])
+    with self.assertRaises(MatrixError):
+      TriangularMatrix(Matrix(2,3))
+    with self.assertRaises(MatrixError):
+      TriangularMatrix(3)[0,1] = 1
+
+  def test_mul(self):
+    for lower in (True, False):
+      a = randomBanded(5, 4, 0) if lower else randomBanded(5, 0, 4)
+      b = randomBanded(5, 4, 0) if lower else randomBanded(5, 0, 4)
+      t, s = TriangularMatrix(a, lower), TriangularMatrix(b, lower)
+      assertMatrixAlmostEqual(self, t*s, a*b)
+      self.assertIsInstance(t*s, TriangularMatrix)
+      m = Matrix([[random.uniform(-5, 5) for j in range(3)] for i in range(5)])
+      assertMatrixAlmostEqual(self, t*m, a*m)
+      assertMatrixAlmostEqual(self, m.transpose()*t, m.transpose()*a)
+    t = TriangularMatrix(randomBanded(4, 3, 0))
+    u = t.transpose()
+    self.assertFalse(u.lower)
+    self.assertNotIsInstance(t*u, TriangularMatrix)
+    assertMatrixAlmostEqual(self, t*u, Matrix(t.asList())*Matrix(u.asList()))
+
+  def test_linear_algebra(self):
+    a = randomBanded(6, 5, 0)
+    t = TriangularMatrix(a)
+    self.assertAlmostEqual(t.det(), a.det())
+    self.assertAlmostEqual(t.trace(), a.trace())
+    self.assertEqual(t.eigenvalues(), sorted(a.getDiagonal(), reverse=True))
+    self.assertEqual(t.transpose(), a.transpose())
+    for lower in (True, False):
+      t = TriangularMatrix(a if lower else a.transpose(), lower)
+      x = Vector([random.uniform(-10, 10) for j in range(6)])
+      for u, v in zip(t.solve((t*x).asVector()), x):
+        self.assertAlmostEqual(u, v)
+      self.assertIsInstance(t.inverse(), TriangularMatrix)
+      assertMatrixAlmostEqual(self, t*t.inverse(), Matrix.Identity(6))
+
+
+class TestSymmetricMatrix(unittest.TestCase):
+
+  def test_constructor(self):
+    s = SymmetricMatrix([[1,2], [2,3]])
+    self.assertEqual(s, Matrix([[1,2], [2,3]]))
+    s[0,1] = 5
+    self.assertEqual(s, Matrix([[1,5], [5,3]]))
+    with self.assertRaises(MatrixError):
+      SymmetricMatrix([[1,2], [3,4]])
+    self.assertEqual(repr(s), "SymmetricMatrix([[1.0, 5.0], [5.0, 3.0]])")
+
+  def test_operators(self):
+    a = randomBanded(5, 4, 4)
+    a = a + a.transpose()
+    s = SymmetricMatrix(a)
+    m = Matrix([[random.uniform(-5, 5) for j in range(5)] for i in range(5)])
+    assertMatrixAlmostEqual(self, s*m, a*m)
+    assertMatrixAlmostEqual(self, m*s, m*a)
+    x = Vector([random.uniform(-5, 5) for j in range(5)])
+    assertMatrixAlmostEqual(self, s*x, a*x)
+    assertMatrixAlmostEqual(self, x*s, x*a)
+    self.assertIsInstance(s + s, SymmetricMatrix)
+    self.assertIsInstance(s - m, Matrix)
+    self.assertEqual(s + m, a + m)
+    self.assertEqual(m - s, m - a)
+    s += s
+    self.assertEqual(s, 2*a)
+    s += m
+    self.assertNotIsInstance(s, SymmetricMatrix)
+
+  def test_linear_algebra(self):
+    a = randomBanded(6, 5, 5)
+    a = a.transpose()*a + Matrix.Identity(6)
+    s = SymmetricMatrix(a)
+    self.assertAlmostEqual(s.det() / a.det(), 1)
+    self.assertAlmostEqual(s.trace(), a.trace())
+    for u, v in zip(s.eigenvalues(), a.eigenvalues()):
+      self.assertAlmostEqual(u, v)
+    self.assertIs(s.transpose().isSymmetric(), True)
+    self.assertEqual(s.transpose(), s)
+    x = Vector([random.uniform(-10, 10) for j in range(6)])
+    self.assertIsInstance(s.factorize(), CholeskyFactorization)
+    for f in (s.cholesky(), s.ldlt()):
+      for u, v in zip(f.solve((a*x).asVector()), x):
+        self.assertAlmostEqual(u, v)
+      self.assertAlmostEqual(f.det() / a.det(), 1)
+    with self.assertRaises(MatrixError):
+      SymmetricMatrix([[0,0,1], [0,1,0], [1,0,1]]).ldlt()
+
+
+class TestBandedMatrix(unittest.TestCase):
+
+  def test_constructor(self):
+    b = BandedMatrix([[1,2,0], [3,4,5], [0,6,7]], 1, 1)
+    self.assertEqual((b.lowerBandwidth, b.upperBandwidth), (1, 1))
+    self.assertEqual(b, Matrix([[1,2,0], [3,4,5], [0,6,7]]))
+    self.assertEqual(b[2,0], 0)
+    self.assertEqual(BandedMatrix(4, 5, 0).lowerBandwidth, 3)
+    with self.assertRaises(MatrixError):
+      BandedMatrix([[1,2,0], [3,4,5], [1,6,7]], 1, 1)
+    with self.assertRaises(ValueError):
+      BandedMatrix(3, -1, 1)
+    with self.assertRaises(MatrixError):
+      b[0,2] = 1
+
+  def test_mul(self):
+    a, c = randomBanded(7, 1, 2), randomBanded(7, 2, 0)
+    b = BandedMatrix(a, 1, 2)
+    product = b*BandedMatrix(c, 2, 0)
+    self.assertIsInstance(product, BandedMatrix)
+    self.assertEqual((product.lowerBandwidth, product.upperBandwidth), (3, 2))
+    assertMatrixAlmostEqual(self, product, a*c)
+    assertMatrixAlmostEqual(self, b*c, a*c)
+    assertMatrixAlmostEqual(self, c*b, c*a)
+    assertMatrixAlmostEqual(self, b*DiagonalMatrix(range(7)), a*Matrix.Diagonal(range(7)))
+
+  def test_linear_algebra(self):
+    for lower, upper in ((1, 1), (2, 0), (0, 3), (2, 1)):
+      a = randomBanded(8, lower, upper)
+      b = BandedMatrix(a, lower, upper)
+      self.assertAlmostEqual(b.det() / a.det(), 1)
+      self.assertAlmostEqual(b.trace(), a.trace())
+      self.assertEqual(b.transpose(), a.transpose())
+      self.assertEqual((b.transpose().lowerBandwidth, b.transpose().upperBandwidth), (upper, lower))
+    self.assertEqual(BandedMatrix([[1,1,0], [1,1,0], [0,0,1]], 1, 1).det(), 0)
+    a = randomBanded(8, 2, 2)
+    a = a + a.transpose() + 60*Matrix.Identity(8)
+    b = BandedMatrix(a, 2, 2)
+    self.assertIs(b.isSymmetric(), True)
+    self.assertIs(BandedMatrix(randomBanded(8, 2, 1), 2, 1).isSymmetric(), False)
+    self.assertIs(BandedMatrix([[1,0,0], [0,1,0], [0,0,1]], 2, 0).isSymmetric(), True)
+    x = Vector([random.uniform(-10, 10) for j in range(8)])
+    for f in (b.cholesky(), b.ldlt()):
+      for u, v in zip(f.solve((a*x).asVector()), x):
+        self.assertAlmostEqual(u, v)
+      self.assertAlmostEqual(f.det() / a.det(), 1)
+    a = randomBanded(5, 1, 1)
+    for u, v in zip(BandedMatrix(a, 1, 1).eigenvalues(), a.eigenvalues()):
+      self.assertAlmostEqual(u, v)
+
+  def test_packed_factorization(self):
+    n = 600
+    b = BandedMatrix(n, 1, 1)
+    for i in range(n):
+      b[i,i] = 4
+      if i:
+        b[i,i-1] = b[i-1,i] = -1
+    def densify(self):
+      raise AssertionError("Dense components were built")
+    BandedMatrix._vals = property(densify)
+    try:
+      self.assertIs(b.isSymmetric(), True)
+      self.assertIs(TriangularMatrix(n).isSymmetric(), True)
+      x = Vector([1]*n)
+      for f in (b.cholesky(), b.ldlt(), b.factorize()):
+        self.assertAlmostEqual(f.solve(x)[0], f.solve(x)[n-1])
+    finally:
+      del BandedMatrix._vals
+
+  def test_interoperability(self):
+    a = randomBanded(4, 1, 1)
+    b = BandedMatrix(a, 1, 1)
+    self.assertEqual(a, b)
+    self.assertEqual(b, a)
+    self.assertEqual(a + b, 2*a)
+    self.assertEqual(b - a, Matrix(4,4))
+    self.assertEqual(sum([b, b]), 2*b)
+    self.assertEqual(-b, -a)
+    self.assertEqual(b.copy(), b)
+    self.assertIsInstance(b.copy(), BandedMatrix)
+    m = Matrix(a.asList())
+    m *= b
+    assertMatrixAlmostEqual(self, m, a*a)
+    b *= 2
+    self.assertEqual(b, 2*a)
+    self.assertEqual(b.getSubmatrix(0, 2, 0, 2), (2*a).getSubmatrix(0, 2, 0, 2))
+    self.assertEqual(b.round(), (2*a).round())
+
+if __name__ == '__main__':
+  unittest.main()
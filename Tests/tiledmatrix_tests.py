@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import random
+import shutil
+import tempfile
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+
+def randomMatrix(m, n):
+  """Get random Matrix m x n"""
+  return Matrix([[random.uniform(-50, 50) for j in range(n)] for i in range(m)])
+
+class TestTiledMatrix(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.a = randomMatrix(13, 11)
+    self.b = randomMatrix(11, 7)
+    self.A = TiledMatrix.FromMatrix(self.path("a"), self.a, tileSize=4, cacheSize=3)
+    self.B = TiledMatrix.FromMatrix(self.path("b"), self.b, tileSize=4, cacheSize=2)
+
+  def tearDown(self):
+    self.A.close()
+    self.B.close()
+    shutil.rmtree(self.directory)
+
+  def path(self, name):
+    return os.path.join(self.directory, name)
+
+  def test_constructor(self):
+    a = TiledMatrix(self.path("zero"), 5, 3, tileSize=2)
+    self.assertEqual(a.size, (5, 3))
+    self.assertEqual(a.tilesCount, (3, 2))
+    self.assertEqual(a.asMatrix(), Matrix(5, 3))
+    self.assertEqual(os.path.getsize(self.path("zero")), 32 + 8*15)
+    a.close()
+    with self.assertRaises(ValueError):
+      TiledMatrix(self.path("zero"), 0, 3)
+    with self.assertRaises(ValueError):
+      TiledMatrix(self.path("zero"), 2, 3, tileSize=0)
+    with self.assertRaises(ValueError):
+      TiledMatrix(self.path("zero"), 2, 3, cacheSize=0)
+    with self.assertRaises(TypeError):
+      TiledMatrix.FromMatrix(self.path("zero"), [[1,2], [3,4]])
+
+  def test_tiles(self):
+    self.assertEqual(self.A.asMatrix(), self.a)
+    self.assertEqual(self.A.tilesCount, (4, 3))
+    self.assertEqual(self.A.getTile(3, 2), self.a.getSubmatrix(12, 13, 8, 11).copy())
+    self.assertEqual(self.A.getDiagonal(), self.a.getDiagonal())
+    self.assertEqual(self.B.transpose().getDiagonal(), self.b.getDiagonal())
+    self.A.setTile(1, 1, Matrix.Identity(4))
+    self.assertEqual(self.A[5, 5], 1)
+    self.assertEqual(self.A[5, 6], 0)
+    with self.assertRaises(MatrixError):
+      self.A.setTile(3, 2, Matrix.Identity(4))
+    with self.assertRaises(IndexError):
+      self.A.getTile(4, 0)
+    self.assertLessEqual(len(self.A._cache), self.A.cacheSize)
+
+  def test_items(self):
+    self.assertEqual(self.A[12, 10], self.a[12, 10])
+    self.assertEqual(self.A[-1, -1], self.a[12, 10])
+    self.A[6, 7] = 100
+    self.A.cacheSize = 1
+    self.assertEqual(self.A[6, 7], 100)
+    with self.assertRaises(IndexError):
+      self.A[13, 0]
+    with self.assertRaises(TypeError):
+      self.A[1]
+
+  def test_open(self):
+    self.A[0, 0] = 7
+    self.A.close()
+    with TiledMatrix.Open(self.path("a"), cacheSize=1) as a:
+      self.assertEqual(a.tileSize, 4)
+      self.assertEqual(a[0, 0], 7)
+      self.assertEqual(a[1, 2], self.a[1, 2])
+    with open(self.path("c"), "wb") as f:
+      f.write(b"not a matrix file")
+    with self.assertRaises(MatrixError):
+      TiledMatrix.Open(self.path("c"))
+
+  def test_operators(self):
+    self.assertEqual((self.A + self.A).asMatrix(), self.a + self.a)
+    self.assertTrue((self.A - self.A).asMatrix().isZero())
+    self.assertEqual((2*self.A).asMatrix(), 2*self.a)
+    self.assertEqual(self.A.transpose().asMatrix(), self.a.transpose())
+    self.assertEqual((self.A*self.B).asMatrix().round(8), (self.a*self.b).round(8))
+    self.assertEqual((self.A*self.b).round(8), (self.a*self.b).round(8))
+    self.assertEqual((self.A*self.b.getCol(0)).round(8), (self.a*self.b.getCol(0)).round(8))
+    with self.assertRaises(MatrixError):
+      self.A*self.A
+    with self.assertRaises(MatrixError):
+      self.A + self.B
+    self.assertEqual(sorted(os.listdir(self.directory)), ["a", "b"])
+
+  def test_solve(self):
+    a = randomMatrix(10, 10)
+    with TiledMatrix.FromMatrix(self.path("square"), a, tileSize=3, cacheSize=2) as A:
+      b = self.b.getSubmatrix(0, 10, 0, 7)
+      self.assertTrue((a*A.solve(b) - b).round(6).isZero())
+      x = A.solve(Vector(range(10)))
+      self.assertIsInstance(x, Vector)
+      self.assertEqual((a*x).asVector().round(6), Vector(range(10)))
+      with self.assertRaises(MatrixError):
+        A.solve(Vector(3))
+    with TiledMatrix.FromMatrix(self.path("singular"), Matrix([[1,2,3], [2,4,6], [1,0,1]]), tileSize=2) as A:
+      with self.assertRaises(MatrixError):
+        A.solve(Vector([1,2,3]))
+    with self.assertRaises(NotImplementedError):
+      self.A.solve(Vector(13))
+
+
+if __name__ == '__main__':
+  unittest.main()
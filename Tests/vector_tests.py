@@ -3,23 +3,32 @@ import sys
 import os
 import random
 import math
+import struct
+import ctypes
+from array import array
 sys.path.append(os.path.abspath(".."))
 from linear_algebra import *
+if sys.version_info[0] >= 3:
+  long = int
+try:
+  import numpy
+except ImportError:
+  numpy = None
 
 class TestVectorConstructor(unittest.TestCase):
 
   def test_int(self):
-    for i in xrange(1000):
+    for i in range(1000):
       with self.assertRaises(ValueError):
         Vector(-i)
-    for i in xrange(1, 1000):
+    for i in range(1, 1000):
       self.assertEqual(Vector(i).values, [0]*i)
 
   def test_long(self):
-    for i in xrange(1000):
+    for i in range(1000):
       with self.assertRaises(ValueError):
         Vector(long(-i))
-    for i in xrange(1, 1000):
+    for i in range(1, 1000):
       self.assertEqual(Vector(long(i)).values, [0]*i)
 
   def test_list(self):
@@ -35,16 +44,14 @@ class TestVectorConstructor(unittest.TestCase):
     self.assertEqual(Vector(iter([1,2,3])).values, [1,2,3])
 
   def test_str(self):
-    with self.assertRaises(NotImplementedError):
+    with self.assertRaises(VectorError):
       Vector("")
-    with self.assertRaises(NotImplementedError):
-      Vector("1,2,3")
+    self.assertEqual(Vector("1,2,3").values, [1,2,3])
 
   def test_unicode(self):
-    with self.assertRaises(NotImplementedError):
+    with self.assertRaises(VectorError):
       Vector(u"")
-    with self.assertRaises(NotImplementedError):
-      Vector(u"1,2,3")
+    self.assertEqual(Vector(u"1,2,3").values, [1,2,3])
 
   def test_float(self):
     with self.assertRaises(VectorError):
@@ -58,16 +65,16 @@ class TestVectorConstructor(unittest.TestCase):
 class TestVectorFactories(unittest.TestCase):
 
   def test_Zero(self):
-    for i in xrange(1000):
+    for i in range(1000):
       with self.assertRaises(ValueError):
         Vector.Zero(-i)
-    for i in xrange(1, 1000):
+    for i in range(1, 1000):
       self.assertEqual(Vector.Zero(i).values, [0]*i)
 
-    for i in xrange(1000):
+    for i in range(1000):
       with self.assertRaises(ValueError):
         Vector.Zero(long(-i))
-    for i in xrange(1, 1000):
+    for i in range(1, 1000):
       self.assertEqual(Vector.Zero(long(i)).values, [0]*i)
 
     with self.assertRaises(TypeError):
@@ -121,11 +128,70 @@ class TestVectorFactories(unittest.TestCase):
     with self.assertRaises(TypeError):
       Vector.FromList(u"1,2,3")
 
+  def test_FromBuffer(self):
+    buf = array('d', [1,2,3])
+    x = Vector.FromBuffer(buf)
+    self.assertEqual(x, Vector([1,2,3]))
+    buf[0] = 5
+    self.assertEqual(x[0], 5)
+    with self.assertRaises(VectorError):
+      Vector.FromBuffer(array('d'))
+    with self.assertRaises(TypeError):
+      Vector.FromBuffer([1,2,3])
+    with self.assertRaises(TypeError):
+      Vector.FromBuffer(array('i', [1,2,3]))
+    if numpy is not None:
+      buf = numpy.array([1.,2.,3.])
+      x = Vector.FromBuffer(buf)
+      self.assertEqual(x.backend, "numpy")
+      buf[1] = 7
+      self.assertEqual(x[1], 7)
+      self.assertEqual(Vector.FromBuffer(buf, "python").backend, "python")
+      self.assertEqual(Vector.FromBuffer(buf, "python").values, [1,7,3])
+    x = Vector.FromBuffer((ctypes.c_double*3)(1,2,3), "python")
+    self.assertEqual(x, Vector([1,2,3]))
+
+  def test_buffer(self):
+    buf = (ctypes.c_double*3)(1,2,3)
+    self.assertEqual(Vector(buf), Vector([1,2,3]))
+    self.assertEqual(Vector(memoryview(buf)), Vector([1,2,3]))
+    with self.assertRaises(VectorError):
+      Vector((ctypes.c_double*2*2)((1,2), (3,4)))
+    for backend in ("python", "numpy") if numpy is not None else ("python",):
+      x = Vector([1,2,3], backend)
+      view = x.asMemoryview()
+      self.assertEqual(view.shape, (3,))
+      self.assertEqual(struct.unpack("<3d", view.tobytes()), (1,2,3))
+      if numpy is not None:
+        self.assertEqual(numpy.asarray(x[::2].asMemoryview()).tolist(), [1,3])
+        numpy.asarray(view)[2] = 5
+        self.assertEqual(x[2], 5)
+
+  @unittest.skipIf(numpy is not None or sys.version_info[0] < 3, "numpy is installed or memoryview of array isn't supported")
+  def test_buffer_without_numpy(self):
+    x = Vector([1,2,3,4])
+    view = x.asMemoryview()
+    self.assertEqual(view.format, "d")
+    self.assertEqual(view[0], 1)
+    self.assertEqual(view.tolist(), [1,2,3,4])
+    self.assertEqual(struct.unpack("4d", view.tobytes()), (1,2,3,4))
+    view[3] = 5
+    self.assertEqual(x[3], 5)
+    strided = x[::-2].asMemoryview()
+    self.assertEqual(strided.tolist(), [5,2])
+    strided[1] = 7
+    self.assertEqual(x[1], 7)
+
   def test_Parse(self):
-    self.assertEqual(Vector.Parse(""), NotImplemented)
-    self.assertEqual(Vector.Parse("1,2,3"), NotImplemented)
-    self.assertEqual(Vector.Parse(u""), NotImplemented)
-    self.assertEqual(Vector.Parse(u"1,2,3"), NotImplemented)
+    x = Vector([1,-2.5,3e-3])
+    self.assertEqual(Vector.Parse(repr(x)), x)
+    self.assertEqual(Vector.Parse(str(x)), x)
+    self.assertEqual(Vector.Parse("[1, -2.5, 3e-3]"), x)
+    self.assertEqual(Vector.Parse(u"1\t-2.5\t3e-3\n"), x)
+    self.assertEqual(Vector.Parse(" 1  -2.5 3e-3 ", "numpy"), x)
+    for value in ["", u"", "[]", "1,,2", "1,x", "Vector([])"]:
+      with self.assertRaises(VectorError):
+        Vector.Parse(value)
 
     with self.assertRaises(TypeError):
       Vector.Parse(0)
@@ -174,6 +240,17 @@ class TestVectorProperties(unittest.TestCase):
 
   def test_magnitude(self):
     self.assertEqual(Vector([3, 4]).magnitude, 5)
+    x = Vector([3, 4, 12])
+    self.assertEqual(x.magnitude, 13)
+    self.assertEqual(x.getCache(), {"magnitude": 13})
+    x[2] = 0
+    self.assertEqual(x.magnitude, 5)
+    x[1:][0] = 0
+    self.assertEqual(x.magnitude, 3)
+    x *= 2
+    self.assertEqual(x.magnitude, 6)
+    x.clearCache()
+    self.assertEqual(x.getCache(), {})
     self.assertEqual(Vector([3, 4, 3.3166247903553998491149327366707]).magnitude, 6)
     for i in range(1, 100):
       self.assertEqual(Vector(i).magnitude, 0)
@@ -193,6 +270,10 @@ class TestVectorProperties(unittest.TestCase):
     with self.assertRaises(AttributeError):
       del Vector(5).magnitude
 
+  def test_slots(self):
+    with self.assertRaises(AttributeError):
+      Vector(3).name = "v"
+
 
 class TestVectorTestingMethods(unittest.TestCase):
 
@@ -210,7 +291,8 @@ class TestVectorTestingMethods(unittest.TestCase):
     for i in range(1, 100):
       self.assertFalse(Vector(i).isNormalized())
     self.assertFalse(Vector([1,2,3]).isNormalized())
-    self.assertFalse(Vector([1./math.sqrt(2)]*2).isNormalized())
+    v = Vector([1./math.sqrt(2)]*2)
+    self.assertEqual(v.isNormalized(), v.magnitude == 1)
 
 
 class TestVectorOtherMethods(unittest.TestCase):
@@ -310,7 +392,7 @@ class TestVectorBuiltinFunctions(unittest.TestCase):
     self.assertEqual(list(iter(Vector([1,2,3,4]))), [1,2,3,4])
 
   def test_getitem(self):
-    myList = [random.uniform(-50, 50) for i in xrange(50)]
+    myList = [random.uniform(-50, 50) for i in range(50)]
     vec = Vector(myList)
     for i, v in enumerate(myList):
       self.assertEqual(vec[i], v)
@@ -318,6 +400,22 @@ class TestVectorBuiltinFunctions(unittest.TestCase):
     with self.assertRaises(IndexError):
       vec[100]
 
+  def test_getitem_slice(self):
+    for backend in ("python", "numpy"):
+      vec = Vector([1,2,3,4,5,6], backend)
+      self.assertEqual(vec[1:4], Vector([2,3,4]))
+      self.assertEqual(vec[::2], Vector([1,3,5]))
+      self.assertEqual(vec[::-1], Vector([6,5,4,3,2,1]))
+      self.assertEqual(vec[1::2][1:], Vector([4,6]))
+      view = vec[1::2]
+      view[2] = 60
+      self.assertEqual(vec[5], 60)
+      own = vec[1:3].copy()
+      own[0] = 20
+      self.assertEqual(vec[1], 2)
+      with self.assertRaises(VectorError):
+        vec[3:3]
+
   def test_setitem(self):
     v = Vector(5)
     v[0] = 14
@@ -458,5 +556,88 @@ class TestVectorOperators(unittest.TestCase):
     with self.assertRaises(TypeError):
       [1,2,3] / Vector(5)
 
+  def test_iadd(self):
+    v = Vector([1,2,3])
+    w = v
+    v += Vector([4,-5,6])
+    self.assertIs(v, w)
+    self.assertEqual(v.values, [5,-3,9])
+    with self.assertRaises(VectorError):
+      v += Vector(2)
+    with self.assertRaises(TypeError):
+      v += 5
+
+  def test_isub(self):
+    v = Vector([1,2,3])
+    w = v
+    v -= Vector([4,-5,6])
+    self.assertIs(v, w)
+    self.assertEqual(v.values, [-3,7,-3])
+    with self.assertRaises(VectorError):
+      v -= Vector(2)
+    with self.assertRaises(TypeError):
+      v -= None
+
+  def test_imul(self):
+    v = Vector([1,2,3])
+    w = v
+    v *= 2
+    self.assertIs(v, w)
+    self.assertEqual(v.values, [2,4,6])
+    v *= Vector([1,1,1])
+    self.assertEqual(v, 12)
+    with self.assertRaises(TypeError):
+      w *= "asd"
+
+  def test_idiv(self):
+    v = Vector([1,2,5])
+    w = v
+    v /= 5
+    self.assertIs(v, w)
+    self.assertEqual(v.values, [0.2,0.4,1])
+    with self.assertRaises(ZeroDivisionError):
+      v /= 0
+    with self.assertRaises(TypeError):
+      v /= None
+
+
+class TestVectorBackend(unittest.TestCase):
+
+  def test_default(self):
+    self.assertEqual(Vector(3).backend, "python")
+    with self.assertRaises(ValueError):
+      Vector(3, "fortran")
+
+  @unittest.skipIf(numpy is not None, "numpy is installed")
+  def test_fallback(self):
+    self.assertEqual(Vector([1,2,3], "numpy").backend, "python")
+
+  @unittest.skipIf(numpy is None, "numpy is not installed")
+  def test_numpy(self):
+    v = Vector([2,5,-6,4], "numpy")
+    w = Vector([1,2,3,4])
+    self.assertEqual(v.backend, "numpy")
+    self.assertIsInstance(v._vals, numpy.ndarray)
+    self.assertEqual(v.values, [2,5,-6,4])
+    self.assertEqual(type(v.values[0]), float)
+    self.assertEqual(v.size, 4)
+    self.assertEqual(repr(v), "Vector([2.0, 5.0, -6.0, 4.0])")
+    self.assertEqual(v, Vector([2,5,-6,4]))
+    self.assertEqual(v.magnitude, 9)
+    self.assertEqual(v*w, 10)
+    self.assertEqual((v+w).values, [3,7,-3,8])
+    self.assertEqual((v-w).values, [1,3,-9,0])
+    self.assertEqual((v*2).values, [4,10,-12,8])
+    self.assertEqual((v+w).backend, "numpy")
+    self.assertEqual(v[1:3].values, [5,-6])
+    self.assertEqual(Vector(3, "numpy"), 0)
+    self.assertEqual(Vector([2,5,7], "numpy").cross(Vector([3,1,2])), Vector([3,17,-13]))
+    with self.assertRaises(VectorError):
+      Vector([], "numpy")
+    with self.assertRaises(VectorError):
+      Vector([[1,2]], "numpy")
+    with self.assertRaises(VectorError):
+      Vector(iter("1,2,3"), "numpy")
+
 if __name__ == '__main__':
   unittest.main()
\ No newline at end of file
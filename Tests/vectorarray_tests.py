@@ -0,0 +1,151 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(".."))
+from linear_algebra import *
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+class TestVectorArrayConstructor(unittest.TestCase):
+
+  def test_int_int(self):
+    self.assertEqual(VectorArray(2,3).asList(), [[0,0,0], [0,0,0]])
+    with self.assertRaises(ValueError):
+      VectorArray(0, 3)
+    with self.assertRaises(ValueError):
+      VectorArray(2, -3)
+
+  def test_list(self):
+    self.assertEqual(VectorArray([[1,2,3], [4,5,6]]).asList(), [[1,2,3], [4,5,6]])
+    self.assertEqual(VectorArray([Vector([1,2]), Vector([3,4])]).asList(), [[1,2], [3,4]])
+    with self.assertRaises(VectorError):
+      VectorArray([])
+    with self.assertRaises(VectorError):
+      VectorArray([[]])
+    with self.assertRaises(VectorError):
+      VectorArray([[1,2], [3,4,5]])
+    with self.assertRaises(VectorError):
+      VectorArray([[1,2], None])
+    with self.assertRaises(TypeError):
+      VectorArray("1,2,3")
+
+
+class TestVectorArrayMethods(unittest.TestCase):
+
+  def setUp(self):
+    self.vectors = [Vector([random.uniform(-50, 50) for j in range(3)]) for i in range(20)]
+    self.others = [Vector([random.uniform(-50, 50) for j in range(3)]) for i in range(20)]
+    self.a = VectorArray(self.vectors)
+    self.b = VectorArray(self.others)
+
+  def test_properties(self):
+    self.assertEqual(self.a.count, 20)
+    self.assertEqual(self.a.dim, 3)
+    self.assertEqual(len(self.a), 20)
+    with self.assertRaises(AttributeError):
+      self.a.count = 5
+
+  def test_asVectors(self):
+    self.assertEqual(self.a.asVectors(), self.vectors)
+    self.assertEqual(list(self.a), self.vectors)
+    self.assertEqual(VectorArray(self.a.asVectors()), self.a)
+
+  def test_getitem(self):
+    self.assertEqual(self.a[0], self.vectors[0])
+    self.assertEqual(self.a[-1], self.vectors[-1])
+    with self.assertRaises(IndexError):
+      self.a[20]
+    with self.assertRaises(TypeError):
+      self.a[1:3]
+
+  def test_setitem(self):
+    self.a[1] = Vector([1,2,3])
+    self.assertEqual(self.a[1], Vector([1,2,3]))
+    self.a[-1] = [4,5,6]
+    self.assertEqual(self.a[19], Vector([4,5,6]))
+    with self.assertRaises(VectorError):
+      self.a[0] = [1,2]
+
+  def test_dot(self):
+    res = self.a.dot(self.b)
+    for i in range(20):
+      self.assertAlmostEqual(res[i], self.vectors[i].dot(self.others[i]))
+    res = self.a.dot(Vector([1,2,3]))
+    for i in range(20):
+      self.assertAlmostEqual(res[i], self.vectors[i].dot(Vector([1,2,3])))
+    with self.assertRaises(VectorError):
+      self.a.dot(VectorArray(3,3))
+    with self.assertRaises(VectorError):
+      self.a.dot(Vector(2))
+    with self.assertRaises(TypeError):
+      self.a.dot([1,2,3])
+
+  def test_cross(self):
+    res = self.a.cross(self.b)
+    for i in range(20):
+      self.assertEqual(res[i].round(8), self.vectors[i].cross(self.others[i]).round(8))
+    self.assertEqual(VectorArray([[2,5,7]]).cross(Vector([3,1,2])).asList(), [[3,17,-13]])
+    with self.assertRaises(NotImplementedError):
+      VectorArray(2,4).cross(VectorArray(2,4))
+
+  def test_norm(self):
+    res = self.a.norm()
+    for i in range(20):
+      self.assertAlmostEqual(res[i], self.vectors[i].magnitude)
+
+  def test_normalize(self):
+    res = self.a.normalize()
+    for i in range(20):
+      self.assertEqual(res[i].round(10), self.vectors[i].normalize().round(10))
+    with self.assertRaises(ZeroDivisionError):
+      VectorArray([[1,2], [0,0]]).normalize()
+
+  def test_add(self):
+    res = self.a.add(self.b)
+    self.assertEqual(res, self.a + self.b)
+    for i in range(20):
+      self.assertEqual(res[i], self.vectors[i] + self.others[i])
+    self.assertEqual((VectorArray([[1,2], [3,4]]) + Vector([1,1])).asList(), [[2,3], [4,5]])
+    with self.assertRaises(TypeError):
+      self.a + 5
+
+  def test_scale(self):
+    res = self.a.scale(2.5)
+    self.assertEqual(res, self.a * 2.5)
+    self.assertEqual(res, 2.5 * self.a)
+    for i in range(20):
+      self.assertEqual(res[i], self.vectors[i] * 2.5)
+
+  def test_views(self):
+    m = Matrix([[1,2,3], [4,5,6], [7,8,9]], backend="python")
+    a = VectorArray([[1,0,0], [0,1,0]], backend="python")
+    self.assertEqual(a.dot(m.getRow(1)).asList(), [4, 5])
+    self.assertEqual(a.add(m.getCol(0)).asList(), [[2,4,7], [1,5,7]])
+    self.assertEqual(a.dot(Vector([1,2,3,4,5,6], backend="python")[::2]).asList(), [1, 3])
+
+  def test_repr(self):
+    self.assertEqual(repr(VectorArray([[1,2], [3,4]])), "VectorArray([[1.0, 2.0], [3.0, 4.0]])")
+
+  @unittest.skipIf(numpy is None, "numpy is not installed")
+  def test_numpy(self):
+    a = VectorArray(self.vectors, backend="numpy")
+    b = VectorArray(self.others, backend="numpy")
+    self.assertEqual(a.backend, "numpy")
+    self.assertEqual(a, self.a)
+    self.assertEqual(a.dot(b).round(8), self.a.dot(self.b).round(8))
+    for x, y in zip(a.cross(b), self.a.cross(self.b)):
+      self.assertEqual(x.round(8), y.round(8))
+    self.assertEqual(a.norm().round(8), self.a.norm().round(8))
+    for x, y in zip(a.normalize(), self.a.normalize()):
+      self.assertEqual(x.round(10), y.round(10))
+    self.assertEqual(a.add(b), self.a.add(self.b))
+    self.assertEqual(a.add(Vector([1,2,3])), self.a.add(Vector([1,2,3])))
+    self.assertEqual(a.scale(3), self.a.scale(3))
+    with self.assertRaises(ZeroDivisionError):
+      VectorArray([[1,2], [0,0]], backend="numpy").normalize()
+
+if __name__ == '__main__':
+  unittest.main()
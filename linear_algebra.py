@@ -3,13 +3,476 @@ Module implements Vector and Matrix classes.
 See readme at github.
 Repository: https://github.com/Maratori/Linear-Algebra
 """
+from __future__ import division
 
-__all__ = ["Vector", "Matrix", "VectorError", "MatrixError"]
+__all__ = ["Vector", "Matrix", "DiagonalMatrix", "TriangularMatrix", "SymmetricMatrix", "BandedMatrix", "SparseMatrix",
+           "TiledMatrix", "VectorArray", "LUFactorization", "CholeskyFactorization", "LDLFactorization", "VectorError",
+           "MatrixError", "setBackend", "getBackend", "setMulAlgorithm", "getMulAlgorithm", "setParallel", "getParallel",
+           "setCaching", "getCaching", "Expression", "setInstrumentation", "getInstrumentation", "instrumentation",
+           "getCounters", "resetCounters", "exportCounters", "solveCG", "solveGMRES", "solveBiCGSTAB"]
 __version__ = "0.2.0"
 __author__ = "Marat Reymers"
 
+# Modules of rarely used features (re, json, ctypes, tempfile, multiprocessing) are imported where they
+# are used to keep import of module fast
+import sys
+import os
 import math
 import numbers
+import struct
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from itertools import count
+from operator import add, sub, mul, truediv
+from timeit import default_timer
+
+# Module is written for Python 3. Python 2 gets iterator builtins and text types bound once at import,
+# so no call checks interpreter version
+if sys.version_info[0] < 3:
+  from itertools import imap as map, izip as zip
+  range = xrange
+  _TEXT_TYPES = (str, unicode)
+else:
+  _TEXT_TYPES = (str,)
+
+if sys.version_info >= (3, 8):
+  from math import prod as _prod
+  
+  def _norm(vals):
+    """Get Euclidean norm of sequence of floats"""
+    return math.hypot(*vals)
+else:
+  from functools import reduce
+  
+  def _prod(values):
+    """Get product of sequence of numbers"""
+    return reduce(mul, values, 1)
+  
+  def _norm(vals):
+    """Get Euclidean norm of sequence of floats"""
+    return math.sqrt(math.fsum(map(mul, vals, vals)))
+
+try:
+  import numpy
+  _ndarray = numpy.ndarray
+except ImportError:
+  numpy = None
+  _ndarray = ()
+
+# Storage backends: "python" keeps components in flat array('d'), "numpy" in numpy.ndarray
+BACKENDS = ("python", "numpy")
+_backend = "python"
+
+# Size of the output tile (rows x columns) computed by the multiplication kernel
+_MUL_BLOCK_SIZE = 64
+
+# Matrix multiplication algorithms: "classical" blocked kernel or "strassen" (Strassen-Winograd
+# recursion down to _strassenCrossover, then the classical kernel)
+MUL_ALGORITHMS = ("classical", "strassen")
+_mulAlgorithm = "classical"
+_strassenCrossover = 128
+
+# Number of worker processes for large python-backend operations (1 means serial) and
+# minimal number of scalar operations (m*k*n for products, m*n for elementwise) to use them
+_parallelProcesses = 1
+_parallelThreshold = 1 << 21
+# Persistent pool of worker processes opened by setParallel (None if execution is serial or
+# multiprocessing.shared_memory is missing, then every parallel operation starts its own pool)
+_workerPool = None
+
+# Caching of derived results of vectors and matrices (see setCaching). Versions of components are unique
+# numbers taken from _versions
+_caching = True
+_versions = count(1)
+
+# Instrumentation of public methods and operators (see setInstrumentation): counters [calls, seconds,
+# elements, objects] by operation name, numbers of constructed objects by class name, and replaced class
+# attributes as (class, name, original or None if inherited) to restore when instrumentation is disabled
+_instrumented = False
+_operationCounters = {}
+_constructedCounters = {}
+_objectsConstructed = 0
+_replacedAttributes = []
+
+# Buffer formats (see struct module) of float components
+_DOUBLE_FORMATS = ("d", "<d", "=d", "@d")
+
+# Header of binary matrix file (see Matrix.save): magic, format version, dtype code, 2 reserved bytes,
+# rows count, columns count. Header is followed by row-major little-endian doubles
+_FILE_MAGIC = b"LAMX"
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sBc2xQQ")
+
+# Header of tiled matrix file (see TiledMatrix): as above followed by tile size
+_TILED_MAGIC = b"LATM"
+_TILED_HEADER = struct.Struct("<4sBc2xQQQ")
+
+# Patterns of separators of rows in text parsed by Matrix.Parse: "], [" in repr format, ";" or line breaks otherwise
+_LIST_ROWS_SEPARATOR = r"\]\s*,\s*\["
+_TEXT_ROWS_SEPARATOR = r"[;\r\n]"
+
+# Machine epsilon for float, default tolerance of iterative algorithms
+_EPSILON = 2.**-52
+
+# Preconditioners of Krylov solvers (see solveCG): "jacobi" (inverse of diagonal) or "ilu" (incomplete LU
+# factorization keeping sparsity pattern of the operator)
+PRECONDITIONERS = ("jacobi", "ilu")
+
+def setBackend(name):
+  """
+    Set module-wide default storage backend for new vectors and matrices: "python" or "numpy".
+    Falls back to "python" if numpy can't be imported.
+  """
+  global _backend
+  _backend = _resolveBackend(name)
+
+def getBackend():
+  """Get module-wide default storage backend"""
+  return _backend
+
+def setMulAlgorithm(name, crossover=None):
+  """
+    Set module-wide matrix multiplication algorithm for python backend: "classical" or "strassen".
+    Strassen-Winograd recursion is used while all dimensions are larger than crossover
+    (matrices of crossover size and smaller are multiplied by the classical kernel).
+  """
+  global _mulAlgorithm, _strassenCrossover
+  if name not in MUL_ALGORITHMS:
+    raise ValueError("Algorithm should be one of {0}. {1} passed instead".format(MUL_ALGORITHMS, name))
+  if crossover is not None:
+    if not (isinstance(crossover, numbers.Integral) and crossover > 0):
+      raise ValueError("Crossover should be an int > 0. {0} passed instead".format(crossover))
+    _strassenCrossover = crossover
+  _mulAlgorithm = name
+
+def getMulAlgorithm():
+  """Get module-wide matrix multiplication algorithm and Strassen crossover size as tuple (name, crossover)"""
+  return (_mulAlgorithm, _strassenCrossover)
+
+def setParallel(processes, threshold=None):
+  """
+    Set number of worker processes used by python-backend Matrix product (split by row blocks)
+    and elementwise operations (+, -, round, floor). Operands are passed to workers through
+    shared memory. Operations with less than threshold scalar operations run serially.
+    Workers are started here and kept until setParallel(1) disables parallel execution.
+    Python < 3.8 has no multiprocessing.shared_memory, so there every operation starts and
+    stops its own pool (tens of milliseconds): keep threshold large.
+  """
+  global _parallelProcesses, _parallelThreshold, _workerPool
+  if not (isinstance(processes, numbers.Integral) and processes > 0):
+    raise ValueError("Number of processes should be an int > 0. {0} passed instead".format(processes))
+  if threshold is not None:
+    if not (isinstance(threshold, numbers.Integral) and threshold > 0):
+      raise ValueError("Threshold should be an int > 0. {0} passed instead".format(threshold))
+    _parallelThreshold = threshold
+  if processes != _parallelProcesses:
+    _closePool()
+  _parallelProcesses = processes
+  if processes > 1 and _workerPool is None:
+    _workerPool = _openPool(processes)
+
+def getParallel():
+  """Get number of worker processes and size threshold as tuple (processes, threshold)"""
+  return (_parallelProcesses, _parallelThreshold)
+
+def setCaching(enabled):
+  """
+    Enable or disable module-wide caching of derived results of vectors and matrices (magnitude, trace, det,
+    eigenvalues, isDiagonal, isSymmetric, factorize). Cached results are invalidated by __setitem__ and in-place
+    operators of the instance or of vectors and matrices sharing its components (views), but not by writes
+    to shared buffers (see FromBuffer, asMemoryview): call clearCache after them.
+  """
+  global _caching
+  _caching = bool(enabled)
+
+def getCaching():
+  """Get True if derived results of vectors and matrices are cached"""
+  return _caching
+
+def setInstrumentation(enabled):
+  """
+    Enable or disable module-wide instrumentation of public methods, properties and operators of vectors,
+    matrices and other classes of module: each call counts time, number of components of vector and matrix
+    operands and number of objects constructed (nested calls included). Methods are replaced by counting
+    wrappers while enabled, so disabled instrumentation costs nothing. See getCounters.
+  """
+  global _instrumented
+  enabled = bool(enabled)
+  if enabled != _instrumented:
+    if enabled:
+      _instrumentClasses()
+    else:
+      _restoreClasses()
+    _instrumented = enabled
+
+def getInstrumentation():
+  """Get True if public methods and operators are instrumented"""
+  return _instrumented
+
+@contextmanager
+def instrumentation():
+  """
+    Context manager enabling instrumentation inside with block. Yields dict, which is filled on exit
+    with counters of the block in format of getCounters: with instrumentation() as counters: ...
+  """
+  enabled = _instrumented
+  before = getCounters()
+  counters = {}
+  setInstrumentation(True)
+  try:
+    yield counters
+  finally:
+    setInstrumentation(enabled)
+    counters.update(_subtractCounters(getCounters(), before))
+
+def getCounters():
+  """
+    Get snapshot of instrumentation counters as dict: "operations" maps operation name ("Vector.dot",
+    "Matrix.__mul__", "TiledMatrix.cacheSize=" for setter) to dict of calls, seconds, elements (components
+    of vector and matrix operands) and objects (constructed during calls), "constructed" maps class name
+    to number of constructed objects
+  """
+  operations = dict((name, {"calls": c[0], "seconds": c[1], "elements": c[2], "objects": c[3]})
+                    for name, c in _operationCounters.items())
+  return {"operations": operations, "constructed": dict(_constructedCounters)}
+
+def resetCounters():
+  """Reset instrumentation counters to zero"""
+  global _objectsConstructed
+  _operationCounters.clear()
+  _constructedCounters.clear()
+  _objectsConstructed = 0
+
+def exportCounters(format="json", counters=None):
+  """
+    Get instrumentation counters (current if None passed, or snapshot returned by getCounters) as text:
+    "json" or "prometheus" (text exposition format: linear_algebra_calls_total, _seconds_total, _elements_total
+    and _objects_total by operation, linear_algebra_constructed_total by class)
+  """
+  if counters is None:
+    counters = getCounters()
+  if format == "json":
+    import json
+    return json.dumps(counters, sort_keys=True, indent=2)
+  if format != "prometheus":
+    raise ValueError("Format should be \"json\" or \"prometheus\". {0} passed instead".format(format))
+  lines = []
+  for metric in ("calls", "seconds", "elements", "objects"):
+    lines.append("# TYPE linear_algebra_{0}_total counter".format(metric))
+    for name in sorted(counters["operations"]):
+      lines.append('linear_algebra_{0}_total{{operation="{1}"}} {2!r}'.format(metric, name, counters["operations"][name][metric]))
+  lines.append("# TYPE linear_algebra_constructed_total counter")
+  for name in sorted(counters["constructed"]):
+    lines.append('linear_algebra_constructed_total{{class="{0}"}} {1}'.format(name, counters["constructed"][name]))
+  return "\n".join(lines) + "\n"
+
+def _versionCell(obj):
+  """
+    Get version of components of vector or matrix: list [int] shared with its views, changed on modification.
+    Cell of components shared with views is marked as [int, True] (see _viewOf)
+  """
+  try:
+    return obj._version
+  except AttributeError:
+    obj._version = [next(_versions)]
+    return obj._version
+
+def _modified(obj):
+  """Mark components of vector or matrix and its views as modified, so their cached results become invalid"""
+  _versionCell(obj)[0] = next(_versions)
+
+def _addInPlace(vals, other, factor):
+  """
+    Add factor*other to flat storage vals (array('d') or _View). array('d') is updated by slice assignment
+    (faster than indexing), _View component by component. other is copied only if it shares storage
+    with vals (but isn't vals itself)
+  """
+  if other is not vals and _storageBase(other) is _storageBase(vals):
+    other = other[:]
+  if isinstance(vals, array):
+    if factor == -1:
+      vals[:] = array('d', map(sub, vals, other))
+    else:
+      vals[:] = array('d', map(add, vals, other if factor == 1 else [factor*x for x in other]))
+  else:
+    for k in range(len(vals)):
+      vals[k] += factor*other[k]
+
+def _scaleInPlace(vals, factor):
+  """Multiply components of flat storage vals (array('d') or _View) to factor"""
+  if isinstance(vals, array):
+    vals[:] = array('d', [x*factor for x in vals])
+  else:
+    for k in range(len(vals)):
+      vals[k] *= factor
+
+def _viewOf(obj, view):
+  """Get view (vector or matrix sharing components of obj) sharing version of components with obj"""
+  cell = _versionCell(obj)
+  if len(cell) == 1:
+    cell.append(True)
+  view._version = cell
+  return view
+
+def _cached(obj, name, compute, *args):
+  """Get derived result of vector or matrix from its cache, compute(*args) and cache it if missing or invalid"""
+  if not _caching:
+    return compute(*args)
+  key = (name,) + args if args else name
+  version = _versionCell(obj)[0]
+  memo = getattr(obj, "_memo", None)
+  if memo is None:
+    memo = obj._memo = {}
+  entry = memo.get(key)
+  if entry is not None and entry[0] == version:
+    return entry[1]
+  value = compute(*args)
+  memo[key] = (version, value)
+  return value
+
+def _validCache(obj):
+  """Get dict of valid cached results of vector or matrix"""
+  version = _versionCell(obj)[0]
+  return dict((key, value) for key, (v, value) in getattr(obj, "_memo", {}).items() if v == version)
+
+def _flatBuffer(buf, backend):
+  """
+    Get flat storage of components for buffer: array.array('d'), numpy.ndarray of floats or any
+    other object exposing buffer of doubles (i.e. memoryview, ctypes array).
+    Buffer is shared if backend is omitted or matches its type, otherwise copied.
+    Other buffers are shared by numpy backend (default if numpy is installed) and copied by python backend.
+  """
+  if isinstance(buf, array) and buf.typecode == 'd':
+    if backend is None or _resolveBackend(backend) == "python":
+      return buf
+    return numpy.array(buf, dtype=float)
+  if isinstance(buf, _ndarray) and buf.dtype == float:
+    if backend is None or _resolveBackend(backend) == "numpy":
+      return buf.reshape(-1)
+    return _copyDoubleBuffer(buf, False)[1]
+  if _isDoubleBuffer(buf):
+    if numpy is not None and (backend is None or _resolveBackend(backend) == "numpy"):
+      return numpy.frombuffer(buf, dtype=float)
+    return _copyDoubleBuffer(buf, False)[1]
+  raise TypeError("Buffer should be array.array('d'), numpy.ndarray of floats or other buffer of doubles. {0} passed instead".format(type(buf)))
+
+def _isDoubleBuffer(obj):
+  """Check if object exposes buffer of doubles: array('d'), numpy.ndarray of floats, memoryview, ctypes array..."""
+  if isinstance(obj, array):
+    return obj.typecode == 'd'
+  if isinstance(obj, _ndarray):
+    return obj.dtype == float
+  if isinstance(obj, _TEXT_TYPES):
+    return False
+  try:
+    return memoryview(obj).format in _DOUBLE_FORMATS
+  except TypeError:
+    return False
+
+def _copyDoubleBuffer(obj, useNumpy):
+  """Get tuple (shape, flat storage) with copy of components of buffer of doubles without per-component conversion"""
+  if isinstance(obj, array):
+    return (len(obj),), numpy.frombuffer(obj, dtype=float).copy() if useNumpy else obj[:]
+  if isinstance(obj, _ndarray):
+    shape, data = obj.shape, numpy.ascontiguousarray(obj).tobytes()
+  else:
+    view = memoryview(obj)
+    shape, data = tuple(view.shape), view.tobytes()
+  if useNumpy:
+    return shape, numpy.frombuffer(data, dtype=float).copy()
+  return shape, array('d', data)
+
+def _writeDoubles(f, vals, n):
+  """Write flat storage of components to file as little-endian doubles, row by row (n components) for views"""
+  swap = sys.byteorder != "little"
+  if isinstance(vals, _ndarray):
+    numpy.ascontiguousarray(vals, dtype="<f8").tofile(f)
+  elif isinstance(vals, _View) or swap:
+    for start in range(0, len(vals), n):
+      row = vals[start:start+n]
+      if swap:
+        row.byteswap()
+      row.tofile(f)
+  else:
+    vals.tofile(f)
+
+def _unwrapText(text, name):
+  """Get tuple (body, bracketed) of text with repr wrapper name(...) and outer brackets [...] stripped"""
+  text = text.strip()
+  if text.startswith(name + "(") and text.endswith(")"):
+    text = text[len(name)+1:-1].strip()
+  if text.startswith("[") and text.endswith("]"):
+    return text[1:-1], True
+  return text, False
+
+def _parseRow(text):
+  """Get array('d') of components of comma, tab or whitespace separated row (ValueError if malformed)"""
+  return array('d', map(float, text.split(",") if "," in text else text.split()))
+
+def _readDoubles(f, path, count, offset, mmap, backend):
+  """
+    Read flat storage of count little-endian doubles from file. If mmap and storage is numpy.ndarray
+    (backend is "numpy", or it is omitted and numpy is installed), file is memory-mapped copy-on-write
+  """
+  if _resolveBackend(backend) == "numpy" or mmap and backend is None and numpy is not None:
+    if mmap:
+      vals = numpy.memmap(path, dtype="<f8", mode="c", offset=offset, shape=(count,)).view(_ndarray)
+    else:
+      vals = numpy.fromfile(f, dtype="<f8", count=count)
+    return vals if vals.dtype == float else vals.astype(float)
+  vals = array('d')
+  vals.fromfile(f, count)
+  if sys.byteorder != "little":
+    vals.byteswap()
+  return vals
+
+def _exportBuffer(vals, shape):
+  """
+    Get memoryview (format 'd') of flat storage with specified shape sharing memory with it.
+    Without numpy 2-D views (_View) of array('d') which rows aren't one contiguous run are copied,
+    on Python 2 (no memoryview of array.array) all views are copied.
+  """
+  if isinstance(vals, _ndarray):
+    return memoryview(vals.reshape(shape))
+  if numpy is not None:
+    base = _storageBase(vals)
+    flat = numpy.frombuffer(base, dtype=float) if isinstance(base, array) else base
+    if isinstance(vals, _View):
+      strides = (vals._rowStride*flat.itemsize, vals._colStride*flat.itemsize)
+      flat = numpy.lib.stride_tricks.as_strided(flat[vals._offset:], (vals._rows, vals._cols), strides)
+    return memoryview(flat.reshape(shape))
+  if sys.version_info[0] >= 3:
+    if not isinstance(vals, _View):
+      return memoryview(vals).cast("B").cast("d", shape)
+    flat = memoryview(_storageBase(vals))
+    if vals._colStride == 1 and (vals._rows == 1 or vals._rowStride == vals._cols):
+      return flat[vals._offset:vals._offset+len(vals)].cast("B").cast("d", shape)
+    if len(shape) == 1:
+      stride = vals._colStride if vals._rows == 1 else vals._rowStride
+      return flat[vals._offset::stride][:len(vals)]
+    return memoryview(vals[:]).cast("B").cast("d", shape)
+  import ctypes
+  if isinstance(vals, _View):
+    vals = vals[:]
+  ctype = ctypes.c_double
+  for size in reversed(shape):
+    ctype = ctype*size
+  res = ctype.from_address(vals.buffer_info()[0])
+  res._storage = vals
+  return memoryview(res)
+
+def _resolveBackend(name):
+  """Get storage backend to use for passed name (None means module-wide default)"""
+  if name is None:
+    return _backend
+  if name not in BACKENDS:
+    raise ValueError("Backend should be one of {0}. {1} passed instead".format(BACKENDS, name))
+  if numpy is None:
+    return "python"
+  return name
 
 class VectorError(Exception):
   """An exception class for Vector"""
@@ -24,35 +487,60 @@ class Vector(object):
     class Vector(object):
 
     A simple vector class with basic operations and operator overloading.
+    Components are stored in compact array.array('d').
 
     Constructors:
       Vector(int) -> zero Vector with specified size
       Vector(iterable) -> Vector with components from any iterable object, i.e. list
-      Vector(str) not implemented yet
+      Vector(buffer) -> Vector with components copied from 1-D buffer of doubles (i.e. memoryview)
+      Vector(str) -> Vector with components parsed from repr, CSV, TSV or whitespace-delimited text
 
       Vector.Zero(int) <==> Vector(int)
       Vector.FromList(iterable) <==> Vector(iterable)
       Vector.Parse(str) <==> Vector(str)
+
+    Optional argument backend ("python" or "numpy") selects storage of components.
+    Module-wide default is used if it is omitted (see setBackend).
   """
   
-  def __init__(self, arg):
+  __slots__ = ("_vals", "_version", "_memo")
+  
+  def __init__(self, arg, backend=None):
     """
       Vector constructor
 
       Vector(int) -> zero Vector with specified size
       Vector(iterable) -> Vector with components from any iterable object, i.e. list
-      Vector(str) not implemented yet
+      Vector(buffer) -> Vector with components copied from 1-D buffer of doubles (i.e. memoryview)
+      Vector(str) -> Vector with components parsed from repr, CSV, TSV or whitespace-delimited text
+      Vector(..., backend="numpy") -> Vector stored in numpy.ndarray
     """
+    useNumpy = _resolveBackend(backend) == "numpy"
     if isinstance(arg, numbers.Integral):
       if arg > 0:
-        self._vals = [0.]*arg
+        self._vals = numpy.zeros(arg) if useNumpy else array('d', [0.])*arg
       else:
         raise ValueError("Argument should be an int > 0 or iterable object. {0} passed instead".format(arg))
-    elif isinstance(arg, (str, unicode)):
-      raise NotImplementedError("Argument should be an int > 0 or iterable object. {0} passed instead".format(arg))
+    elif isinstance(arg, _TEXT_TYPES):
+      self._vals = Vector.Parse(arg, backend)._vals
+    elif _isDoubleBuffer(arg):
+      shape, self._vals = _copyDoubleBuffer(arg, useNumpy)
+      if len(shape) != 1:
+        raise VectorError("Can't create vector.")
+      if len(self._vals) == 0:
+        raise VectorError("Vector size should be positive.")
+    elif useNumpy:
+      try:
+        self._vals = numpy.array(arg if isinstance(arg, _ndarray) else list(arg), dtype=float)
+      except:
+        raise VectorError("Can't create vector.")
+      if self._vals.ndim != 1:
+        raise VectorError("Can't create vector.")
+      if len(self._vals) == 0:
+        raise VectorError("Vector size should be positive.")
     else:
       try:
-        self._vals = [float(x) for x in arg]
+        self._vals = array('d', [float(x) for x in arg])
       except:
         raise VectorError("Can't create vector.")
       if len(self._vals) == 0:
@@ -71,12 +559,19 @@ class Vector(object):
   @property
   def values(self):
     """list: read-only list of components"""
-    return list(self._vals)
+    return self._vals.tolist()
   
   @property
   def magnitude(self):
-    """float: read-only vector magnitude (Euclidean norm)"""
-    return math.sqrt(self*self)
+    """float: read-only vector magnitude (Euclidean norm), cached (see setCaching)"""
+    if isinstance(self._vals, _ndarray):
+      return _cached(self, "magnitude", lambda: math.sqrt(self*self))
+    return _cached(self, "magnitude", lambda: _norm(self._vals))
+  
+  @property
+  def backend(self):
+    """str: read-only storage backend ("python" or "numpy")"""
+    return "numpy" if isinstance(_storageBase(self._vals), _ndarray) else "python"
   
   
   #=================
@@ -97,18 +592,55 @@ class Vector(object):
   @staticmethod
   def FromList(x):
     """Vector.FromList(iterable) -> Vector with components from any iterable object, i.e. list"""
-    if not isinstance(x, (numbers.Number, str, unicode)):
+    if not isinstance(x, (numbers.Number,) + _TEXT_TYPES):
       return Vector(x)
     else:
       raise TypeError("Argument should be an iterable. {0} passed instead".format(type(x)))
 
   @staticmethod
-  def Parse(value):
-    """Vector.Parse(str) -> Vector"""
-    if isinstance(value, (str, unicode)):
-      return NotImplemented
+  def _fromFlat(vals, backend):
+    """Get Vector with components from sequence of numbers (not validated)"""
+    res = Vector.__new__(Vector)
+    if _resolveBackend(backend) == "numpy":
+      res._vals = numpy.array(vals, dtype=float)
     else:
+      res._vals = array('d', vals)
+    return res
+
+  @staticmethod
+  def _adopt(vals):
+    """Get Vector which takes ownership of array('d') or 1-D numpy.ndarray of floats (not validated, not copied)"""
+    res = Vector.__new__(Vector)
+    res._vals = vals
+    return res
+
+  @staticmethod
+  def FromBuffer(buf, backend=None):
+    """
+      Vector.FromBuffer(buffer) -> Vector which shares memory with array.array('d') or numpy.ndarray of floats.
+      Components are not validated, caller guarantees well-formed float data.
+      Data is copied only if other backend is requested.
+    """
+    vals = _flatBuffer(buf, backend)
+    if len(vals) == 0:
+      raise VectorError("Vector size should be positive.")
+    return Vector._adopt(vals)
+
+  @staticmethod
+  def Parse(value, backend=None):
+    """
+      Vector.Parse(str) -> Vector with components parsed from repr format "Vector([1.0, 2.0])",
+      list "[1, 2]", CSV "1,2", TSV or whitespace-delimited text "1 2"
+    """
+    if not isinstance(value, _TEXT_TYPES):
       raise TypeError("Argument should be a string. {0} passed instead".format((type(value))))
+    try:
+      vals = _parseRow(_unwrapText(value, "Vector")[0])
+    except ValueError:
+      raise VectorError("Can't parse vector.")
+    if len(vals) == 0:
+      raise VectorError("Vector size should be positive.")
+    return Vector._adopt(_flatBuffer(vals, _resolveBackend(backend)))
   
   
   #========
@@ -132,6 +664,27 @@ class Vector(object):
     """Get list of components.\nvector.asList() <==> vector.values"""
     return self.values
   
+  def lazy(self):
+    """Get Expression with this vector as operand (operators on it are evaluated lazily)"""
+    return Expression(self)
+
+  def copy(self):
+    """Get Vector with own copy of components (i.e. to detach a view from its matrix or vector)"""
+    return Vector._fromFlat(self._vals, self.backend)
+
+  def getCache(self):
+    """Get dict of valid cached derived results (see setCaching)"""
+    return _validCache(self)
+
+  def clearCache(self):
+    """Clear cached results of this vector and its views, i.e. after modification through shared buffer"""
+    self._memo = {}
+    _modified(self)
+
+  def asMemoryview(self):
+    """Get memoryview of components (format 'd', shape (size,)) sharing memory with vector (see _exportBuffer for copies)"""
+    return _exportBuffer(self._vals, (len(self._vals),))
+  
   
   #=================
   #  Linear algebra 
@@ -151,7 +704,7 @@ class Vector(object):
       raise TypeError("Argument should be a Vector.")
     if len(other) != 3:
       raise ValueError("Cross product is defined only for vectors of size 3. Passed vector has size {0}".format(len(other)))
-    return Vector([self[1]*other[2]-self[2]*other[1], self[2]*other[0]-self[0]*other[2], self[0]*other[1]-self[1]*other[0]])
+    return Vector._fromFlat([self[1]*other[2]-self[2]*other[1], self[2]*other[0]-self[0]*other[2], self[0]*other[1]-self[1]*other[0]], self.backend)
   
   
   #===============
@@ -160,19 +713,19 @@ class Vector(object):
   
   def round(self, ndigits=0):
     """Get vector with rounded components (see help(round))"""
-    return Vector([round(x, ndigits) for x in self])
+    return Vector._fromFlat([round(x, ndigits) for x in self], self.backend)
   
   def floor(self):
     """Get vector with floored components (see help(math.floor))"""
-    return Vector(map(math.floor, self))
+    return Vector._fromFlat([math.floor(x) for x in self], self.backend)
   
   def ceil(self):
     """Get vector with ceiled components (see help(math.ceil))"""
-    return Vector(map(math.ceil, self))
+    return Vector._fromFlat([math.ceil(x) for x in self], self.backend)
   
   def trunc(self):
     """Get vector with truncated components (see help(math.trunc))"""
-    return Vector(map(math.trunc, self))
+    return Vector._fromFlat([math.trunc(x) for x in self], self.backend)
   
   def normalize(self):
     """Get normalized vector"""
@@ -189,7 +742,7 @@ class Vector(object):
   
   def __repr__(self):
     """Get string to represent vector by repr()"""
-    return "Vector(" + repr(self._vals) + ")"
+    return "Vector(" + repr(self.values) + ")"
   
   
   #===============
@@ -205,9 +758,14 @@ class Vector(object):
     return iter(self._vals)
   
   def __getitem__(self, key):
-    """Get component by index or Vector by slice"""
+    """Get component by index or Vector by slice. Slice shares components with this vector (see copy)"""
     if isinstance(key, slice):
-      return Vector(self._vals[key])
+      start, stop, step = key.indices(len(self))
+      count = len(range(start, stop, step))
+      if count == 0:
+        raise VectorError("Vector size should be positive.")
+      stride = self._vals._colStride if isinstance(self._vals, _View) else 1
+      return _viewOf(self, Vector._adopt(_makeView(self._vals, start*stride, 1, count, 0, step*stride)))
     else:
       return self._vals[key]
   
@@ -217,6 +775,7 @@ class Vector(object):
       raise TypeError("Can't modify vector by slice")
     else:
       self._vals[key] = float(value)
+      _modified(self)
   
   
   #============
@@ -232,6 +791,8 @@ class Vector(object):
         return all(x==0 for x in self)
       else:
         raise ValueError("Can't compare vector and '{0.__name__}'".format(type(other)))
+    if isinstance(self._vals, _ndarray) or isinstance(other._vals, _ndarray):
+      return numpy.array_equal(self._vals, other._vals)
     return other._vals == self._vals
   
   def __ne__(self, other):
@@ -240,11 +801,13 @@ class Vector(object):
   
   def __pos__(self):
     """Get positive Vector"""
-    return Vector(self)
+    return Vector._fromFlat(self._vals, self.backend)
   
   def __neg__(self):
     """Get negative Vector"""
-    return Vector([-x for x in self])
+    if isinstance(self._vals, _ndarray):
+      return Vector._adopt(-self._vals)
+    return Vector._fromFlat([-x for x in self._vals], "python")
   
   def __add__(self, other):
     """Add vector to vector"""
@@ -252,12 +815,14 @@ class Vector(object):
       return NotImplemented
     if len(self) != len(other):
       raise VectorError("Can't add vectors of different size")
-    return Vector([sum(pair) for pair in zip(self, other)])
+    if isinstance(self._vals, _ndarray):
+      return Vector._adopt(numpy.add(self._vals, other._vals))
+    return Vector._fromFlat(map(add, self._vals, other._vals), "python")
 
   def __radd__(self, other):
     """Add vector to vector or 0 to vector"""
     if isinstance(other, numbers.Integral) and other == 0:
-      return Vector(self)
+      return +self
     elif isinstance(other, Vector):
       return self + other
     else:
@@ -269,17 +834,23 @@ class Vector(object):
       return NotImplemented
     if len(self) != len(other):
       raise VectorError("Can't subtract vectors of different size")
-    return self + -other
+    if isinstance(self._vals, _ndarray):
+      return Vector._adopt(numpy.subtract(self._vals, other._vals))
+    return Vector._fromFlat(map(sub, self._vals, other._vals), "python")
   
   def __mul__(self, other):
     """Multiply vector to scalar or vector to vector (dot product)"""
     if isinstance(other, Vector):
       if len(self) != len(other):
         raise VectorError("Can't multiply (dot product) vectors of different size")
-      return sum(pair[0]*pair[1] for pair in zip(self, other))
+      if isinstance(self._vals, _ndarray):
+        return float(numpy.dot(self._vals, other._vals))
+      return math.fsum(map(mul, self._vals, other._vals))
     try:
       factor = float(other)
-      return Vector([x*factor for x in self])
+      if isinstance(self._vals, _ndarray):
+        return Vector._adopt(self._vals*factor)
+      return Vector._fromFlat([x*factor for x in self._vals], "python")
     except:
       return NotImplemented
   
@@ -290,7 +861,7 @@ class Vector(object):
     except:
       return NotImplemented
   
-  def __div__(self, other):
+  def __truediv__(self, other):
     """Divide vector to scalar"""
     try:
       return self*(1./float(other))
@@ -298,17 +869,75 @@ class Vector(object):
       raise
     except:
       return NotImplemented
+  
+  __div__ = __truediv__
+  
+  def __iadd__(self, other):
+    """Add vector to this vector in place"""
+    if not isinstance(other, Vector):
+      return NotImplemented
+    if len(self) != len(other):
+      raise VectorError("Can't add vectors of different size")
+    if isinstance(self._vals, _ndarray):
+      self._vals += numpy.asarray(other._vals)
+    else:
+      _addInPlace(self._vals, other._vals, 1.)
+    _modified(self)
+    return self
+  
+  def __isub__(self, other):
+    """Subtract vector from this vector in place"""
+    if not isinstance(other, Vector):
+      return NotImplemented
+    if len(self) != len(other):
+      raise VectorError("Can't subtract vectors of different size")
+    if isinstance(self._vals, _ndarray):
+      self._vals -= numpy.asarray(other._vals)
+    else:
+      _addInPlace(self._vals, other._vals, -1.)
+    _modified(self)
+    return self
+  
+  def __imul__(self, other):
+    """Multiply this vector to scalar in place"""
+    if isinstance(other, Vector):
+      return NotImplemented
+    try:
+      factor = float(other)
+    except:
+      return NotImplemented
+    if isinstance(self._vals, _ndarray):
+      self._vals *= factor
+    else:
+      _scaleInPlace(self._vals, factor)
+    _modified(self)
+    return self
+  
+  def __itruediv__(self, other):
+    """Divide this vector to scalar in place"""
+    try:
+      factor = 1./float(other)
+    except ZeroDivisionError:
+      raise
+    except:
+      return NotImplemented
+    return self.__imul__(factor)
+  
+  __idiv__ = __itruediv__
 
 class Matrix(object):
   """
     class Matrix(object):
 
     A simple matrix calss with basic operations and operator overloading.
+    Components are stored row by row in flat compact array.array('d'),
+    component (i, j) has index i*n + j.
 
     Constructors:
       Matrix(int, int) -> zero Matrix with specified number of rows and columns
       Matrix(iterable) -> Matrix with rows form any iterable object, i.e. list
-      Matrix(str) not implemented yet
+      Matrix(buffer) -> Matrix with components copied from 2-D buffer of doubles (i.e. memoryview)
+      Matrix(str) -> Matrix with components parsed from repr, CSV, TSV or whitespace-delimited text
       
       Matrix.Zero(int, int) <==> Matrix(int, int)
       Matrix.Identity(int) -> identity square Matrix with specified size
@@ -316,43 +945,78 @@ class Matrix(object):
       Matrix.FromListOfRows(iterable) <==> Matrix(iterable)
       Matrix.FromListOfCols(iterable) -> Matrix with columns form any iterable object, i.e. list
       Matrix.Parse(str) <==> Matrix(str)
+      Matrix.ParseStream(file) -> Matrix with rows read line by line from file object
       Matrix.RowFromVector(iterable) -> single-row Matrix with components form any iterable object, i.e. list
       Matrix.ColFromVector(iterable) -> single-column Matrix with components form any iterable object, i.e. list
+
+    Optional keyword argument backend ("python" or "numpy") selects storage of components.
+    Module-wide default is used if it is omitted (see setBackend).
   """
   
-  def __init__(self, *args):
+  __slots__ = ("_rowsCount", "_columnsCount", "_vals", "_version", "_memo")
+  
+  def __init__(self, *args, **kwargs):
     """
       Matrix constructor
 
       Matrix(int, int) -> zero Matrix with specified number of rows and columns
       Matrix(iterable) -> Matrix with rows form any iterable object, i.e. list
-      Matrix(str) not implemented yet
+      Matrix(buffer) -> Matrix with components copied from 2-D buffer of doubles (i.e. memoryview)
+      Matrix(str) -> Matrix with components parsed from repr, CSV, TSV or whitespace-delimited text
+      Matrix(..., backend="numpy") -> Matrix stored in flat numpy.ndarray
     """
+    backend = kwargs.pop("backend", None)
+    if kwargs:
+      raise TypeError("Unexpected keyword arguments: {0}".format(", ".join(kwargs)))
+    useNumpy = _resolveBackend(backend) == "numpy"
     if len(args) == 2:
       if (isinstance(args[0], numbers.Integral) and args[0] > 0 and
           isinstance(args[1], numbers.Integral) and args[1] > 0):
         self._rowsCount = args[0]
         self._columnsCount = args[1]
-        self._vals = [[0.]*self._columnsCount for x in xrange(self._rowsCount)]
+        if useNumpy:
+          self._vals = numpy.zeros(self._rowsCount*self._columnsCount)
+        else:
+          self._vals = array('d', [0.])*(self._rowsCount*self._columnsCount)
       else:
         raise ValueError("Two arguments passed. Both should be an int > 0. {0} and {1} passed instead".format(args[0], args[1]))
     elif len(args) == 1:
-      if isinstance(args[0], (str, unicode)):
-        raise NotImplementedError
+      if isinstance(args[0], _TEXT_TYPES):
+        res = Matrix.Parse(args[0], backend)
+        self._rowsCount, self._columnsCount, self._vals = res._rowsCount, res._columnsCount, res._vals
+      elif _isDoubleBuffer(args[0]):
+        shape, self._vals = _copyDoubleBuffer(args[0], useNumpy)
+        if len(shape) != 2:
+          raise MatrixError("Can't create matrix.")
+        if 0 in shape:
+          raise MatrixError("Matrix size should be positive.")
+        self._rowsCount, self._columnsCount = shape
+      elif useNumpy:
+        try:
+          self._vals = numpy.array(args[0] if isinstance(args[0], _ndarray) else [list(row) for row in args[0]], dtype=float, order="C")
+        except:
+          raise MatrixError("Can't create matrix.")
+        if self._vals.ndim != 2:
+          raise MatrixError("Can't create matrix.")
+        if 0 in self._vals.shape:
+          raise MatrixError("Matrix size should be positive.")
+        self._rowsCount, self._columnsCount = self._vals.shape
+        self._vals = self._vals.ravel()
       else:
         try:
           self._rowsCount = len(args[0])
           self._columnsCount = len(args[0][0])
-          self._vals = [[float(x) for x in row] for row in args[0]]
+          rows = [[float(x) for x in row] for row in args[0]]
         except:
           raise MatrixError("Can't create matrix.")
-        if len(self._vals) == 0:
+        if len(rows) == 0:
           raise MatrixError("Matrix size should be positive.")
-        for row in self._vals:
+        for row in rows:
           if len(row) != self._columnsCount:
             raise MatrixError("Can't create matrix.")
           if len(row) == 0:
             raise MatrixError("Matrix size should be positive.")
+        self._vals = array('d', [x for row in rows for x in row])
     else:
       raise TypeError("Wrong numbers of arguments. Should be 1 or 2. {0} passed".format(len(args)))
   
@@ -375,15 +1039,20 @@ class Matrix(object):
     """int: read-only number of columns"""
     return self._columnsCount
   
+  @property
+  def backend(self):
+    """str: read-only storage backend ("python" or "numpy")"""
+    return "numpy" if isinstance(_storageBase(self._vals), _ndarray) else "python"
+  
   @property
   def rows(self):
     """list: read-only list of rows. Each row is a Vector"""
-    return [Vector(row) for row in self._vals]
+    return [self.getRow(i) for i in range(self.m)]
   
   @property
   def cols(self):
     """list: read-only list of columns. Each column is a Vector"""
-    return self.transpose().rows
+    return [self.getCol(j) for j in range(self.n)]
   
   
   #=================
@@ -437,16 +1106,120 @@ class Matrix(object):
   
   @staticmethod
   def Diagonal(x):
-    """Matrix.Diagonal(iterable) -> diagonal square Matrix with diagonal components form any iterable object, i.e. list"""
-    return Matrix([[(x[i] if i == j else 0) for j in range(len(x))] for i in range(len(x))])
+    """
+      Matrix.Diagonal(iterable) -> diagonal square Matrix with diagonal components form any iterable object, i.e. list.
+      See DiagonalMatrix for matrix storing only diagonal components
+    """
+    try:
+      diagonal = [float(v) for v in x]
+    except:
+      raise MatrixError("Can't create matrix.")
+    if not diagonal:
+      raise MatrixError("Matrix size should be positive.")
+    n = len(diagonal)
+    res = Matrix(n, n)
+    for i, v in enumerate(diagonal):
+      res._vals[i*(n+1)] = v
+    return res
 
   @staticmethod
-  def Parse(value):
-    """Matrix.Parse(str) -> Matrix"""
-    if isinstance(value, (str, unicode)):
-      return NotImplemented
+  def _fromFlat(m, n, vals, backend):
+    """Get Matrix m x n with components from flat row-major sequence of numbers (not validated)"""
+    res = Matrix.__new__(Matrix)
+    res._rowsCount = m
+    res._columnsCount = n
+    if _resolveBackend(backend) == "numpy":
+      res._vals = numpy.array(vals, dtype=float)
     else:
+      res._vals = array('d', vals)
+    return res
+
+  @staticmethod
+  def _adopt(m, n, vals):
+    """Get Matrix m x n which takes ownership of flat row-major array('d') or numpy.ndarray of floats (not validated, not copied)"""
+    res = Matrix.__new__(Matrix)
+    res._rowsCount = m
+    res._columnsCount = n
+    res._vals = vals
+    return res
+
+  @staticmethod
+  def FromBuffer(m, n, buf, backend=None):
+    """
+      Matrix.FromBuffer(int, int, buffer) -> Matrix m x n which shares memory with flat row-major
+      array.array('d') or numpy.ndarray of floats. Components are not validated, caller guarantees
+      well-formed float data. Data is copied only if other backend is requested.
+    """
+    if not (isinstance(m, numbers.Integral) and m > 0 and isinstance(n, numbers.Integral) and n > 0):
+      raise ValueError("Size should be an int > 0. {0} and {1} passed instead".format(m, n))
+    vals = _flatBuffer(buf, backend)
+    if len(vals) != m*n:
+      raise MatrixError("Buffer should contain {0} components. {1} passed instead".format(m*n, len(vals)))
+    return Matrix._adopt(m, n, vals)
+
+  @staticmethod
+  def Load(path, mmap=False, backend=None):
+    """
+      Matrix.Load(str) -> Matrix read from binary file written by Matrix.save.
+      Matrix.Load(str, mmap=True) -> Matrix stored in memory-mapped file (numpy backend): file is opened
+      instantly and paged in on access, modifications of matrix are not written back to file.
+      Falls back to reading whole file if numpy can't be imported or backend="python" is passed
+      (backend=None maps file whenever numpy is installed, regardless of setBackend).
+    """
+    with open(path, "rb") as f:
+      header = f.read(_FILE_HEADER.size)
+      if len(header) != _FILE_HEADER.size or header[:len(_FILE_MAGIC)] != _FILE_MAGIC:
+        raise MatrixError("{0} is not a matrix file".format(path))
+      magic, version, dtype, m, n = _FILE_HEADER.unpack(header)
+      if version != _FILE_VERSION or dtype != b"d":
+        raise MatrixError("Unsupported matrix file version {0} or dtype {1!r}".format(version, dtype))
+      if m == 0 or n == 0 or os.fstat(f.fileno()).st_size != _FILE_HEADER.size + 8*m*n:
+        raise MatrixError("Matrix file {0} is truncated or corrupted".format(path))
+      return Matrix._adopt(m, n, _readDoubles(f, path, m*n, _FILE_HEADER.size, mmap, backend))
+
+  @staticmethod
+  def Parse(value, backend=None):
+    """
+      Matrix.Parse(str) -> Matrix with components parsed from repr format "Matrix([[1.0, 2.0], [3.0, 4.0]])",
+      list of rows "[[1, 2], [3, 4]]" or text with rows separated by line breaks or ";" and components
+      separated by commas (CSV), tabs (TSV) or whitespaces
+    """
+    if not isinstance(value, _TEXT_TYPES):
       raise TypeError("Argument should be a string. {0} passed instead".format((type(value))))
+    import re
+    body, bracketed = _unwrapText(value, "Matrix")
+    if bracketed:
+      body = body.strip()
+      if not (body.startswith("[") and body.endswith("]")):
+        raise MatrixError("Can't parse matrix.")
+      return Matrix.ParseStream(re.split(_LIST_ROWS_SEPARATOR, body[1:-1]), backend)
+    return Matrix.ParseStream(re.split(_TEXT_ROWS_SEPARATOR, body), backend)
+
+  @staticmethod
+  def ParseStream(lines, backend=None):
+    """
+      Matrix.ParseStream(file) -> Matrix with rows read line by line from file object (or any iterable of lines).
+      Components are separated by commas (CSV), tabs (TSV) or whitespaces, blank lines are skipped.
+      Lines are parsed one at a time and number of components is validated for each row.
+    """
+    vals = array('d')
+    m = n = 0
+    for line in lines:
+      try:
+        row = _parseRow(line)
+      except ValueError:
+        raise MatrixError("Can't parse row {0}: {1!r}".format(m+1, line))
+      if not row:
+        continue
+      if m == 0:
+        n = len(row)
+      elif len(row) != n:
+        raise MatrixError("Row {0} has {1} components, {2} expected".format(m+1, len(row), n))
+      vals.extend(row)
+      m += 1
+    if m == 0:
+      raise MatrixError("Matrix size should be positive.")
+    return Matrix._adopt(m, n, _flatBuffer(vals, _resolveBackend(backend)))
   
   
   #========
@@ -474,22 +1247,37 @@ class Matrix(object):
     return self.m == self.n
   
   def isDiagonal(self):
+    """Check if matrix is square and all non-diagonal elements are zero. Cached (see setCaching)"""
+    return _cached(self, "isDiagonal", self._isDiagonal)
+  
+  def _isDiagonal(self):
     """Check if matrix is square and all non-diagonal elements are zero"""
     if not self.isSquare():
       return False
+    if isinstance(self._vals, _ndarray):
+      return numpy.count_nonzero(self._vals) == numpy.count_nonzero(self._vals[::self.n+1])
+    n = self.n
     for i in range(0, self.m-1):
       for j in range(i+1, self.m):
-        if self._vals[i][j] != 0 or self._vals[j][i] != 0:
+        if self._vals[i*n+j] != 0 or self._vals[j*n+i] != 0:
           return False
     return True
   
   def isSymmetric(self):
+    """Check if matrix is square and symmetric. Cached (see setCaching)"""
+    return _cached(self, "isSymmetric", self._isSymmetric)
+  
+  def _isSymmetric(self):
     """Check if matrix is square and symmetric"""
     if not self.isSquare():
       return False
+    if isinstance(self._vals, _ndarray):
+      a = self._vals.reshape(self.size)
+      return bool((a == a.T).all())
+    n = self.n
     for i in range(0, self.m-1):
       for j in range(i+1, self.m):
-        if self._vals[i][j] != self._vals[j][i]:
+        if self._vals[i*n+j] != self._vals[j*n+i]:
           return False
     return True
   
@@ -500,25 +1288,43 @@ class Matrix(object):
   
   def asList(self):
     """Get list of rows, where each row is list of components"""
-    return [row[:] for row in self._vals]
+    n = self.n
+    return [self._vals[i:i+n].tolist() for i in range(0, len(self._vals), n)]
   
   def getRow(self, n):
-    """Get Vector with components from specified row"""
-    return Vector(self._vals[n])
+    """Get Vector with components from specified row. Vector shares components with matrix (see copy)"""
+    if not -self.m <= n < self.m:
+      raise IndexError("Row index out of range")
+    rowStride, colStride = _strides(self._vals, self.n)
+    return _viewOf(self, Vector._adopt(_makeView(self._vals, (n % self.m)*rowStride, 1, self.n, 0, colStride)))
   
   def getCol(self, n):
-    """Get Vector with components from specified column"""
-    return self.transpose().getRow(n)
+    """Get Vector with components from specified column. Vector shares components with matrix (see copy)"""
+    if not -self.n <= n < self.n:
+      raise IndexError("Column index out of range")
+    rowStride, colStride = _strides(self._vals, self.n)
+    return _viewOf(self, Vector._adopt(_makeView(self._vals, (n % self.n)*colStride, 1, self.m, 0, rowStride)))
+  
+  def getSubmatrix(self, rowStart, rowStop, colStart, colStop):
+    """
+      Get Matrix with components from rows rowStart..rowStop-1 and columns colStart..colStop-1.
+      Submatrix shares components with matrix (see copy)
+    """
+    if not (0 <= rowStart < rowStop <= self.m and 0 <= colStart < colStop <= self.n):
+      raise IndexError("Submatrix indexes out of range")
+    rowStride, colStride = _strides(self._vals, self.n)
+    m, n = rowStop - rowStart, colStop - colStart
+    return _viewOf(self, Matrix._adopt(m, n, _makeView(self._vals, rowStart*rowStride + colStart*colStride, m, n, rowStride, colStride)))
   
   def getDiagonal(self):
     """Get Vector with components from main diagonal"""
-    return Vector([self._vals[i][i] for i in range(min(self.size))])
+    return Vector._fromFlat(self._vals[:min(self.size)*(self.n+1):self.n+1], self.backend)
   
   def asScalar(self):
     """Convert matrix to float if possible"""
     if not self.isScalar():
       raise MatrixError("Matrix is not a scalar. Size is {0}".format(self.size))
-    return self._vals[0][0]
+    return self._vals[0]
   
   def asVector(self):
     """Convert matrix to Vector if possible"""
@@ -529,6 +1335,39 @@ class Matrix(object):
     else:
       return self.getCol(0)
   
+  def lazy(self):
+    """Get Expression with this matrix as operand (operators on it are evaluated lazily)"""
+    return Expression(self)
+
+  def copy(self):
+    """Get Matrix with own copy of components (i.e. to detach a submatrix from its matrix)"""
+    return Matrix._fromFlat(self.m, self.n, self._vals, self.backend)
+
+  def getCache(self):
+    """Get dict of valid cached derived results (see setCaching)"""
+    return _validCache(self)
+
+  def clearCache(self):
+    """Clear cached results of this matrix and its views, i.e. after modification through shared buffer"""
+    self._memo = {}
+    _modified(self)
+
+  def asMemoryview(self):
+    """
+      Get memoryview of components (format 'd', shape (m, n), row-major) sharing memory with matrix.
+      Without numpy memoryview of submatrix which rows aren't contiguous is a copy (as on Python 2)
+    """
+    return _exportBuffer(self._vals, self.size)
+
+  def save(self, path):
+    """
+      Save matrix to binary file: 24-byte header (b"LAMX", version byte 1, dtype b"d", 2 reserved bytes,
+      rows and columns count as little-endian uint64) followed by row-major little-endian doubles
+    """
+    with open(path, "wb") as f:
+      f.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, b"d", self.m, self.n))
+      _writeDoubles(f, self._vals, self.n)
+  
   
   #===============
   #  Get modified 
@@ -536,23 +1375,32 @@ class Matrix(object):
   
   def transpose(self):
     """Get transposed matrix"""
-    return Matrix(zip(*self._vals))
+    if isinstance(self._vals, _ndarray):
+      return Matrix._adopt(self.n, self.m, self._vals.reshape(self.size).T.flatten())
+    res = array('d')
+    for j in range(self.n):
+      res.extend(self._vals[j::self.n])
+    return Matrix._adopt(self.n, self.m, res)
   
   def round(self, ndigits=0):
     """Get matrix with rounded components (see help(round))"""
-    return Matrix(map(lambda row: map(lambda x: round(x, ndigits), row), self._vals))
+    if self.backend == "python" and _isParallel(len(self._vals)):
+      return Matrix._fromFlat(self.m, self.n, _mapParallel("round", self._vals, ndigits=ndigits), "python")
+    return Matrix._fromFlat(self.m, self.n, [round(x, ndigits) for x in self._vals], self.backend)
   
   def floor(self):
     """Get matrix with floored components (see help(math.floor))"""
-    return Matrix(map(lambda row: map(math.floor, row), self._vals))
+    if self.backend == "python" and _isParallel(len(self._vals)):
+      return Matrix._fromFlat(self.m, self.n, _mapParallel("floor", self._vals), "python")
+    return Matrix._fromFlat(self.m, self.n, [math.floor(x) for x in self._vals], self.backend)
   
   def ceil(self):
     """Get matrix with ceiled components (see help(math.ceil))"""
-    return Matrix(map(lambda row: map(math.ceil, row), self._vals))
+    return Matrix._fromFlat(self.m, self.n, [math.ceil(x) for x in self._vals], self.backend)
   
   def trunc(self):
     """Get vector with truncated components (see help(math.trunc))"""
-    return Matrix(map(lambda row: map(math.trunc, row), self._vals))
+    return Matrix._fromFlat(self.m, self.n, [math.trunc(x) for x in self._vals], self.backend)
   
   
   #=================
@@ -560,47 +1408,160 @@ class Matrix(object):
   #=================
   
   def trace(self):
-    """Get trace of matrix (sum of diagonal elements)"""
-    return sum(self.getDiagonal())
+    """Get trace of matrix (sum of diagonal elements). Cached (see setCaching)"""
+    return _cached(self, "trace", lambda: math.fsum(self.getDiagonal()))
   
   def det(self):
+    """Get determinant of matrix. Cached (see setCaching)"""
+    return _cached(self, "det", self._det)
+  
+  def _det(self):
     """Get determinant of matrix"""
     if not self.isSquare():
       raise NotImplementedError("Determinant can't be calculated for non-square matrix")
     
     if self.isDiagonal():
-      return reduce(lambda x, y: x*y, self.getDiagonal())
+      return _prod(self.getDiagonal())
     
     if self.m == 2:
-      return self._vals[0][0] * self._vals[1][1] - self._vals[0][1] * self._vals[1][0]
-    
-    res = 0.
-    for i, a in enumerate(self._vals[0]):
-      m = Matrix([self._vals[j][:i] + self._vals[j][(i+1):] for j in range(1, self.m)])
-      if i % 2 == 0:
-        res += a * m.det()
-      else:
-        res -= a * m.det()
+      return self._vals[0] * self._vals[3] - self._vals[1] * self._vals[2]
+
+    if self.m == 3:
+      a, b, c, d, e, f, g, h, i = self._vals
+      return a*(e*i - f*h) - b*(d*i - f*g) + c*(d*h - e*g)
+
+    if isinstance(self._vals, _ndarray):
+      return float(numpy.linalg.det(self._vals.reshape(self.size)))
+
+    lu, perm, sign = self._luFactor()
+    res = sign
+    for i in range(self.m):
+      res *= lu[i][i]
+    return res
+
+  def factorize(self):
+    """
+      Get factorization to solve linear systems: CholeskyFactorization for symmetric positive-definite matrix,
+      LUFactorization otherwise. Cached (see setCaching), so repeated solve and inverse reuse it
+    """
+    return _cached(self, "factorize", self._factorize)
+  
+  def _factorize(self):
+    """Get CholeskyFactorization or LUFactorization of matrix"""
+    if self.isSymmetric():
+      try:
+        return CholeskyFactorization(self)
+      except MatrixError:
+        pass
+    return LUFactorization(self)
+  
+  def cholesky(self):
+    """Get CholeskyFactorization of symmetric positive-definite matrix. Cached (see setCaching)"""
+    return _cached(self, "cholesky", lambda: CholeskyFactorization(self))
+  
+  def ldlt(self):
+    """Get LDLFactorization of symmetric matrix. Cached (see setCaching)"""
+    return _cached(self, "ldlt", lambda: LDLFactorization(self))
+  
+  def _lowerTriangle(self):
+    """Get array('d') with rows of lower triangle of square matrix one after another (n*(n+1)/2 floats)"""
+    n = self._columnsCount
+    vals = self._vals
+    res = array('d')
+    for i in range(n):
+      res.extend(vals[i*n:i*n+i+1])
     return res
   
-  def eigenvalues(self):
-    """Get sorted list of eigenvalues of matrix"""
+  def solve(self, b):
+    """Get solution x of linear system matrix*x == b, where b is a Vector or a Matrix"""
+    return self.factorize().solve(b)
+  
+  def inverse(self):
+    """Get inverse matrix"""
+    return self.factorize().inverse()
+  
+  def lu(self):
+    """Get LU decomposition with partial pivoting: tuple (P, L, U), where P*matrix == L*U"""
+    if not self.isSquare():
+      raise NotImplementedError("LU decomposition can't be calculated for non-square matrix")
+    lu, perm, sign = self._luFactor()
+    n = self.m
+    P = Matrix._fromFlat(n, n, [(1. if j == perm[i] else 0.) for i in range(n) for j in range(n)], self.backend)
+    L = Matrix._fromFlat(n, n, [x for i in range(n) for x in lu[i][:i] + [1.] + [0.]*(n-i-1)], self.backend)
+    U = Matrix._fromFlat(n, n, [x for i in range(n) for x in [0.]*i + lu[i][i:]], self.backend)
+    return P, L, U
+
+  def _luFactor(self):
+    """
+      Get LU factorization with partial pivoting (Doolittle, O(n^3)).
+      Returns tuple (lu, perm, sign): lu is a list of rows holding L below
+      the diagonal (unit diagonal is implied) and U on and above it, perm is
+      the row permutation and sign is the permutation parity (1. or -1.).
+      Singular columns are skipped, so U gets zero on the diagonal.
+    """
+    n = self.m
+    lu = self.asList()
+    perm = list(range(n))
+    sign = 1.
+    for k in range(n):
+      p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+      if lu[p][k] == 0:
+        continue
+      if p != k:
+        lu[k], lu[p] = lu[p], lu[k]
+        perm[k], perm[p] = perm[p], perm[k]
+        sign = -sign
+      pivotRow = lu[k]
+      pivot = pivotRow[k]
+      for i in range(k+1, n):
+        row = lu[i]
+        factor = row[k] / pivot
+        row[k] = factor
+        if factor != 0:
+          for j in range(k+1, n):
+            row[j] -= factor * pivotRow[j]
+    return lu, perm, sign
+  
+  def eigenvalues(self, tolerance=_EPSILON, maxIterations=30):
+    """
+      Get list of eigenvalues of matrix sorted in descending order.
+      Complex eigenvalues are returned as complex numbers (conjugate pairs),
+      such list is sorted by real part, then by imaginary part.
+      tolerance: relative size of off-diagonal element treated as zero by iterative solver
+      maxIterations: max number of iterations per eigenvalue, MatrixError is raised if exceeded
+      Cached (see setCaching)
+    """
+    return list(_cached(self, "eigenvalues", self._eigenvalues, tolerance, maxIterations))
+  
+  def _eigenvalues(self, tolerance, maxIterations):
+    """Get list of eigenvalues of matrix sorted in descending order"""
     if not self.isSquare():
       raise NotImplementedError("Eigen values can't be calculated for non-square matrix")
     
     if self.isDiagonal():
       return sorted(list(self.getDiagonal()), reverse=True)
     
+    if isinstance(self._vals, _ndarray):
+      if self.isSymmetric():
+        return sorted(numpy.linalg.eigvalsh(self._vals.reshape(self.size)).tolist(), reverse=True)
+      vals = numpy.linalg.eigvals(self._vals.reshape(self.size))
+      if not vals.imag.any():
+        return sorted(vals.real.tolist(), reverse=True)
+      return _sortEigenvalues(vals.tolist())
+    
     if self.m == 2:
-      a, b = self._vals[0]
-      c, d = self._vals[1]
-      sss = math.sqrt((a-d)**2 + 4.*b*c)
+      a, b, c, d = self._vals
+      disc = (a-d)**2 + 4.*b*c
+      if disc < 0:
+        sss = math.sqrt(-disc)
+        return [complex(0.5*(a+d), 0.5*sss), complex(0.5*(a+d), -0.5*sss)]
+      sss = math.sqrt(disc)
       return sorted([0.5*(a+d+sss), 0.5*(a+d-sss)], reverse=True)
     
     if self.m == 3 and self.isSymmetric():
-      p1 = self._vals[0][1]**2 + self._vals[0][2]**2 + self._vals[1][2]**2
+      p1 = self._vals[1]**2 + self._vals[2]**2 + self._vals[5]**2
       q = self.trace()/3
-      p2 = 2.*p1 + (self._vals[0][0]-q)**2 + (self._vals[1][1]-q)**2 + (self._vals[2][2]-q)**2
+      p2 = 2.*p1 + (self._vals[0]-q)**2 + (self._vals[4]-q)**2 + (self._vals[8]-q)**2
       p = math.sqrt(p2/6)
       B = (self - q * Matrix.Identity(3)) / p
       r = B.det() / 2
@@ -620,7 +1581,9 @@ class Matrix(object):
       eig2 = 3 * q - eig1 - eig3
       return [eig1, eig2, eig3]
     
-    raise NotImplementedError("eigenvalues() implemented for: diagonal matrix, square matrix size of 2, symmetric matrix size of 3")
+    if self.isSymmetric():
+      return sorted(_eigenvaluesSymmetric(self.asList(), tolerance, maxIterations), reverse=True)
+    return _sortEigenvalues(_eigenvaluesGeneral(self.asList(), tolerance, maxIterations))
   
   
   #=================
@@ -629,11 +1592,11 @@ class Matrix(object):
   
   def __str__(self):
     """Get string to print metrix by str()"""
-    return repr(self._vals)
+    return repr(self.asList())
   
   def __repr__(self):
     """Get string to represent matrix by repr()"""
-    return "Matrix(" + repr(self._vals) + ")"
+    return "Matrix(" + repr(self.asList()) + ")"
   
   
   #===============
@@ -646,7 +1609,7 @@ class Matrix(object):
       raise TypeError("Can't get item by slice")
     elif isinstance(key, (tuple,list)):
       if len(key) == 2:
-        return self._vals[key[0]][key[1]]
+        return self._vals[self._index(key[0], key[1])]
       else:
         raise ValueError("Tuple length should be 2. {0} passed instead".format(len(key)))
     else:
@@ -658,12 +1621,19 @@ class Matrix(object):
       raise TypeError("Can't modify by slice")
     elif isinstance(key, (tuple,list)):
       if len(key) == 2:
-        self._vals[key[0]][key[1]] = float(value)
+        self._vals[self._index(key[0], key[1])] = float(value)
+        _modified(self)
       else:
         raise ValueError("Tuple length should be 2. {0} passed instead".format(len(key)))
     else:
       raise TypeError("Index should be a tuple")
   
+  def _index(self, i, j):
+    """Get index of component (i, j) in flat storage. Negative indexes are counted from the end"""
+    if not (-self._rowsCount <= i < self._rowsCount and -self._columnsCount <= j < self._columnsCount):
+      raise IndexError("Matrix index out of range")
+    return (i % self._rowsCount) * self._columnsCount + (j % self._columnsCount)
+  
   
   #============
   #  Operators 
@@ -676,7 +1646,7 @@ class Matrix(object):
     if not isinstance(other, Matrix):
       if isinstance(other, (int, float)):
         if other == 0:
-          return all(x==0 for x in sum(zip(*self._vals),()))
+          return all(x==0 for x in self._vals)
         elif other == 1:
           if self.m != self.n:
             return False
@@ -690,6 +1660,10 @@ class Matrix(object):
                   return False
           return True
       raise ValueError("Can't compare matrix and '{0.__name__}'".format(type(other)))
+    if self.size != other.size:
+      return False
+    if isinstance(self._vals, _ndarray) or isinstance(other._vals, _ndarray):
+      return numpy.array_equal(self._vals, other._vals)
     return other._vals == self._vals
   
   def __ne__(self, other):
@@ -698,11 +1672,13 @@ class Matrix(object):
   
   def __pos__(self):
     """Get positive Matrix"""
-    return Matrix(self._vals)
+    return Matrix._fromFlat(self.m, self.n, self._vals, self.backend)
   
   def __neg__(self):
     """Get negative Matrix"""
-    return Matrix([[-x for x in row] for row in self._vals])
+    if isinstance(self._vals, _ndarray):
+      return Matrix._adopt(self.m, self.n, -self._vals)
+    return Matrix._fromFlat(self.m, self.n, [-x for x in self._vals], "python")
   
   def __add__(self, other):
     """Add matrix to matrix"""
@@ -710,12 +1686,16 @@ class Matrix(object):
       return NotImplemented
     if self.size != other.size:
       raise MatrixError("Trying to add matrixes of different size")
-    return Matrix([[sum(pair) for pair in zip(self._vals[x], other._vals[x])] for x in xrange(self.m)])
+    if isinstance(self._vals, _ndarray):
+      return Matrix._adopt(self.m, self.n, numpy.add(self._vals, other._vals))
+    if _isParallel(len(self._vals)):
+      return Matrix._fromFlat(self.m, self.n, _mapParallel("add", self._vals, other._vals), "python")
+    return Matrix._fromFlat(self.m, self.n, map(add, self._vals, other._vals), "python")
 
   def __radd__(self, other):
     """Add matrix to matrix or 0 to matrix"""
     if isinstance(other, numbers.Integral) and other == 0:
-      return Matrix(self._vals)
+      return +self
     elif isinstance(other, Matrix):
       return self + other
     else:
@@ -727,25 +1707,36 @@ class Matrix(object):
       return NotImplemented
     if self.size != other.size:
       raise MatrixError("Trying to substract matrixes of different size")
-    return self+(-other)
+    if isinstance(self._vals, _ndarray):
+      return Matrix._adopt(self.m, self.n, numpy.subtract(self._vals, other._vals))
+    if _isParallel(len(self._vals)):
+      return Matrix._fromFlat(self.m, self.n, _mapParallel("sub", self._vals, other._vals), "python")
+    return Matrix._fromFlat(self.m, self.n, map(sub, self._vals, other._vals), "python")
   
   def __mul__(self, other):
     """Multiply matrix to scalar or matrix to matrix or matrix to vector"""
     if isinstance(other, Matrix):
       if self.n != other.m:
         raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
-      res = Matrix(self.m, other.n)
-      for x in range(res.m):
-        for y in range(res.n):
-          res[x,y] = sum([self[x,z]*other[z,y] for z in range(self.n)])
-      return res
+      if isinstance(self._vals, _ndarray):
+        res = numpy.dot(self._vals.reshape(self.size), numpy.asarray(other._vals, dtype=float).reshape(other.size))
+        return Matrix._adopt(self.m, other.n, res.ravel())
+      if _isParallel(self.m*self.n*other.n) and self.m > 1:
+        res = _mulParallel(self._vals, other._vals, self.m, self.n, other.n)
+      elif _mulAlgorithm == "strassen" and min(self.m, self.n, other.n) > _strassenCrossover:
+        res = _mulStrassen(self._vals, other._vals, self.m, self.n, other.n, _strassenCrossover)
+      else:
+        res = _mulFlat(self._vals, other._vals, self.m, self.n, other.n)
+      return Matrix._fromFlat(self.m, other.n, res, "python")
     if isinstance(other, Vector):
       if self.n != other.size:
         raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
-      return self*Matrix.ColFromVector(other)
+      return self*Matrix._fromFlat(other.size, 1, other._vals, self.backend)
     try:
       factor = float(other)
-      return Matrix([[x*factor for x in row] for row in self._vals])
+      if isinstance(self._vals, _ndarray):
+        return Matrix._adopt(self.m, self.n, self._vals*factor)
+      return Matrix._fromFlat(self.m, self.n, [x*factor for x in self._vals], "python")
     except:
       return NotImplemented
   
@@ -754,17 +1745,3556 @@ class Matrix(object):
     if isinstance(other, Vector):
       if self.m != other.size:
         raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
-      return Matrix.RowFromVector(other)*self
+      return Matrix._fromFlat(1, other.size, other._vals, self.backend)*self
     try:
       return self*float(other)
     except:
       return NotImplemented
   
-  def __div__(self, other):
+  def __truediv__(self, other):
     """Divide matrix to scalar"""
     try:
       return self*(1.0/float(other))
     except ZeroDivisionError:
       raise
     except:
-      return NotImplemented
\ No newline at end of file
+      return NotImplemented
+  
+  __div__ = __truediv__
+  
+  def __iadd__(self, other):
+    """Add matrix to this matrix in place"""
+    if not isinstance(other, Matrix):
+      return NotImplemented
+    if self.size != other.size:
+      raise MatrixError("Trying to add matrixes of different size")
+    if isinstance(self._vals, _ndarray):
+      self._vals += numpy.asarray(other._vals)
+    else:
+      _addInPlace(self._vals, other._vals, 1.)
+    _modified(self)
+    return self
+  
+  def __isub__(self, other):
+    """Subtract matrix from this matrix in place"""
+    if not isinstance(other, Matrix):
+      return NotImplemented
+    if self.size != other.size:
+      raise MatrixError("Trying to substract matrixes of different size")
+    if isinstance(self._vals, _ndarray):
+      self._vals -= numpy.asarray(other._vals)
+    else:
+      _addInPlace(self._vals, other._vals, -1.)
+    _modified(self)
+    return self
+  
+  def __imul__(self, other):
+    """
+      Multiply this matrix to scalar in place.
+      matrix *= Matrix writes the product to components of this matrix (and to matrices sharing them).
+      Its size may change only if components aren't shared with views (MatrixError otherwise),
+      matrix *= Vector is not supported in place.
+    """
+    if isinstance(other, Matrix):
+      res = self*other
+      if res.size == self.size:
+        self._vals[:] = res._vals
+      elif len(_versionCell(self)) > 1:
+        raise MatrixError("In-place product can't change size of matrix sharing components with views")
+      else:
+        self._rowsCount, self._columnsCount, self._vals = res._rowsCount, res._columnsCount, res._vals
+      _modified(self)
+      return self
+    if isinstance(other, Vector):
+      return NotImplemented
+    try:
+      factor = float(other)
+    except:
+      return NotImplemented
+    if isinstance(self._vals, _ndarray):
+      self._vals *= factor
+    else:
+      _scaleInPlace(self._vals, factor)
+    _modified(self)
+    return self
+  
+  def __itruediv__(self, other):
+    """Divide this matrix to scalar in place"""
+    try:
+      factor = 1.0/float(other)
+    except ZeroDivisionError:
+      raise
+    except:
+      return NotImplemented
+    return self.__imul__(factor)
+  
+  __idiv__ = __itruediv__
+
+class _StructuredMatrix(Matrix):
+  """
+    Base class of square matrices which store only components allowed by their structure.
+    Components of row i in columns lo..hi-1 are stored in flat array('d') _data starting at index start,
+    where (lo, hi, start) is given by _span(i). Structure parameters are __slots__ of the subclass.
+    Dense components (_vals) are built on demand, so operations which don't benefit from the structure
+    fall back to Matrix implementation. Rows, columns and submatrices are copies, not views.
+  """
+  
+  __slots__ = ("_data",)
+  
+  # _solveList(b) -> solution list of linear system for list b, defined by subclasses solving it directly
+  _solveList = None
+  
+  @property
+  def _vals(self):
+    """array('d'): dense row-major components built from packed storage"""
+    n = self._rowsCount
+    res = array('d', [0.])*(n*n)
+    for i in range(n):
+      lo, hi, start = self._span(i)
+      res[i*n+lo:i*n+hi] = self._data[start:start+hi-lo]
+    return res
+  
+  @property
+  def backend(self):
+    """str: read-only storage backend (packed components are always "python")"""
+    return "python"
+  
+  @staticmethod
+  def _squareArgument(arg):
+    """Get tuple (n, dense flat components or None for zero matrix) for int, square Matrix, iterable of rows or str"""
+    if isinstance(arg, numbers.Integral):
+      if arg > 0:
+        return arg, None
+      raise ValueError("Argument should be an int > 0 or a square matrix. {0} passed instead".format(arg))
+    a = arg if isinstance(arg, Matrix) else Matrix(arg, backend="python")
+    if not a.isSquare():
+      raise MatrixError("Matrix should be square. Size is {0}".format(a.size))
+    return a.m, a._vals
+  
+  def _pack(self, n, vals):
+    """Set size and packed components from dense flat components (zero matrix if vals is None)"""
+    self._rowsCount = self._columnsCount = n
+    self._data = array('d', [0.])*self._packedSize(n)
+    if vals is not None:
+      self._fill(vals, True)
+  
+  def _fill(self, vals, check):
+    """Set packed components from dense flat components, MatrixError if check and components outside of structure aren't zero"""
+    n = self._rowsCount
+    for i in range(n):
+      lo, hi, start = self._span(i)
+      row = vals[i*n:(i+1)*n]
+      if check and (any(row[:lo]) or any(row[hi:])):
+        raise MatrixError("Can't create {0}. Components outside of its structure should be zero".format(type(self).__name__))
+      self._data[start:start+hi-lo] = array('d', row[lo:hi])
+  
+  def _like(self, data):
+    """Get matrix of same type, size and structure with packed components data (not copied)"""
+    cls = type(self)
+    res = cls.__new__(cls)
+    for name in cls.__slots__:
+      setattr(res, name, getattr(self, name))
+    res._rowsCount = res._columnsCount = self._rowsCount
+    res._data = data
+    return res
+  
+  def _packed(self, vals):
+    """Get matrix of same type, size and structure with components from dense flat components inside of structure"""
+    res = self._like(array('d', [0.])*len(self._data))
+    res._fill(vals, False)
+    return res
+  
+  def _sameStructure(self, other):
+    """Check if other is matrix of same type, size and structure"""
+    return (type(other) is type(self) and other._rowsCount == self._rowsCount and
+            all(getattr(other, name) == getattr(self, name) for name in type(self).__slots__))
+  
+  def _get(self, i, j):
+    """Get component (i, j), indexes are valid and non-negative"""
+    lo, hi, start = self._span(i)
+    return self._data[start+j-lo] if lo <= j < hi else 0.
+  
+  def _set(self, i, j, value):
+    """Set component (i, j), indexes are valid and non-negative"""
+    lo, hi, start = self._span(i)
+    if lo <= j < hi:
+      self._data[start+j-lo] = value
+    elif value != 0:
+      raise MatrixError("Component ({0}, {1}) is outside of structure of {2}".format(i, j, type(self).__name__))
+  
+  def _lowerTriangle(self):
+    """Get array('d') with rows of lower triangle one after another, built from stored components"""
+    n = self._rowsCount
+    res = array('d', [0.])*(n*(n+1)//2)
+    for i in range(n):
+      lo, hi, start = self._span(i)
+      hi = min(hi, i+1)
+      if lo < hi:
+        res[i*(i+1)//2+lo:i*(i+1)//2+hi] = self._data[start:start+hi-lo]
+    return res
+  
+  def _isSymmetric(self):
+    """Check if matrix is symmetric comparing stored components with their mirrors"""
+    for i in range(self._rowsCount):
+      lo, hi, start = self._span(i)
+      for j in range(lo, hi):
+        if j != i and self._data[start+j-lo] != self._get(j, i):
+          return False
+    return True
+  
+  def _mulList(self, x):
+    """Get list of components of product matrix*x for list x"""
+    data = self._data
+    res = []
+    for i in range(self._rowsCount):
+      lo, hi, start = self._span(i)
+      res.append(sum(map(mul, data[start:start+hi-lo], x[lo:hi])))
+    return res
+  
+  def _rmulList(self, x):
+    """Get list of components of product x*matrix for list x"""
+    data = self._data
+    res = [0.]*self._rowsCount
+    for i, xi in enumerate(x):
+      if xi != 0:
+        lo, hi, start = self._span(i)
+        res[lo:hi] = map(add, res[lo:hi], [xi*v for v in data[start:start+hi-lo]])
+    return res
+  
+  def _product(self, other, res):
+    """Get product of matrix and matrix other from dense product res (structured if the structure is preserved)"""
+    return res
+  
+  def _sparse(self):
+    """Get SparseMatrix with nonzero components, built from stored ones only"""
+    triplets = []
+    for i in range(self._rowsCount):
+      lo, hi, start = self._span(i)
+      triplets.extend((i, j, self._data[start+j-lo]) for j in range(lo, hi))
+    return SparseMatrix(self._rowsCount, self._columnsCount, triplets)
+  
+  def _transposeTo(self, res):
+    """Fill zero matrix res of transposed structure with transposed components and return it"""
+    for i in range(self._rowsCount):
+      lo, hi, start = res._span(i)
+      res._data[start:start+hi-lo] = array('d', [self._get(j, i) for j in range(lo, hi)])
+    return res
+  
+  
+  #========
+  #  Tests 
+  #========
+  
+  def _isDiagonal(self):
+    """Check if all non-diagonal elements are zero"""
+    data = self._data
+    for i in range(self._rowsCount):
+      lo, hi, start = self._span(i)
+      if any(data[start:start+i-lo]) or any(data[start+i-lo+1:start+hi-lo]):
+        return False
+    return True
+  
+  
+  #============
+  #  Get parts 
+  #============
+  
+  def asList(self):
+    """Get list of rows, where each row is list of components"""
+    n = self._columnsCount
+    vals = self._vals
+    return [vals[i:i+n].tolist() for i in range(0, len(vals), n)]
+  
+  def getRow(self, n):
+    """Get Vector with copy of components from specified row"""
+    if not -self.m <= n < self.m:
+      raise IndexError("Row index out of range")
+    return Vector._fromFlat([self._get(n % self.m, j) for j in range(self.n)], "python")
+  
+  def getCol(self, n):
+    """Get Vector with copy of components from specified column"""
+    if not -self.n <= n < self.n:
+      raise IndexError("Column index out of range")
+    return Vector._fromFlat([self._get(i, n % self.n) for i in range(self.m)], "python")
+  
+  def getDiagonal(self):
+    """Get Vector with components from main diagonal"""
+    return Vector._fromFlat([self._get(i, i) for i in range(self._rowsCount)], "python")
+  
+  def copy(self):
+    """Get matrix of same structure with own copy of components"""
+    return self._like(self._data[:])
+  
+  
+  #=================
+  #  Linear algebra 
+  #=================
+  
+  def solve(self, b):
+    """Get solution x of linear system matrix*x == b, where b is a Vector or a Matrix"""
+    if self._solveList is None:
+      return Matrix.solve(self, b)
+    if not isinstance(b, (Vector, Matrix)):
+      raise TypeError("Argument should be a Vector or a Matrix. {0} passed instead".format(type(b)))
+    n = self._rowsCount
+    if (len(b) if isinstance(b, Vector) else b.m) != n:
+      raise MatrixError("Linear system can't be solved. Sizes are inconsistent")
+    if not all(self.getDiagonal()):
+      raise MatrixError("Linear system can't be solved. Matrix is singular")
+    if isinstance(b, Vector):
+      return Vector._fromFlat(self._solveList(list(b._vals)), b.backend)
+    k = b.n
+    vals = b._vals
+    cols = [self._solveList(list(vals[j::k])) for j in range(k)]
+    return Matrix._fromFlat(n, k, [x for row in zip(*cols) for x in row], b.backend)
+  
+  def inverse(self):
+    """Get inverse matrix"""
+    if self._solveList is None:
+      return Matrix.inverse(self)
+    return self._packed(self.solve(Matrix.Identity(self._rowsCount))._vals)
+  
+  
+  #===============
+  #  Items access 
+  #===============
+  
+  def __getitem__(self, key):
+    """Get component by index (tuple)"""
+    if isinstance(key, (tuple,list)) and len(key) == 2:
+      i, j = divmod(self._index(key[0], key[1]), self._columnsCount)
+      return self._get(i, j)
+    return Matrix.__getitem__(self, key)
+  
+  def __setitem__(self, key, value):
+    """Modify component by index (tuple), MatrixError for nonzero component outside of structure"""
+    if isinstance(key, (tuple,list)) and len(key) == 2:
+      i, j = divmod(self._index(key[0], key[1]), self._columnsCount)
+      self._set(i, j, float(value))
+      _modified(self)
+    else:
+      Matrix.__setitem__(self, key, value)
+  
+  
+  #============
+  #  Operators 
+  #============
+  
+  def __pos__(self):
+    """Get positive matrix"""
+    return self.copy()
+  
+  def __neg__(self):
+    """Get negative matrix"""
+    return self._like(array('d', [-x for x in self._data]))
+  
+  def __add__(self, other):
+    """Add matrix to matrix"""
+    if self._sameStructure(other):
+      return self._like(array('d', map(add, self._data, other._data)))
+    return Matrix.__add__(self, other)
+  
+  def __sub__(self, other):
+    """Subtract matrix from matrix"""
+    if self._sameStructure(other):
+      return self._like(array('d', map(sub, self._data, other._data)))
+    return Matrix.__sub__(self, other)
+  
+  def __mul__(self, other):
+    """Multiply matrix to scalar or matrix to matrix or matrix to vector"""
+    if isinstance(other, Vector):
+      if self.n != other.size:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      return Matrix._fromFlat(self.m, 1, self._mulList(list(other._vals)), "python")
+    if isinstance(other, Matrix):
+      if self.n != other.m:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      k = other.n
+      vals = other._vals
+      res = [0.]*(self.m*k)
+      for j in range(k):
+        res[j::k] = self._mulList(list(vals[j::k]))
+      return self._product(other, Matrix._fromFlat(self.m, k, res, "python"))
+    try:
+      factor = float(other)
+    except:
+      return NotImplemented
+    return self._like(array('d', [x*factor for x in self._data]))
+  
+  def __rmul__(self, other):
+    """Multiply scalar to matrix or vector to matrix or matrix to matrix"""
+    if isinstance(other, Vector):
+      if self.m != other.size:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      return Matrix._fromFlat(1, self.n, self._rmulList(list(other._vals)), "python")
+    if isinstance(other, Matrix):
+      if other.n != self.m:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      k = self.m
+      vals = other._vals
+      res = []
+      for i in range(other.m):
+        res.extend(self._rmulList(list(vals[i*k:(i+1)*k])))
+      return Matrix._fromFlat(other.m, self.n, res, "python")
+    try:
+      return self*float(other)
+    except:
+      return NotImplemented
+  
+  def __iadd__(self, other):
+    """Add matrix of same structure to this matrix in place (other matrices give new Matrix)"""
+    if not self._sameStructure(other):
+      return NotImplemented
+    _addInPlace(self._data, other._data, 1.)
+    _modified(self)
+    return self
+  
+  def __isub__(self, other):
+    """Subtract matrix of same structure from this matrix in place (other matrices give new Matrix)"""
+    if not self._sameStructure(other):
+      return NotImplemented
+    _addInPlace(self._data, other._data, -1.)
+    _modified(self)
+    return self
+  
+  def __imul__(self, other):
+    """Multiply this matrix to scalar in place (matrix *= Matrix gives new matrix)"""
+    if isinstance(other, (Matrix, Vector)):
+      return NotImplemented
+    try:
+      factor = float(other)
+    except:
+      return NotImplemented
+    _scaleInPlace(self._data, factor)
+    _modified(self)
+    return self
+
+class DiagonalMatrix(_StructuredMatrix):
+  """
+    class DiagonalMatrix(Matrix):
+
+    Square diagonal matrix storing only n diagonal components. Setting nonzero
+    component outside of diagonal raises MatrixError.
+
+    Constructors:
+      DiagonalMatrix(int) -> zero DiagonalMatrix with specified size
+      DiagonalMatrix(iterable) -> DiagonalMatrix with diagonal components from any iterable object, i.e. list or Vector
+      DiagonalMatrix(Matrix) -> DiagonalMatrix with components of diagonal square Matrix
+
+      DiagonalMatrix.Identity(int) -> identity DiagonalMatrix with specified size
+  """
+  
+  __slots__ = ()
+  
+  def __init__(self, x):
+    """
+      DiagonalMatrix constructor
+
+      DiagonalMatrix(int) -> zero DiagonalMatrix with specified size
+      DiagonalMatrix(iterable) -> DiagonalMatrix with diagonal components from any iterable object, i.e. list or Vector
+      DiagonalMatrix(Matrix) -> DiagonalMatrix with components of diagonal square Matrix
+    """
+    if isinstance(x, (numbers.Integral, Matrix)):
+      self._pack(*self._squareArgument(x))
+      return
+    try:
+      data = array('d', [float(v) for v in x])
+    except:
+      raise MatrixError("Can't create matrix.")
+    if not data:
+      raise MatrixError("Matrix size should be positive.")
+    self._rowsCount = self._columnsCount = len(data)
+    self._data = data
+  
+  @staticmethod
+  def Identity(n):
+    """DiagonalMatrix.Identity(int) -> identity DiagonalMatrix with specified size"""
+    if not isinstance(n, numbers.Integral):
+      raise TypeError("Argument should be an int > 0. {0} passed instead".format(n))
+    res = DiagonalMatrix(n)
+    res._data = array('d', [1.])*n
+    return res
+  
+  def _span(self, i):
+    """Get tuple (lo, hi, start) of stored components of row i"""
+    return i, i+1, i
+  
+  def _packedSize(self, n):
+    """Get number of stored components of matrix n x n"""
+    return n
+  
+  def _mulList(self, x):
+    """Get list of components of product matrix*x for list x"""
+    return list(map(mul, self._data, x))
+  
+  _rmulList = _mulList
+  
+  def _solveList(self, b):
+    """Get solution of linear system for list b"""
+    return list(map(truediv, b, self._data))
+  
+  def _isDiagonal(self):
+    """Check if all non-diagonal elements are zero"""
+    return True
+  
+  def _isSymmetric(self):
+    """Check if matrix is symmetric"""
+    return True
+  
+  def getDiagonal(self):
+    """Get Vector with components from main diagonal"""
+    return Vector._fromFlat(self._data, "python")
+  
+  def transpose(self):
+    """Get transposed matrix"""
+    return self.copy()
+  
+  def _det(self):
+    """Get determinant of matrix"""
+    return _prod(self._data)
+  
+  def _eigenvalues(self, tolerance, maxIterations):
+    """Get list of eigenvalues of matrix sorted in descending order"""
+    return sorted(self._data, reverse=True)
+  
+  def inverse(self):
+    """Get inverse matrix"""
+    if not all(self._data):
+      raise MatrixError("Matrix is singular")
+    return self._like(array('d', [1./x for x in self._data]))
+  
+  def __repr__(self):
+    """Get string to represent matrix by repr()"""
+    return "DiagonalMatrix(" + repr(self._data.tolist()) + ")"
+  
+  def __mul__(self, other):
+    """Multiply matrix to scalar or matrix to matrix or matrix to vector"""
+    if isinstance(other, DiagonalMatrix) and other._rowsCount == self._rowsCount:
+      return self._like(array('d', map(mul, self._data, other._data)))
+    return _StructuredMatrix.__mul__(self, other)
+
+class TriangularMatrix(_StructuredMatrix):
+  """
+    class TriangularMatrix(Matrix):
+
+    Square lower or upper triangular matrix storing only n*(n+1)/2 components of its triangle
+    row by row. Setting nonzero component outside of triangle raises MatrixError.
+
+    Constructors:
+      TriangularMatrix(int, lower=True) -> zero TriangularMatrix with specified size
+      TriangularMatrix(iterable, lower=True) -> TriangularMatrix with rows from any iterable object, i.e. list
+      TriangularMatrix(Matrix, lower=True) -> TriangularMatrix with components of triangular square Matrix
+  """
+  
+  __slots__ = ("_lower",)
+  
+  def __init__(self, x, lower=True):
+    """
+      TriangularMatrix constructor
+
+      TriangularMatrix(int, lower=True) -> zero TriangularMatrix with specified size
+      TriangularMatrix(iterable, lower=True) -> TriangularMatrix with rows from any iterable object, i.e. list
+      TriangularMatrix(Matrix, lower=True) -> TriangularMatrix with components of triangular square Matrix
+      lower: True for lower triangular matrix, False for upper one
+    """
+    self._lower = bool(lower)
+    self._pack(*self._squareArgument(x))
+  
+  @property
+  def lower(self):
+    """bool: read-only True for lower triangular matrix, False for upper one"""
+    return self._lower
+  
+  def _span(self, i):
+    """Get tuple (lo, hi, start) of stored components of row i"""
+    if self._lower:
+      return 0, i+1, i*(i+1)//2
+    return i, self._rowsCount, i*self._rowsCount - i*(i-1)//2
+  
+  def _packedSize(self, n):
+    """Get number of stored components of matrix n x n"""
+    return n*(n+1)//2
+  
+  def _solveList(self, b):
+    """Get solution of linear system for list b by forward or backward substitution"""
+    data = self._data
+    n = self._rowsCount
+    res = [0.]*n
+    rows = range(n) if self._lower else range(n-1, -1, -1)
+    for i in rows:
+      lo, hi, start = self._span(i)
+      if self._lower:
+        res[i] = (b[i] - sum(map(mul, data[start:start+i], res[:i]))) / data[start+i]
+      else:
+        res[i] = (b[i] - sum(map(mul, data[start+1:start+hi-lo], res[i+1:]))) / data[start]
+    return res
+  
+  def _product(self, other, res):
+    """Get product of matrix and matrix other from dense product res (triangular for triangular other)"""
+    if self._sameStructure(other):
+      return self._packed(res._vals)
+    return res
+  
+  def transpose(self):
+    """Get transposed matrix (upper for lower one and vice versa)"""
+    return self._transposeTo(TriangularMatrix(self._rowsCount, not self._lower))
+  
+  def _det(self):
+    """Get determinant of matrix"""
+    return _prod(self.getDiagonal())
+  
+  def _eigenvalues(self, tolerance, maxIterations):
+    """Get list of eigenvalues of matrix sorted in descending order"""
+    return sorted(self.getDiagonal(), reverse=True)
+  
+  def __repr__(self):
+    """Get string to represent matrix by repr()"""
+    return "TriangularMatrix({0!r}, lower={1})".format(self.asList(), self._lower)
+
+class SymmetricMatrix(_StructuredMatrix):
+  """
+    class SymmetricMatrix(Matrix):
+
+    Square symmetric matrix storing only n*(n+1)/2 components of its lower triangle
+    row by row. Setting component (i, j) sets component (j, i) too.
+
+    Constructors:
+      SymmetricMatrix(int) -> zero SymmetricMatrix with specified size
+      SymmetricMatrix(iterable) -> SymmetricMatrix with rows from any iterable object, i.e. list
+      SymmetricMatrix(Matrix) -> SymmetricMatrix with components of symmetric Matrix
+  """
+  
+  __slots__ = ()
+  
+  def __init__(self, x):
+    """
+      SymmetricMatrix constructor
+
+      SymmetricMatrix(int) -> zero SymmetricMatrix with specified size
+      SymmetricMatrix(iterable) -> SymmetricMatrix with rows from any iterable object, i.e. list
+      SymmetricMatrix(Matrix) -> SymmetricMatrix with components of symmetric Matrix
+    """
+    self._pack(*self._squareArgument(x))
+  
+  @property
+  def _vals(self):
+    """array('d'): dense row-major components built from packed lower triangle"""
+    n = self._rowsCount
+    res = array('d', [0.])*(n*n)
+    for i in range(n):
+      row = self._data[i*(i+1)//2:(i+1)*(i+2)//2]
+      res[i*n:i*n+i+1] = row
+      res[i:i*n+i+1:n] = row
+    return res
+  
+  def _span(self, i):
+    """Get tuple (lo, hi, start) of stored components of row i (lower triangle)"""
+    return 0, i+1, i*(i+1)//2
+  
+  def _packedSize(self, n):
+    """Get number of stored components of matrix n x n"""
+    return n*(n+1)//2
+  
+  def _fill(self, vals, check):
+    """Set packed components from dense flat components, MatrixError if check and they aren't symmetric"""
+    if check and not Matrix._adopt(self._rowsCount, self._columnsCount, vals)._isSymmetric():
+      raise MatrixError("Can't create SymmetricMatrix. Matrix isn't symmetric")
+    _StructuredMatrix._fill(self, vals, False)
+  
+  def _get(self, i, j):
+    """Get component (i, j), indexes are valid and non-negative"""
+    if j > i:
+      i, j = j, i
+    return self._data[i*(i+1)//2 + j]
+  
+  def _set(self, i, j, value):
+    """Set components (i, j) and (j, i), indexes are valid and non-negative"""
+    if j > i:
+      i, j = j, i
+    self._data[i*(i+1)//2 + j] = value
+  
+  def _lowerTriangle(self):
+    """Get packed lower triangle (stored components, not copied)"""
+    return self._data
+  
+  def _mulList(self, x):
+    """Get list of components of product matrix*x for list x"""
+    data = self._data
+    res = [0.]*self._rowsCount
+    for i in range(self._rowsCount):
+      start = i*(i+1)//2
+      row = data[start:start+i]
+      res[i] += sum(map(mul, row, x[:i])) + data[start+i]*x[i]
+      if x[i] != 0:
+        xi = x[i]
+        res[:i] = map(add, res[:i], [xi*v for v in row])
+    return res
+  
+  _rmulList = _mulList
+  
+  def _sparse(self):
+    """Get SparseMatrix with nonzero components, built from stored ones only"""
+    triplets = []
+    for i in range(self._rowsCount):
+      start = i*(i+1)//2
+      for j in range(i+1):
+        triplets.append((i, j, self._data[start+j]))
+        if j != i:
+          triplets.append((j, i, self._data[start+j]))
+    return SparseMatrix(self._rowsCount, self._columnsCount, triplets)
+  
+  def _isSymmetric(self):
+    """Check if matrix is symmetric"""
+    return True
+  
+  def transpose(self):
+    """Get transposed matrix"""
+    return self.copy()
+  
+  def _det(self):
+    """Get determinant of matrix (using cached factorization, Cholesky if matrix is positive-definite)"""
+    if self._rowsCount > 3:
+      return self.factorize().det()
+    return Matrix._det(self)
+  
+  def _eigenvalues(self, tolerance, maxIterations):
+    """Get list of eigenvalues of matrix sorted in descending order"""
+    if self._rowsCount > 3 and not self.isDiagonal():
+      return sorted(_eigenvaluesSymmetric(self.asList(), tolerance, maxIterations), reverse=True)
+    return Matrix._eigenvalues(self, tolerance, maxIterations)
+  
+  def __repr__(self):
+    """Get string to represent matrix by repr()"""
+    return "SymmetricMatrix(" + repr(self.asList()) + ")"
+
+class BandedMatrix(_StructuredMatrix):
+  """
+    class BandedMatrix(Matrix):
+
+    Square banded matrix with components (i, j) allowed for i-lower <= j <= i+upper. Each row
+    stores lower+upper+1 components (components outside of matrix are zero padding), so
+    storage takes n*(lower+upper+1) floats. Setting nonzero component outside of band raises MatrixError.
+
+    Constructors:
+      BandedMatrix(int, lower, upper) -> zero BandedMatrix with specified size and bandwidths
+      BandedMatrix(iterable, lower, upper) -> BandedMatrix with rows from any iterable object, i.e. list
+      BandedMatrix(Matrix, lower, upper) -> BandedMatrix with components of banded square Matrix
+  """
+  
+  __slots__ = ("_lowerBandwidth", "_upperBandwidth")
+  
+  def __init__(self, x, lower, upper):
+    """
+      BandedMatrix constructor
+
+      BandedMatrix(int, lower, upper) -> zero BandedMatrix with specified size and bandwidths
+      BandedMatrix(iterable, lower, upper) -> BandedMatrix with rows from any iterable object, i.e. list
+      BandedMatrix(Matrix, lower, upper) -> BandedMatrix with components of banded square Matrix
+      lower, upper: number of nonzero diagonals below and above main diagonal (int >= 0)
+    """
+    if not (isinstance(lower, numbers.Integral) and lower >= 0 and isinstance(upper, numbers.Integral) and upper >= 0):
+      raise ValueError("Bandwidths should be an int >= 0. {0} and {1} passed instead".format(lower, upper))
+    n, vals = self._squareArgument(x)
+    self._lowerBandwidth = min(lower, n-1)
+    self._upperBandwidth = min(upper, n-1)
+    self._pack(n, vals)
+  
+  @property
+  def lowerBandwidth(self):
+    """int: read-only number of nonzero diagonals below main diagonal"""
+    return self._lowerBandwidth
+  
+  @property
+  def upperBandwidth(self):
+    """int: read-only number of nonzero diagonals above main diagonal"""
+    return self._upperBandwidth
+  
+  def _span(self, i):
+    """Get tuple (lo, hi, start) of stored components of row i"""
+    lo = max(0, i - self._lowerBandwidth)
+    return lo, min(self._rowsCount, i + self._upperBandwidth + 1), i*(self._lowerBandwidth + self._upperBandwidth) + lo + self._lowerBandwidth
+  
+  def _packedSize(self, n):
+    """Get number of stored components of matrix n x n"""
+    return n*(self._lowerBandwidth + self._upperBandwidth + 1)
+  
+  def _product(self, other, res):
+    """Get product of matrix and matrix other from dense product res (banded for banded other)"""
+    if isinstance(other, BandedMatrix) and other._rowsCount == self._rowsCount:
+      n = self._rowsCount
+      return BandedMatrix(n, self._lowerBandwidth + other._lowerBandwidth, self._upperBandwidth + other._upperBandwidth)._packed(res._vals)
+    return res
+  
+  def transpose(self):
+    """Get transposed matrix (bandwidths are swapped)"""
+    return self._transposeTo(BandedMatrix(self._rowsCount, self._upperBandwidth, self._lowerBandwidth))
+  
+  def _det(self):
+    """Get determinant of matrix by banded LU factorization with partial pivoting (O(n*lower*(lower+upper)))"""
+    n, lower, upper = self._rowsCount, self._lowerBandwidth, self._upperBandwidth
+    # Row i holds components of columns starts[i]..starts[i]+width-1, eliminated rows are shifted to start
+    # at the next column. Pivoting widens upper bandwidth up to lower+upper
+    width = 2*lower + upper + 1
+    rows, starts = [], []
+    for i in range(n):
+      lo, hi, start = self._span(i)
+      rows.append(self._data[start:start+hi-lo].tolist() + [0.]*(width-hi+lo))
+      starts.append(lo)
+    res = 1.
+    for k in range(n):
+      last = min(n, k+lower+1)
+      p = max(range(k, last), key=lambda i: abs(rows[i][k-starts[i]]))
+      pivot = rows[p][k-starts[p]]
+      if pivot == 0:
+        return 0.
+      if p != k:
+        rows[k], rows[p] = rows[p], rows[k]
+        starts[k], starts[p] = starts[p], starts[k]
+        res = -res
+      res *= pivot
+      stop = min(n, k+lower+upper+1)
+      pivotRow = rows[k][k+1-starts[k]:stop-starts[k]]
+      for i in range(k+1, last):
+        row, s = rows[i], starts[i]
+        factor = row[k-s] / pivot
+        row = row[k+1-s:] + [0.]*(k+1-s)
+        if factor != 0:
+          row[:stop-k-1] = map(sub, row[:stop-k-1], [factor*x for x in pivotRow])
+        rows[i], starts[i] = row, k+1
+    return res
+  
+  def __repr__(self):
+    """Get string to represent matrix by repr()"""
+    return "BandedMatrix({0!r}, {1}, {2})".format(self.asList(), self._lowerBandwidth, self._upperBandwidth)
+
+class _Factorization(object):
+  """Base class of factorizations of square Matrix: solving of linear systems with many right-hand sides"""
+  
+  __slots__ = ("_n", "_backend", "_singular")
+  
+  @property
+  def size(self):
+    """int: read-only size of factorized square matrix"""
+    return self._n
+  
+  def isSingular(self):
+    """Check if factorized matrix is singular"""
+    return self._singular
+  
+  @staticmethod
+  def _profile(a, n):
+    """
+      Get list of columns of first nonzero components of rows of packed lower triangle a (i for zero row i).
+      Symmetric factors keep zeros before them, so banded matrices are factorized in O(n*bandwidth^2)
+    """
+    res = []
+    for i in range(n):
+      s = i*(i+1)//2
+      res.append(next((j for j in range(i) if a[s+j] != 0), i))
+    return res
+  
+  def solve(self, b):
+    """
+      Get solution x of linear system matrix*x == b.
+      b is a Vector (Vector is returned) or a Matrix (solved column by column, Matrix is returned)
+    """
+    if isinstance(b, Vector):
+      if len(b) != self._n:
+        raise MatrixError("Linear system can't be solved. Sizes are inconsistent")
+      if self._singular:
+        raise MatrixError("Linear system can't be solved. Matrix is singular")
+      return Vector._fromFlat(self._solveList(b.values), self._backend)
+    if isinstance(b, Matrix):
+      if b.m != self._n:
+        raise MatrixError("Linear system can't be solved. Sizes are inconsistent")
+      if self._singular:
+        raise MatrixError("Linear system can't be solved. Matrix is singular")
+      k = b.n
+      cols = [self._solveList(b._vals[j::k].tolist()) for j in range(k)]
+      return Matrix._fromFlat(self._n, k, [x for row in zip(*cols) for x in row], self._backend)
+    raise TypeError("Argument should be a Vector or a Matrix.")
+  
+  def inverse(self):
+    """Get inverse of factorized matrix"""
+    return self.solve(Matrix.Identity(self._n))
+
+class LUFactorization(_Factorization):
+  """
+    class LUFactorization(_Factorization):
+
+    LU decomposition with partial pivoting of square matrix: P*A == L*U.
+    Factorization is done once in O(n^3), each solve costs O(n^2).
+
+    Constructors:
+      LUFactorization(Matrix) -> factorization of square Matrix
+  """
+  
+  __slots__ = ("_lu", "_perm", "_sign")
+  
+  def __init__(self, matrix):
+    """LUFactorization(Matrix) -> factorization of square Matrix"""
+    if not isinstance(matrix, Matrix):
+      raise TypeError("Argument should be a Matrix.")
+    if not matrix.isSquare():
+      raise NotImplementedError("LU decomposition can't be calculated for non-square matrix")
+    self._n = matrix.m
+    self._backend = matrix.backend
+    self._lu, self._perm, self._sign = matrix._luFactor()
+    self._singular = any(self._lu[i][i] == 0 for i in range(self._n))
+  
+  def det(self):
+    """Get determinant of factorized matrix"""
+    res = self._sign
+    for i in range(self._n):
+      res *= self._lu[i][i]
+    return res
+  
+  def logdet(self):
+    """Get natural logarithm of determinant of factorized matrix (MatrixError if determinant isn't positive)"""
+    if self._singular or self._sign*_prod(math.copysign(1., self._lu[i][i]) for i in range(self._n)) < 0:
+      raise MatrixError("Logarithm of determinant can't be calculated. Determinant isn't positive")
+    return math.fsum(math.log(abs(self._lu[i][i])) for i in range(self._n))
+  
+  def _solveList(self, b):
+    """Solve linear system for right-hand side given as list of floats"""
+    lu = self._lu
+    y = [b[p] for p in self._perm]
+    for i in range(1, self._n):
+      y[i] -= sum(map(mul, lu[i][:i], y[:i]))
+    for i in range(self._n-1, -1, -1):
+      y[i] = (y[i] - sum(map(mul, lu[i][i+1:], y[i+1:]))) / lu[i][i]
+    return y
+
+class CholeskyFactorization(_Factorization):
+  """
+    class CholeskyFactorization(_Factorization):
+
+    Cholesky decomposition of symmetric positive-definite matrix: A == L*L.transpose().
+    Does half the work of LU decomposition and needs no pivoting.
+    L is stored packed: rows of lower triangle one after another in array('d') of n*(n+1)/2 floats.
+
+    Constructors:
+      CholeskyFactorization(Matrix) -> factorization of symmetric positive-definite Matrix
+  """
+  
+  __slots__ = ("_l",)
+  
+  def __init__(self, matrix):
+    """CholeskyFactorization(Matrix) -> factorization of symmetric positive-definite Matrix"""
+    if not isinstance(matrix, Matrix):
+      raise TypeError("Argument should be a Matrix.")
+    if not matrix.isSymmetric():
+      raise MatrixError("Cholesky decomposition can't be calculated for non-symmetric matrix")
+    n = matrix.m
+    a = matrix._lowerTriangle()
+    first = _Factorization._profile(a, n)
+    l = array('d', [0.])*(n*(n+1)//2)
+    for i in range(n):
+      si, fi = i*(i+1)//2, first[i]
+      for j in range(fi, i):
+        sj, k = j*(j+1)//2, max(fi, first[j])
+        l[si+j] = (a[si+j] - sum(map(mul, l[si+k:si+j], l[sj+k:sj+j]))) / l[sj+j]
+      s = a[si+i] - sum(map(mul, l[si+fi:si+i], l[si+fi:si+i]))
+      if s <= 0:
+        raise MatrixError("Cholesky decomposition can't be calculated. Matrix is not positive-definite")
+      l[si+i] = math.sqrt(s)
+    self._n = n
+    self._backend = matrix.backend
+    self._l = l
+    self._singular = False
+  
+  def det(self):
+    """Get determinant of factorized matrix"""
+    return _prod(self._diagonal())**2
+  
+  def logdet(self):
+    """Get natural logarithm of determinant of factorized matrix (doesn't overflow for large matrices)"""
+    return 2*math.fsum(map(math.log, self._diagonal()))
+  
+  def _diagonal(self):
+    """Get list of diagonal components of L"""
+    return [self._l[i*(i+3)//2] for i in range(self._n)]
+  
+  def _solveList(self, b):
+    """Solve linear system for right-hand side given as list of floats"""
+    l = self._l
+    y = list(b)
+    for i in range(self._n):
+      s = i*(i+1)//2
+      y[i] = (y[i] - sum(map(mul, l[s:s+i], y[:i]))) / l[s+i]
+    for i in range(self._n-1, -1, -1):
+      s = i*(i+1)//2
+      y[i] /= l[s+i]
+      if y[i] != 0:
+        y[:i] = map(sub, y[:i], [x*y[i] for x in l[s:s+i]])
+    return y
+
+class LDLFactorization(_Factorization):
+  """
+    class LDLFactorization(_Factorization):
+
+    LDL decomposition of symmetric matrix: A == L*D*L.transpose(), where L is unit lower triangular
+    and D is diagonal. Like Cholesky decomposition needs no square roots and works for symmetric
+    indefinite matrices which leading principal minors are nonsingular (there is no pivoting).
+    Strict lower triangle of L is stored packed in array('d') of n*(n-1)/2 floats, D in array('d').
+
+    Constructors:
+      LDLFactorization(Matrix) -> factorization of symmetric Matrix
+  """
+  
+  __slots__ = ("_l", "_d")
+  
+  def __init__(self, matrix):
+    """LDLFactorization(Matrix) -> factorization of symmetric Matrix"""
+    if not isinstance(matrix, Matrix):
+      raise TypeError("Argument should be a Matrix.")
+    if not matrix.isSymmetric():
+      raise MatrixError("LDL decomposition can't be calculated for non-symmetric matrix")
+    n = matrix.m
+    a = matrix._lowerTriangle()
+    first = _Factorization._profile(a, n)
+    l = array('d', [0.])*(n*(n-1)//2)
+    d = array('d', [0.])*n
+    for i in range(n):
+      si, ai, fi = i*(i-1)//2, i*(i+1)//2, first[i]
+      w = [0.]*i
+      for j in range(fi, i):
+        sj, k = j*(j-1)//2, max(fi, first[j])
+        l[si+j] = (a[ai+j] - sum(map(mul, w[k:j], l[sj+k:sj+j]))) / d[j]
+        w[j] = l[si+j]*d[j]
+      d[i] = a[ai+i] - sum(map(mul, w[fi:], l[si+fi:si+i]))
+      if d[i] == 0 and i < n-1:
+        raise MatrixError("LDL decomposition can't be calculated without pivoting. Leading minor is singular")
+    self._n = n
+    self._backend = matrix.backend
+    self._l = l
+    self._d = d
+    self._singular = d[n-1] == 0
+  
+  @property
+  def d(self):
+    """Vector: read-only copy of diagonal of D"""
+    return Vector._fromFlat(self._d, self._backend)
+  
+  def det(self):
+    """Get determinant of factorized matrix"""
+    return _prod(self._d)
+  
+  def logdet(self):
+    """Get natural logarithm of determinant of factorized matrix (MatrixError if determinant isn't positive)"""
+    if sum(1 for x in self._d if x < 0) % 2 or self._singular:
+      raise MatrixError("Logarithm of determinant can't be calculated. Determinant isn't positive")
+    return math.fsum(math.log(abs(x)) for x in self._d)
+  
+  def _solveList(self, b):
+    """Solve linear system for right-hand side given as list of floats"""
+    l = self._l
+    d = self._d
+    y = list(b)
+    for i in range(1, self._n):
+      s = i*(i-1)//2
+      y[i] -= sum(map(mul, l[s:s+i], y[:i]))
+    y = list(map(truediv, y, d))
+    for i in range(self._n-1, 0, -1):
+      s = i*(i-1)//2
+      if y[i] != 0:
+        y[:i] = map(sub, y[:i], [x*y[i] for x in l[s:s+i]])
+    return y
+
+class SparseMatrix(object):
+  """
+    class SparseMatrix(object):
+
+    Sparse matrix in compressed sparse row (CSR) format. Only nonzero components are stored:
+    row i has column indexes indices[indptr[i]:indptr[i+1]] (sorted) and values data[indptr[i]:indptr[i+1]].
+    Operations cost O(nnz), where nnz is number of stored components.
+
+    Constructors:
+      SparseMatrix(int, int) -> zero SparseMatrix with specified number of rows and columns
+      SparseMatrix(int, int, iterable) -> SparseMatrix from coordinate (COO) triplets (row, column, value).
+                                          Values of repeated coordinates are summed up.
+
+      SparseMatrix.FromDense(Matrix) -> SparseMatrix with nonzero components of Matrix
+  """
+  
+  __slots__ = ("_rowsCount", "_columnsCount", "_indptr", "_indices", "_data")
+  
+  def __init__(self, m, n, triplets=()):
+    """
+      SparseMatrix constructor
+
+      SparseMatrix(int, int) -> zero SparseMatrix with specified number of rows and columns
+      SparseMatrix(int, int, iterable) -> SparseMatrix from coordinate (COO) triplets (row, column, value)
+    """
+    if not (isinstance(m, numbers.Integral) and m > 0 and isinstance(n, numbers.Integral) and n > 0):
+      raise ValueError("Size should be an int > 0. {0} and {1} passed instead".format(m, n))
+    entries = {}
+    try:
+      for i, j, value in triplets:
+        if not (isinstance(i, numbers.Integral) and isinstance(j, numbers.Integral)):
+          raise TypeError
+        if not (0 <= i < m and 0 <= j < n):
+          raise IndexError("Sparse matrix index ({0}, {1}) out of range".format(i, j))
+        entries[i, j] = entries.get((i, j), 0.) + float(value)
+    except IndexError:
+      raise
+    except:
+      raise MatrixError("Can't create sparse matrix. Triplets (row, column, value) expected")
+    self._rowsCount = m
+    self._columnsCount = n
+    self._indptr = array('l', [0])*(m+1)
+    self._indices = array('l')
+    self._data = array('d')
+    for (i, j), value in sorted(entries.items()):
+      if value != 0:
+        self._indices.append(j)
+        self._data.append(value)
+        self._indptr[i+1] += 1
+    for i in range(m):
+      self._indptr[i+1] += self._indptr[i]
+  
+  
+  #=============
+  #  Properties 
+  #=============
+  
+  @property
+  def size(self):
+    """tuple: read-only matrix size (number_of_rows, number_of_columns)"""
+    return (self._rowsCount, self._columnsCount)
+  
+  @property
+  def m(self):
+    """int: read-only number of rows"""
+    return self._rowsCount
+  
+  @property
+  def n(self):
+    """int: read-only number of columns"""
+    return self._columnsCount
+  
+  @property
+  def nnz(self):
+    """int: read-only number of stored (nonzero) components"""
+    return len(self._data)
+  
+  
+  #=================
+  #  Static methods 
+  #=================
+  
+  @staticmethod
+  def FromDense(matrix):
+    """SparseMatrix.FromDense(Matrix) -> SparseMatrix with nonzero components of Matrix"""
+    if not isinstance(matrix, Matrix):
+      raise TypeError("Argument should be a Matrix. {0} passed instead".format(type(matrix)))
+    m, n = matrix.size
+    indptr = array('l', [0])
+    indices = array('l')
+    data = array('d')
+    vals = matrix._vals
+    for i in range(m):
+      start = i*n
+      for j in range(n):
+        if vals[start+j] != 0:
+          indices.append(j)
+          data.append(vals[start+j])
+      indptr.append(len(data))
+    return SparseMatrix._fromCSR(m, n, indptr, indices, data)
+  
+  @staticmethod
+  def _fromCSR(m, n, indptr, indices, data):
+    """Get SparseMatrix from CSR arrays (not validated, arrays are not copied)"""
+    res = SparseMatrix.__new__(SparseMatrix)
+    res._rowsCount = m
+    res._columnsCount = n
+    res._indptr = indptr
+    res._indices = indices
+    res._data = data
+    return res
+  
+  
+  #========
+  #  Tests 
+  #========
+  
+  def isZero(self):
+    """Check if all components are zero"""
+    return len(self._data) == 0
+  
+  def isSquare(self):
+    """Check if matrix number of rows = number of columns"""
+    return self._rowsCount == self._columnsCount
+  
+  def isDiagonal(self):
+    """Check if matrix is square and all non-diagonal elements are zero. O(nnz)"""
+    if not self.isSquare():
+      return False
+    indptr, indices = self._indptr, self._indices
+    for i in range(self._rowsCount):
+      for k in range(indptr[i], indptr[i+1]):
+        if indices[k] != i:
+          return False
+    return True
+  
+  def isSymmetric(self):
+    """Check if matrix is square and symmetric. O(nnz)"""
+    return self.isSquare() and self == self.transpose()
+  
+  
+  #============
+  #  Get parts 
+  #============
+  
+  def asDense(self, backend=None):
+    """Get Matrix with the same components"""
+    m, n = self.size
+    vals = [0.]*(m*n)
+    indptr, indices, data = self._indptr, self._indices, self._data
+    for i in range(m):
+      start = i*n
+      for k in range(indptr[i], indptr[i+1]):
+        vals[start+indices[k]] = data[k]
+    return Matrix._fromFlat(m, n, vals, backend)
+  
+  def asTriplets(self):
+    """Get list of coordinate (COO) triplets (row, column, value) of stored components"""
+    indptr, indices, data = self._indptr, self._indices, self._data
+    return [(i, indices[k], data[k]) for i in range(self._rowsCount) for k in range(indptr[i], indptr[i+1])]
+  
+  def getRow(self, n):
+    """Get Vector with components from specified row"""
+    if not -self._rowsCount <= n < self._rowsCount:
+      raise IndexError("Row index out of range")
+    n %= self._rowsCount
+    res = [0.]*self._columnsCount
+    for k in range(self._indptr[n], self._indptr[n+1]):
+      res[self._indices[k]] = self._data[k]
+    return Vector._fromFlat(res, "python")
+  
+  def getDiagonal(self):
+    """Get Vector with components from main diagonal"""
+    return Vector._fromFlat([self[i,i] for i in range(min(self.size))], "python")
+  
+  
+  #===============
+  #  Get modified 
+  #===============
+  
+  def transpose(self):
+    """Get transposed sparse matrix. O(nnz)"""
+    m, n = self.size
+    indptr, indices, data = self._indptr, self._indices, self._data
+    counts = [0]*(n+1)
+    for j in indices:
+      counts[j+1] += 1
+    for j in range(n):
+      counts[j+1] += counts[j]
+    resIndptr = array('l', counts)
+    resIndices = array('l', [0])*len(indices)
+    resData = array('d', [0.])*len(data)
+    for i in range(m):
+      for k in range(indptr[i], indptr[i+1]):
+        pos = counts[indices[k]]
+        counts[indices[k]] += 1
+        resIndices[pos] = i
+        resData[pos] = data[k]
+    return SparseMatrix._fromCSR(n, m, resIndptr, resIndices, resData)
+  
+  
+  #=================
+  #  Linear algebra 
+  #=================
+  
+  def trace(self):
+    """Get trace of matrix (sum of diagonal elements)"""
+    return math.fsum(self.getDiagonal())
+  
+  
+  #=================
+  #  Representation 
+  #=================
+  
+  def __str__(self):
+    """Get string to print sparse matrix by str()"""
+    return str(self.asDense())
+  
+  def __repr__(self):
+    """Get string to represent sparse matrix by repr()"""
+    return "SparseMatrix({0}, {1}, {2!r})".format(self._rowsCount, self._columnsCount, self.asTriplets())
+  
+  
+  #===============
+  #  Items access 
+  #===============
+  
+  def __getitem__(self, key):
+    """Get component by index (tuple)"""
+    if not isinstance(key, (tuple, list)):
+      raise TypeError("Index should be a tuple")
+    if len(key) != 2:
+      raise ValueError("Tuple length should be 2. {0} passed instead".format(len(key)))
+    i, j = key
+    if not (-self._rowsCount <= i < self._rowsCount and -self._columnsCount <= j < self._columnsCount):
+      raise IndexError("Sparse matrix index out of range")
+    i %= self._rowsCount
+    j %= self._columnsCount
+    start, end = self._indptr[i], self._indptr[i+1]
+    k = bisect_left(self._indices, j, start, end)
+    if k < end and self._indices[k] == j:
+      return self._data[k]
+    return 0.
+  
+  
+  #============
+  #  Operators 
+  #============
+  
+  def __eq__(self, other):
+    """Check for equality with SparseMatrix, Matrix or 0"""
+    if other is None:
+      return False
+    if isinstance(other, SparseMatrix):
+      return (self.size == other.size and self._indptr == other._indptr and
+              self._indices == other._indices and self._data == other._data)
+    if isinstance(other, Matrix):
+      return self.size == other.size and self.asDense() == other
+    if isinstance(other, (int, float)) and other == 0:
+      return self.isZero()
+    raise ValueError("Can't compare sparse matrix and '{0.__name__}'".format(type(other)))
+  
+  def __ne__(self, other):
+    """Check for non-equality"""
+    return not self.__eq__(other)
+  
+  def __neg__(self):
+    """Get negative SparseMatrix"""
+    return SparseMatrix._fromCSR(self._rowsCount, self._columnsCount, array('l', self._indptr),
+                                 array('l', self._indices), array('d', [-x for x in self._data]))
+  
+  def __add__(self, other):
+    """Add sparse matrix to sparse matrix (SparseMatrix) or to dense matrix (Matrix)"""
+    if isinstance(other, Matrix):
+      if self.size != other.size:
+        raise MatrixError("Trying to add matrixes of different size")
+      # Owned dense copy: _vals of structured matrices is a temporary built on each access
+      res = Matrix._fromFlat(other.m, other.n, other._vals, other.backend)
+      n = self._columnsCount
+      indptr, indices, data = self._indptr, self._indices, self._data
+      for i in range(self._rowsCount):
+        for k in range(indptr[i], indptr[i+1]):
+          res._vals[i*n+indices[k]] += data[k]
+      return res
+    if not isinstance(other, SparseMatrix):
+      return NotImplemented
+    if self.size != other.size:
+      raise MatrixError("Trying to add matrixes of different size")
+    indptr = array('l', [0])
+    indices = array('l')
+    data = array('d')
+    for i in range(self._rowsCount):
+      row = dict(zip(self._indices[self._indptr[i]:self._indptr[i+1]], self._data[self._indptr[i]:self._indptr[i+1]]))
+      for k in range(other._indptr[i], other._indptr[i+1]):
+        j = other._indices[k]
+        row[j] = row.get(j, 0.) + other._data[k]
+      for j in sorted(row):
+        if row[j] != 0:
+          indices.append(j)
+          data.append(row[j])
+      indptr.append(len(data))
+    return SparseMatrix._fromCSR(self._rowsCount, self._columnsCount, indptr, indices, data)
+  
+  def __radd__(self, other):
+    """Add dense matrix or 0 to sparse matrix"""
+    if isinstance(other, numbers.Integral) and other == 0:
+      return self
+    return self.__add__(other)
+  
+  def __sub__(self, other):
+    """Subtract sparse or dense matrix from sparse matrix"""
+    if not isinstance(other, (SparseMatrix, Matrix)):
+      return NotImplemented
+    return self + (-other)
+  
+  def __rsub__(self, other):
+    """Subtract sparse matrix from dense matrix"""
+    if not isinstance(other, Matrix):
+      return NotImplemented
+    return (-self) + other
+  
+  def __mul__(self, other):
+    """
+      Multiply sparse matrix to scalar (SparseMatrix), to Vector (Vector),
+      to dense Matrix (Matrix) or to SparseMatrix (SparseMatrix)
+    """
+    indptr, indices, data = self._indptr, self._indices, self._data
+    if isinstance(other, Vector):
+      if self._columnsCount != len(other):
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      x = other._vals
+      return Vector._fromFlat([sum(data[k]*x[indices[k]] for k in range(indptr[i], indptr[i+1]))
+                               for i in range(self._rowsCount)], other.backend)
+    if isinstance(other, Matrix):
+      if self._columnsCount != other.m:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      p = other.n
+      b = other._vals
+      res = [0.]*(self._rowsCount*p)
+      for i in range(self._rowsCount):
+        start = i*p
+        row = res[start:start+p]
+        for k in range(indptr[i], indptr[i+1]):
+          v = data[k]
+          bStart = indices[k]*p
+          row = list(map(add, row, [v*x for x in b[bStart:bStart+p]]))
+        res[start:start+p] = row
+      return Matrix._fromFlat(self._rowsCount, p, res, other.backend)
+    if isinstance(other, SparseMatrix):
+      if self._columnsCount != other._rowsCount:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      resIndptr = array('l', [0])
+      resIndices = array('l')
+      resData = array('d')
+      for i in range(self._rowsCount):
+        row = {}
+        for k in range(indptr[i], indptr[i+1]):
+          v = data[k]
+          r = indices[k]
+          for kk in range(other._indptr[r], other._indptr[r+1]):
+            j = other._indices[kk]
+            row[j] = row.get(j, 0.) + v*other._data[kk]
+        for j in sorted(row):
+          if row[j] != 0:
+            resIndices.append(j)
+            resData.append(row[j])
+        resIndptr.append(len(resData))
+      return SparseMatrix._fromCSR(self._rowsCount, other._columnsCount, resIndptr, resIndices, resData)
+    try:
+      factor = float(other)
+    except:
+      return NotImplemented
+    if factor == 0:
+      return SparseMatrix(self._rowsCount, self._columnsCount)
+    return SparseMatrix._fromCSR(self._rowsCount, self._columnsCount, array('l', indptr),
+                                 array('l', indices), array('d', [x*factor for x in data]))
+  
+  def __rmul__(self, other):
+    """Multiply scalar, Vector (as row) or dense Matrix to sparse matrix"""
+    if isinstance(other, Vector):
+      if self._rowsCount != len(other):
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      return self.transpose()*other
+    if isinstance(other, Matrix):
+      if self._rowsCount != other.n:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      return (self.transpose()*other.transpose()).transpose()
+    return self.__mul__(other)
+  
+  def __truediv__(self, other):
+    """Divide sparse matrix to scalar"""
+    try:
+      return self*(1.0/float(other))
+    except ZeroDivisionError:
+      raise
+    except:
+      return NotImplemented
+  
+  __div__ = __truediv__
+
+class TiledMatrix(object):
+  """
+    class TiledMatrix(object):
+
+    Matrix stored in file as square tiles (tileSize x tileSize) for matrices which don't fit in memory.
+    Tiles are in-memory Matrix objects read and written through LRU cache of at most cacheSize tiles,
+    so working set of operations is about cacheSize*tileSize**2*8 bytes (solve also keeps two columns
+    of tiles in memory). File is a 32-byte header (b"LATM", version byte 1, dtype b"d", 2 reserved bytes,
+    rows count, columns count and tile size as little-endian uint64) followed by tiles in row-major order,
+    each tile holds its components as row-major little-endian doubles.
+
+    Constructors:
+      TiledMatrix(path, int, int) -> zero TiledMatrix with specified number of rows and columns in new file
+      TiledMatrix(None, int, int) -> zero TiledMatrix in temporary file (removed by close)
+
+      TiledMatrix.Open(path) -> TiledMatrix stored in existing file
+      TiledMatrix.FromMatrix(path, Matrix) -> TiledMatrix with components of in-memory Matrix
+
+    Optional arguments tileSize (default 256), cacheSize (number of cached tiles, default 16) and backend
+    of tiles. Results of operators are stored in temporary files next to the left operand.
+  """
+  
+  __slots__ = ("_path", "_file", "_temporary", "_rowsCount", "_columnsCount", "_tileSize", "_cacheSize", "_backend", "_cache")
+  
+  def __init__(self, path, m, n, tileSize=256, cacheSize=16, backend=None):
+    """TiledMatrix(path, int, int) -> zero TiledMatrix with specified number of rows and columns in new file"""
+    self._file = None
+    if not (isinstance(m, numbers.Integral) and m > 0 and isinstance(n, numbers.Integral) and n > 0):
+      raise ValueError("Size should be an int > 0. {0} and {1} passed instead".format(m, n))
+    if not (isinstance(tileSize, numbers.Integral) and tileSize > 0):
+      raise ValueError("Tile size should be an int > 0. {0} passed instead".format(tileSize))
+    temporary = path is None
+    if temporary:
+      path = _temporaryPath(None)
+    self._setup(path, open(path, "w+b"), m, n, tileSize, cacheSize, backend, temporary)
+    self._file.write(_TILED_HEADER.pack(_TILED_MAGIC, _FILE_VERSION, b"d", m, n, tileSize))
+    self._file.truncate(_TILED_HEADER.size + 8*m*n)
+  
+  def _setup(self, path, f, m, n, tileSize, cacheSize, backend, temporary):
+    """Initialize attributes of TiledMatrix stored in opened file"""
+    self._path = path
+    self._file = f
+    self._temporary = temporary
+    self._rowsCount = m
+    self._columnsCount = n
+    self._tileSize = tileSize
+    self._backend = _resolveBackend(backend)
+    self._cache = OrderedDict()
+    self.cacheSize = cacheSize
+  
+  def __del__(self):
+    """Write modified tiles and close file (temporary file is removed)"""
+    if self._file is not None:
+      self.close()
+  
+  
+  #=============
+  #  Properties 
+  #=============
+  
+  @property
+  def size(self):
+    """tuple: read-only tuple with 2 ints: number of rows and number of columns"""
+    return (self._rowsCount, self._columnsCount)
+  
+  @property
+  def m(self):
+    """int: read-only number of rows"""
+    return self._rowsCount
+  
+  @property
+  def n(self):
+    """int: read-only number of columns"""
+    return self._columnsCount
+  
+  @property
+  def path(self):
+    """str: read-only path of file"""
+    return self._path
+  
+  @property
+  def tileSize(self):
+    """int: read-only number of rows and columns of tiles (tiles of last row and column may be smaller)"""
+    return self._tileSize
+  
+  @property
+  def tilesCount(self):
+    """tuple: read-only tuple with 2 ints: number of rows and number of columns of tiles"""
+    t = self._tileSize
+    return (-(-self._rowsCount // t), -(-self._columnsCount // t))
+  
+  @property
+  def cacheSize(self):
+    """int: max number of tiles kept in memory"""
+    return self._cacheSize
+  
+  @cacheSize.setter
+  def cacheSize(self, value):
+    if not (isinstance(value, numbers.Integral) and value > 0):
+      raise ValueError("Cache size should be an int > 0. {0} passed instead".format(value))
+    self._cacheSize = value
+    self._evict()
+  
+  @property
+  def backend(self):
+    """str: read-only storage backend of tiles ("python" or "numpy")"""
+    return self._backend
+  
+  
+  #=================
+  #  Static methods 
+  #=================
+  
+  @staticmethod
+  def Open(path, cacheSize=16, backend=None):
+    """TiledMatrix.Open(path) -> TiledMatrix stored in existing file written by TiledMatrix"""
+    f = open(path, "r+b")
+    try:
+      header = f.read(_TILED_HEADER.size)
+      if len(header) != _TILED_HEADER.size or header[:len(_TILED_MAGIC)] != _TILED_MAGIC:
+        raise MatrixError("{0} is not a tiled matrix file".format(path))
+      magic, version, dtype, m, n, tileSize = _TILED_HEADER.unpack(header)
+      if version != _FILE_VERSION or dtype != b"d":
+        raise MatrixError("Unsupported matrix file version {0} or dtype {1!r}".format(version, dtype))
+      if m == 0 or n == 0 or tileSize == 0 or os.fstat(f.fileno()).st_size != _TILED_HEADER.size + 8*m*n:
+        raise MatrixError("Matrix file {0} is truncated or corrupted".format(path))
+    except:
+      f.close()
+      raise
+    res = TiledMatrix.__new__(TiledMatrix)
+    res._setup(path, f, m, n, tileSize, cacheSize, backend, False)
+    return res
+  
+  @staticmethod
+  def FromMatrix(path, matrix, tileSize=256, cacheSize=16, backend=None):
+    """TiledMatrix.FromMatrix(path, Matrix) -> TiledMatrix with components of in-memory Matrix"""
+    if not isinstance(matrix, Matrix):
+      raise TypeError("Argument should be a Matrix.")
+    res = TiledMatrix(path, matrix.m, matrix.n, tileSize, cacheSize, backend or matrix.backend)
+    t = tileSize
+    for I, J in res._tiles():
+      m, n = res._tileShape(I, J)
+      res._writeTile(I, J, matrix.getSubmatrix(I*t, I*t+m, J*t, J*t+n))
+    return res
+  
+  
+  #========
+  #  Tests 
+  #========
+  
+  def isSquare(self):
+    """Check if matrix number of rows = number of columns"""
+    return self._rowsCount == self._columnsCount
+  
+  
+  #=========
+  #  Tiles 
+  #=========
+  
+  def getTile(self, I, J):
+    """Get copy of tile in row I and column J of tiles as Matrix"""
+    return self._tile(I, J).copy()
+  
+  def setTile(self, I, J, matrix):
+    """Replace tile in row I and column J of tiles by components of Matrix of the same size"""
+    if not isinstance(matrix, Matrix):
+      raise TypeError("Argument should be a Matrix.")
+    m, n = self._tileShape(I, J)
+    if matrix.size != (m, n):
+      raise MatrixError("Tile size should be {0}. {1} passed instead".format((m, n), matrix.size))
+    self._putTile(I, J, Matrix._fromFlat(m, n, matrix._vals, self._backend))
+  
+  def getDiagonal(self):
+    """Get Vector with components from main diagonal (reads only diagonal tiles)"""
+    vals = array('d')
+    for I in range(min(self.tilesCount)):
+      vals.extend(self._tile(I, I).getDiagonal()._vals)
+    return Vector._fromFlat(vals, self._backend)
+  
+  def asMatrix(self):
+    """Get in-memory Matrix with all components"""
+    n = self._columnsCount
+    vals = array('d')
+    for I in range(self.tilesCount[0]):
+      tiles = [self._tile(I, J) for J in range(self.tilesCount[1])]
+      for i in range(tiles[0].m):
+        for tile in tiles:
+          vals.extend(tile._vals[i*tile.n:(i+1)*tile.n])
+    return Matrix._adopt(self._rowsCount, n, _flatBuffer(vals, self._backend))
+  
+  def flush(self):
+    """Write modified tiles to file"""
+    for (I, J), entry in self._cache.items():
+      if entry[1]:
+        self._writeTile(I, J, entry[0])
+        entry[1] = False
+    self._file.flush()
+  
+  def close(self):
+    """Write modified tiles and close file. Temporary file is removed"""
+    if self._file is None:
+      return
+    if not self._temporary:
+      self.flush()
+    self._file.close()
+    self._file = None
+    self._cache.clear()
+    if self._temporary:
+      os.remove(self._path)
+  
+  def __enter__(self):
+    return self
+  
+  def __exit__(self, excType, excValue, traceback):
+    self.close()
+  
+  def _tiles(self):
+    """Get list of (I, J) indexes of all tiles in row-major order"""
+    rows, cols = self.tilesCount
+    return [(I, J) for I in range(rows) for J in range(cols)]
+  
+  def _tileShape(self, I, J):
+    """Get tuple (rows, columns) of tile in row I and column J of tiles"""
+    t = self._tileSize
+    return (min(t, self._rowsCount - I*t), min(t, self._columnsCount - J*t))
+  
+  def _tile(self, I, J):
+    """Get tile from cache (read from file if missing). Tile is shared with cache, use _putTile to modify it"""
+    entry = self._cache.pop((I, J), None)
+    if entry is None:
+      rows, cols = self.tilesCount
+      if not (0 <= I < rows and 0 <= J < cols):
+        raise IndexError("Tile index out of range")
+      m, n = self._tileShape(I, J)
+      self._file.seek(self._offset(I, J))
+      entry = [Matrix._adopt(m, n, _readDoubles(self._file, self._path, m*n, 0, False, self._backend)), False]
+    self._cache[(I, J)] = entry
+    self._evict()
+    return entry[0]
+  
+  def _putTile(self, I, J, tile):
+    """Put modified tile to cache (written to file on eviction or flush)"""
+    self._cache.pop((I, J), None)
+    self._cache[(I, J)] = [tile, True]
+    self._evict()
+  
+  def _evict(self):
+    """Remove least recently used tiles from cache while it is too big, modified tiles are written to file"""
+    while len(self._cache) > self._cacheSize:
+      (I, J), (tile, modified) = self._cache.popitem(last=False)
+      if modified:
+        self._writeTile(I, J, tile)
+  
+  def _offset(self, I, J):
+    """Get offset of tile in file: tiles of previous rows of tiles, then previous tiles of the same row"""
+    t = self._tileSize
+    return _TILED_HEADER.size + 8*(I*t*self._columnsCount + self._tileShape(I, J)[0]*J*t)
+  
+  def _writeTile(self, I, J, tile):
+    """Write tile to file bypassing cache"""
+    self._file.seek(self._offset(I, J))
+    _writeDoubles(self._file, tile._vals, tile.n)
+  
+  def _newResult(self, m, n):
+    """Get zero TiledMatrix with tile size, cache size and backend of this matrix in temporary file next to it"""
+    res = TiledMatrix(_temporaryPath(os.path.dirname(os.path.abspath(self._path))), m, n, self._tileSize, self._cacheSize, self._backend)
+    res._temporary = True
+    return res
+  
+  def _panel(self, J):
+    """Get column J of tiles (all rows) as list of rows (lists of floats)"""
+    rows = []
+    for I in range(self.tilesCount[0]):
+      rows.extend(self._tile(I, J).asList())
+    return rows
+  
+  def _putPanel(self, J, rows):
+    """Replace column J of tiles by list of rows (lists of floats)"""
+    t = self._tileSize
+    for I in range(self.tilesCount[0]):
+      m, n = self._tileShape(I, J)
+      self._putTile(I, J, Matrix._fromFlat(m, n, [x for row in rows[I*t:I*t+m] for x in row], self._backend))
+  
+  
+  #===============
+  #  Get modified 
+  #===============
+  
+  def transpose(self):
+    """Get transposed TiledMatrix"""
+    res = self._newResult(self._columnsCount, self._rowsCount)
+    for I, J in self._tiles():
+      res._writeTile(J, I, self._tile(I, J).transpose())
+    return res
+  
+  
+  #==================
+  #  Linear algebra 
+  #==================
+  
+  def solve(self, b):
+    """
+      Get solution x of linear system matrix*x == b, where b is an in-memory Vector (Vector is returned)
+      or Matrix (Matrix is returned). LU factorization is computed column of tiles by column of tiles
+      in temporary file
+    """
+    if not self.isSquare():
+      raise NotImplementedError("LU decomposition can't be calculated for non-square matrix")
+    if isinstance(b, Vector):
+      size, rows = len(b), [[x] for x in b]
+    elif isinstance(b, Matrix):
+      size, rows = b.m, b.asList()
+    else:
+      raise TypeError("Argument should be a Vector or a Matrix.")
+    n, t = self._rowsCount, self._tileSize
+    if size != n:
+      raise MatrixError("Linear system can't be solved. Sizes are inconsistent")
+    lu, pivots, singular = self._luFactor()
+    try:
+      if singular:
+        raise MatrixError("Linear system can't be solved. Matrix is singular")
+      _swapRows(rows, pivots, 0)
+      for J in range(lu.tilesCount[1]):
+        start, stop = J*t, min((J+1)*t, n)
+        lower = lu._panel(J)
+        _swapRows(lower, pivots, stop)
+        _solveBlock(rows, lower, start, stop, True)
+        _subtractProduct(rows, lower, range(stop, n), range(start, stop), self._backend)
+      for J in reversed(range(lu.tilesCount[1])):
+        start, stop = J*t, min((J+1)*t, n)
+        upper = lu._panel(J)
+        _solveBlock(rows, upper, start, stop, False)
+        _subtractProduct(rows, upper, range(start), range(start, stop), self._backend)
+    finally:
+      lu.close()
+    if isinstance(b, Vector):
+      return Vector._fromFlat([row[0] for row in rows], b.backend)
+    return Matrix._fromFlat(n, b.n, [x for row in rows for x in row], b.backend)
+  
+  def _luFactor(self):
+    """
+      Get left-looking LU factorization with partial pivoting by columns of tiles (panels): P*A == L*U.
+      Returns tuple (lu, pivots, singular): lu is a temporary TiledMatrix holding L below the diagonal
+      (unit diagonal is implied) and U on and above it, row k was swapped with row pivots[k].
+      Panel of L is stored with swaps of previous panels and its own ones applied, swaps of next panels
+      are applied after reading it. Singular columns are skipped.
+    """
+    n, t = self._rowsCount, self._tileSize
+    lu = self._newResult(n, n)
+    pivots = []
+    singular = False
+    for K in range(self.tilesCount[1]):
+      panel = self._panel(K)
+      _swapRows(panel, pivots, 0)
+      for J in range(K):
+        start, stop = J*t, (J+1)*t
+        lower = lu._panel(J)
+        _swapRows(lower, pivots, stop)
+        _solveBlock(panel, lower, start, stop, True)
+        _subtractProduct(panel, lower, range(stop, n), range(start, stop), self._backend)
+      for j in range(len(panel[0])):
+        k = K*t + j
+        p = max(range(k, n), key=lambda i: abs(panel[i][j]))
+        if panel[p][j] == 0:
+          pivots.append(k)
+          singular = True
+          continue
+        pivots.append(p)
+        panel[k], panel[p] = panel[p], panel[k]
+        pivotRow = panel[k]
+        pivot = pivotRow[j]
+        for i in range(k+1, n):
+          row = panel[i]
+          factor = row[j] / pivot
+          row[j] = factor
+          if factor != 0:
+            for jj in range(j+1, len(row)):
+              row[jj] -= factor * pivotRow[jj]
+      lu._putPanel(K, panel)
+    return lu, pivots, singular
+  
+  
+  #==================
+  #  Representation 
+  #==================
+  
+  def __repr__(self):
+    """Get string to represent tiled matrix by repr()"""
+    return "TiledMatrix({0!r}, {1}, {2}, tileSize={3})".format(self._path, self._rowsCount, self._columnsCount, self._tileSize)
+  
+  
+  #===============
+  #  Items access 
+  #===============
+  
+  def __getitem__(self, key):
+    """Get component by index (tuple)"""
+    I, i, J, j = self._locate(key)
+    return self._tile(I, J)[i, j]
+  
+  def __setitem__(self, key, value):
+    """Modify component by index (tuple)"""
+    I, i, J, j = self._locate(key)
+    tile = self._tile(I, J)
+    tile[i, j] = value
+    self._cache[(I, J)][1] = True
+  
+  def _locate(self, key):
+    """Get tuple (I, i, J, j): component (i, j) of tile in row I and column J of tiles"""
+    if isinstance(key, slice):
+      raise TypeError("Can't get item by slice")
+    if not isinstance(key, (tuple, list)):
+      raise TypeError("Index should be a tuple")
+    if len(key) != 2:
+      raise ValueError("Tuple length should be 2. {0} passed instead".format(len(key)))
+    i, j = key
+    if not (-self._rowsCount <= i < self._rowsCount and -self._columnsCount <= j < self._columnsCount):
+      raise IndexError("Matrix index out of range")
+    I, i = divmod(i % self._rowsCount, self._tileSize)
+    J, j = divmod(j % self._columnsCount, self._tileSize)
+    return I, i, J, j
+  
+  
+  #============
+  #  Operators 
+  #============
+  
+  def __add__(self, other):
+    """Add tiled matrix to tiled matrix tile by tile"""
+    if not isinstance(other, TiledMatrix):
+      return NotImplemented
+    if self.size != other.size:
+      raise MatrixError("Trying to add matrixes of different size")
+    return self._combine(other, add)
+  
+  def __sub__(self, other):
+    """Subtract tiled matrix from tiled matrix tile by tile"""
+    if not isinstance(other, TiledMatrix):
+      return NotImplemented
+    if self.size != other.size:
+      raise MatrixError("Trying to substract matrixes of different size")
+    return self._combine(other, sub)
+  
+  def _combine(self, other, op):
+    """Get TiledMatrix with op applied to pairs of tiles"""
+    if self._tileSize != other._tileSize:
+      raise MatrixError("Tiled matrices should have equal tile sizes")
+    res = self._newResult(self._rowsCount, self._columnsCount)
+    for I, J in self._tiles():
+      res._writeTile(I, J, op(self._tile(I, J), other._tile(I, J)))
+    return res
+  
+  def __mul__(self, other):
+    """
+      Multiply tiled matrix to tiled matrix (TiledMatrix is returned), to in-memory Matrix or Vector
+      (Matrix is returned, as for Matrix) or to scalar tile by tile
+    """
+    t = self._tileSize
+    rows, cols = self.tilesCount
+    if isinstance(other, TiledMatrix):
+      if self._columnsCount != other._rowsCount:
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      if t != other._tileSize:
+        raise MatrixError("Tiled matrices should have equal tile sizes")
+      res = self._newResult(self._rowsCount, other._columnsCount)
+      for I, J in res._tiles():
+        acc = self._tile(I, 0)*other._tile(0, J)
+        for K in range(1, cols):
+          acc += self._tile(I, K)*other._tile(K, J)
+        res._writeTile(I, J, acc)
+      return res
+    if isinstance(other, (Matrix, Vector)):
+      if self._columnsCount != (other.m if isinstance(other, Matrix) else other.size):
+        raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+      vals = []
+      for I in range(rows):
+        acc = None
+        for J in range(cols):
+          stop = J*t + self._tileShape(I, J)[1]
+          part = other.getSubmatrix(J*t, stop, 0, other.n) if isinstance(other, Matrix) else other[J*t:stop]
+          acc = self._tile(I, J)*part if acc is None else acc + self._tile(I, J)*part
+        vals.extend(acc._vals)
+      return Matrix._fromFlat(self._rowsCount, len(vals) // self._rowsCount, vals, other.backend)
+    try:
+      factor = float(other)
+    except:
+      return NotImplemented
+    res = self._newResult(self._rowsCount, self._columnsCount)
+    for I, J in self._tiles():
+      res._writeTile(I, J, self._tile(I, J)*factor)
+    return res
+  
+  def __rmul__(self, other):
+    """Multiply scalar to tiled matrix"""
+    try:
+      return self*float(other)
+    except:
+      return NotImplemented
+
+class VectorArray(object):
+  """
+    class VectorArray(object):
+
+    Array of vectors of the same size for batched operations.
+    All components are stored row by row in one flat array.array('d'),
+    component k of vector i has index i*dim + k.
+    Batched operations work on whole array and don't create Vector for each row.
+
+    Constructors:
+      VectorArray(int, int) -> array of specified number of zero vectors with specified size
+      VectorArray(iterable) -> array of vectors from any iterable of Vectors or iterables, i.e. list
+
+    Optional keyword argument backend ("python" or "numpy") selects storage of components.
+    Module-wide default is used if it is omitted (see setBackend).
+  """
+  
+  __slots__ = ("_count", "_dim", "_vals")
+  
+  def __init__(self, *args, **kwargs):
+    """
+      VectorArray constructor
+
+      VectorArray(int, int) -> array of specified number of zero vectors with specified size
+      VectorArray(iterable) -> array of vectors from any iterable of Vectors or iterables, i.e. list
+    """
+    backend = kwargs.pop("backend", None)
+    if kwargs:
+      raise TypeError("Unexpected keyword arguments: {0}".format(", ".join(kwargs)))
+    useNumpy = _resolveBackend(backend) == "numpy"
+    if len(args) == 2:
+      if (isinstance(args[0], numbers.Integral) and args[0] > 0 and
+          isinstance(args[1], numbers.Integral) and args[1] > 0):
+        self._count = args[0]
+        self._dim = args[1]
+        self._vals = numpy.zeros(self._count*self._dim) if useNumpy else array('d', [0.])*(self._count*self._dim)
+      else:
+        raise ValueError("Two arguments passed. Both should be an int > 0. {0} and {1} passed instead".format(args[0], args[1]))
+    elif len(args) == 1:
+      if isinstance(args[0], _TEXT_TYPES):
+        raise TypeError("Argument should be an iterable of vectors. {0} passed instead".format(args[0]))
+      vals = array('d')
+      count = 0
+      dim = None
+      try:
+        for item in args[0]:
+          if isinstance(item, Vector):
+            vals.extend(array('d', item._vals) if isinstance(item._vals, _ndarray) else item._vals)
+            size = len(item)
+          else:
+            row = [float(x) for x in item]
+            vals.extend(row)
+            size = len(row)
+          if dim is None:
+            dim = size
+          elif size != dim:
+            raise VectorError("Can't create array of vectors of different size")
+          count += 1
+      except VectorError:
+        raise
+      except:
+        raise VectorError("Can't create array of vectors.")
+      if count == 0 or dim == 0:
+        raise VectorError("Array size and vector size should be positive.")
+      self._count = count
+      self._dim = dim
+      self._vals = numpy.array(vals, dtype=float) if useNumpy else vals
+    else:
+      raise TypeError("Wrong numbers of arguments. Should be 1 or 2. {0} passed".format(len(args)))
+  
+  
+  #=============
+  #  Properties 
+  #=============
+  
+  @property
+  def count(self):
+    """int: read-only number of vectors.\nvectors.count <==> len(vectors)"""
+    return self._count
+  
+  @property
+  def dim(self):
+    """int: read-only size of each vector"""
+    return self._dim
+  
+  @property
+  def backend(self):
+    """str: read-only storage backend ("python" or "numpy")"""
+    return "numpy" if isinstance(self._vals, _ndarray) else "python"
+  
+  
+  #=================
+  #  Static methods 
+  #=================
+  
+  @staticmethod
+  def _fromFlat(count, dim, vals, backend):
+    """Get VectorArray with components from flat sequence of numbers (not validated)"""
+    res = VectorArray.__new__(VectorArray)
+    res._count = count
+    res._dim = dim
+    if _resolveBackend(backend) == "numpy":
+      res._vals = numpy.array(vals, dtype=float)
+    else:
+      res._vals = array('d', vals)
+    return res
+
+  @staticmethod
+  def _adopt(count, dim, vals):
+    """Get VectorArray which takes ownership of flat array('d') or numpy.ndarray of floats (not validated, not copied)"""
+    res = VectorArray.__new__(VectorArray)
+    res._count = count
+    res._dim = dim
+    res._vals = vals
+    return res
+  
+  
+  #============
+  #  Get parts 
+  #============
+  
+  def asVectors(self):
+    """Get list of Vectors"""
+    return [self[i] for i in range(self._count)]
+  
+  def asList(self):
+    """Get list of vectors, where each vector is list of components"""
+    d = self._dim
+    return [self._vals[i:i+d].tolist() for i in range(0, len(self._vals), d)]
+  
+  
+  #=================
+  #  Linear algebra 
+  #=================
+  
+  def dot(self, other):
+    """Get Vector of dot products of each vector and corresponding vector of other VectorArray (or passed Vector)"""
+    b = self._operand(other)
+    if isinstance(self._vals, _ndarray):
+      return Vector._adopt((self._vals*b).reshape(self._count, self._dim).sum(axis=1))
+    a = self._vals
+    d = self._dim
+    res = map(mul, a[0::d], b[0::d])
+    for k in range(1, d):
+      res = list(map(add, res, map(mul, a[k::d], b[k::d])))
+    return Vector._fromFlat(res, "python")
+  
+  def cross(self, other):
+    """Get VectorArray of cross products of each vector and corresponding vector of other VectorArray (or passed Vector). Works only with vectors of size 3."""
+    if self._dim != 3:
+      raise NotImplementedError("Cross product is defined only for vectors of size 3. These vectors have size {0}".format(self._dim))
+    b = self._operand(other)
+    if isinstance(self._vals, _ndarray):
+      res = numpy.cross(self._vals.reshape(self._count, 3), b.reshape(self._count, 3))
+      return VectorArray._adopt(self._count, 3, res.ravel())
+    a = self._vals
+    ax, ay, az = a[0::3], a[1::3], a[2::3]
+    bx, by, bz = b[0::3], b[1::3], b[2::3]
+    res = array('d', [0.])*len(a)
+    res[0::3] = array('d', map(sub, map(mul, ay, bz), map(mul, az, by)))
+    res[1::3] = array('d', map(sub, map(mul, az, bx), map(mul, ax, bz)))
+    res[2::3] = array('d', map(sub, map(mul, ax, by), map(mul, ay, bx)))
+    return VectorArray._fromFlat(self._count, 3, res, "python")
+  
+  def norm(self):
+    """Get Vector of magnitudes (Euclidean norms) of each vector"""
+    squares = self.dot(self)
+    if isinstance(squares._vals, _ndarray):
+      return Vector._adopt(numpy.sqrt(squares._vals))
+    return Vector._fromFlat(map(math.sqrt, squares._vals), "python")
+  
+  def normalize(self):
+    """Get VectorArray of normalized vectors"""
+    norms = self.norm()._vals
+    d = self._dim
+    if isinstance(self._vals, _ndarray):
+      if not norms.all():
+        raise ZeroDivisionError("Can't normalize zero vector")
+      return VectorArray._adopt(self._count, d, (self._vals.reshape(self._count, d) / norms[:, None]).ravel())
+    factors = [1./x for x in norms]
+    res = array('d', self._vals)
+    for k in range(d):
+      res[k::d] = array('d', map(mul, res[k::d], factors))
+    return VectorArray._fromFlat(self._count, d, res, "python")
+  
+  def add(self, other):
+    """Get VectorArray of sums of each vector and corresponding vector of other VectorArray (or passed Vector)"""
+    b = self._operand(other)
+    if isinstance(self._vals, _ndarray):
+      return VectorArray._adopt(self._count, self._dim, self._vals + b)
+    return VectorArray._fromFlat(self._count, self._dim, map(add, self._vals, b), "python")
+  
+  def scale(self, factor):
+    """Get VectorArray of vectors multiplied to scalar"""
+    factor = float(factor)
+    if isinstance(self._vals, _ndarray):
+      return VectorArray._adopt(self._count, self._dim, self._vals*factor)
+    return VectorArray._fromFlat(self._count, self._dim, [x*factor for x in self._vals], "python")
+  
+  def _operand(self, other):
+    """Get flat components of other operand of batched operation. Passed Vector is repeated for each vector"""
+    if isinstance(other, VectorArray):
+      if (self._count, self._dim) != (other._count, other._dim):
+        raise VectorError("Can't operate on arrays of vectors of different size")
+      vals = other._vals
+    elif isinstance(other, Vector):
+      if self._dim != len(other):
+        raise VectorError("Can't operate on vectors of different size")
+      # Vector views (rows, columns, slices of matrices) hold _View storage, which is materialised here
+      vals = numpy.tile(other._vals, self._count) if isinstance(other._vals, _ndarray) else array('d', other._vals)*self._count
+    else:
+      raise TypeError("Argument should be a VectorArray or a Vector.")
+    if isinstance(self._vals, _ndarray):
+      return numpy.asarray(vals, dtype=float)
+    return vals
+  
+  
+  #=================
+  #  Representation 
+  #=================
+  
+  def __str__(self):
+    """Get string to print array of vectors by str()"""
+    return repr(self.asList())
+  
+  def __repr__(self):
+    """Get string to represent array of vectors by repr()"""
+    return "VectorArray(" + repr(self.asList()) + ")"
+  
+  
+  #===============
+  #  Items access 
+  #===============
+  
+  def __len__(self):
+    """Get number of vectors by len()"""
+    return self._count
+  
+  def __iter__(self):
+    """Get iterator over the vectors"""
+    return iter(self.asVectors())
+  
+  def __getitem__(self, key):
+    """Get Vector by index"""
+    if not isinstance(key, numbers.Integral):
+      raise TypeError("Index should be an int")
+    if not -self._count <= key < self._count:
+      raise IndexError("VectorArray index out of range")
+    start = (key % self._count) * self._dim
+    return Vector._fromFlat(self._vals[start:start+self._dim], self.backend)
+  
+  def __setitem__(self, key, value):
+    """Modify vector by index"""
+    if not isinstance(key, numbers.Integral):
+      raise TypeError("Index should be an int")
+    if not -self._count <= key < self._count:
+      raise IndexError("VectorArray index out of range")
+    row = [float(x) for x in value]
+    if len(row) != self._dim:
+      raise VectorError("Can't set vector of different size")
+    start = (key % self._count) * self._dim
+    self._vals[start:start+self._dim] = numpy.array(row) if isinstance(self._vals, _ndarray) else array('d', row)
+  
+  
+  #============
+  #  Operators 
+  #============
+  
+  def __eq__(self, other):
+    """Check for equality"""
+    if not isinstance(other, VectorArray):
+      return False
+    if (self._count, self._dim) != (other._count, other._dim):
+      return False
+    if isinstance(self._vals, _ndarray) or isinstance(other._vals, _ndarray):
+      return numpy.array_equal(self._vals, other._vals)
+    return self._vals == other._vals
+  
+  def __ne__(self, other):
+    """Check for non-equality"""
+    return not self.__eq__(other)
+  
+  def __add__(self, other):
+    """Add array of vectors (or Vector) to array of vectors"""
+    if not isinstance(other, (VectorArray, Vector)):
+      return NotImplemented
+    return self.add(other)
+  
+  def __mul__(self, other):
+    """Multiply array of vectors to scalar"""
+    try:
+      return self.scale(float(other))
+    except:
+      return NotImplemented
+  
+  def __rmul__(self, other):
+    """Multiply scalar to array of vectors"""
+    return self.__mul__(other)
+
+
+class Expression(object):
+  """
+    class Expression(object):
+
+    Node of lazily evaluated arithmetic on vectors and matrices. Operators (+, -, *, /)
+    on expressions build expression graph instead of computing intermediate results.
+    Value is computed by evaluate(): chains of matrix products are multiplied in optimal
+    order, sums and scalings of operands are fused into one pass, so only the final
+    result (and results of products) are allocated.
+    Operands are referenced, not copied: changes of them before evaluate() are visible.
+
+    Constructors:
+      Expression(Vector or Matrix) -> expression with one operand
+      vector.lazy(), matrix.lazy() -> the same
+  """
+  
+  __slots__ = ("_op", "_args", "_shape")
+  
+  def __init__(self, value):
+    """
+      Expression constructor
+
+      Expression(Vector or Matrix) -> expression with one operand
+    """
+    if isinstance(value, Matrix):
+      self._shape = value.size
+    elif isinstance(value, Vector):
+      self._shape = (value.size,)
+    else:
+      raise TypeError("Argument should be a Vector or a Matrix. {0} passed instead".format(type(value)))
+    self._op = "leaf"
+    self._args = (value,)
+  
+  @staticmethod
+  def _node(op, args, shape):
+    """Get expression node (not validated)"""
+    res = Expression.__new__(Expression)
+    res._op = op
+    res._args = args
+    res._shape = shape
+    return res
+  
+  @staticmethod
+  def _wrap(other):
+    """Get Expression for operand (Expression, Vector or Matrix), None for anything else"""
+    if isinstance(other, Expression):
+      return other
+    if isinstance(other, (Vector, Matrix)):
+      return Expression(other)
+    return None
+  
+  
+  #============
+  #  Evaluate 
+  #============
+  
+  def evaluate(self):
+    """Compute value of expression: Matrix, Vector or float"""
+    res = self._evaluate()
+    if self._op == "leaf":
+      return +res
+    return res
+  
+  def _evaluate(self):
+    """Compute value of expression (operand itself for leaf)"""
+    op = self._op
+    if op == "leaf":
+      return self._args[0]
+    if op in ("add", "sub", "neg", "scale"):
+      return self._evaluateSum()
+    if op == "mul":
+      return self._evaluateChain()
+    if op == "dot":
+      return self._args[0]._evaluate().dot(self._args[1]._evaluate())
+    if op == "col":
+      value = self._args[0]._evaluate()
+      return Matrix._fromFlat(value.size, 1, value._vals, value.backend)
+    if op == "row":
+      value = self._args[0]._evaluate()
+      return Matrix._fromFlat(1, value.size, value._vals, value.backend)
+    raise ValueError("Unknown expression '{0}'".format(op))
+  
+  def _terms(self, coefficient=1.):
+    """Get list of (coefficient, node) of linear combination (sum and scaling) equal to expression"""
+    op, args = self._op, self._args
+    if op == "add":
+      return args[0]._terms(coefficient) + args[1]._terms(coefficient)
+    if op == "sub":
+      return args[0]._terms(coefficient) + args[1]._terms(-coefficient)
+    if op == "neg":
+      return args[0]._terms(-coefficient)
+    if op == "scale":
+      factor = float(args[0]._evaluate()) if isinstance(args[0], Expression) else args[0]
+      return args[1]._terms(coefficient*factor)
+    return [(coefficient, self)]
+  
+  def _evaluateSum(self):
+    """Compute linear combination of operands in one pass"""
+    nodes, coefficients = [], []
+    for coefficient, node in self._terms():
+      for k, other in enumerate(nodes):
+        if other is node:
+          coefficients[k] += coefficient
+          break
+      else:
+        nodes.append(node)
+        coefficients.append(coefficient)
+    values = [node._evaluate() for node in nodes]
+    if not self._shape:
+      return sum(map(mul, coefficients, values))
+    if isinstance(values[0]._vals, _ndarray):
+      flat = sum(c*numpy.asarray(value._vals) for c, value in zip(coefficients, values))
+      backend = "numpy"
+    else:
+      operands = [value._vals for value in values]
+      if all(c == 1 for c in coefficients):
+        flat = [sum(xs) for xs in zip(*operands)]
+      else:
+        flat = [sum(map(mul, coefficients, xs)) for xs in zip(*operands)]
+      backend = "python"
+    if len(self._shape) == 1:
+      return Vector._fromFlat(flat, backend)
+    return Matrix._fromFlat(self._shape[0], self._shape[1], flat, backend)
+  
+  def _factors(self):
+    """Get list of nodes which product (in this order) is equal to expression"""
+    if self._op == "mul":
+      return self._args[0]._factors() + self._args[1]._factors()
+    return [self]
+  
+  def _evaluateChain(self):
+    """Compute product of matrix chain using optimal parenthesization"""
+    factors = self._factors()
+    dims = [node._shape[0] for node in factors] + [factors[-1]._shape[1]]
+    split = _chainOrder(dims)
+    values = [node._evaluate() for node in factors]
+    def product(i, j):
+      if i == j:
+        return values[i]
+      return product(i, split[i][j]) * product(split[i][j] + 1, j)
+    return product(0, len(factors) - 1)
+  
+  
+  #=================
+  #  Representation 
+  #=================
+  
+  def __repr__(self):
+    """Get string to represent expression by repr()"""
+    op, args = self._op, self._args
+    if op == "leaf":
+      if isinstance(args[0], Matrix):
+        return "Matrix<{0}x{1}>".format(*self._shape)
+      return "Vector<{0}>".format(self._shape[0])
+    if op in ("add", "sub", "mul", "dot"):
+      sign = {"add": "+", "sub": "-", "mul": "*", "dot": "*"}[op]
+      return "({0!r} {1} {2!r})".format(args[0], sign, args[1])
+    if op == "neg":
+      return "-{0!r}".format(args[0])
+    if op == "scale":
+      return "{0!r} * {1!r}".format(args[0], args[1])
+    return repr(args[0])
+  
+  
+  #============
+  #  Operators 
+  #============
+  
+  def __pos__(self):
+    """Get the same expression"""
+    return self
+  
+  def __neg__(self):
+    """Get negative expression"""
+    return Expression._node("neg", (self,), self._shape)
+  
+  def __add__(self, other):
+    """Get expression of sum"""
+    other = Expression._wrap(other)
+    if other is None:
+      return NotImplemented
+    self._checkSameShape(other, "add")
+    return Expression._node("add", (self, other), self._shape)
+  
+  def __radd__(self, other):
+    """Get expression of sum (0 + expression is expression itself, to support sum function)"""
+    if isinstance(other, numbers.Integral) and other == 0:
+      return self
+    other = Expression._wrap(other)
+    if other is None:
+      return NotImplemented
+    return other + self
+  
+  def __sub__(self, other):
+    """Get expression of difference"""
+    other = Expression._wrap(other)
+    if other is None:
+      return NotImplemented
+    self._checkSameShape(other, "substract")
+    return Expression._node("sub", (self, other), self._shape)
+  
+  def __rsub__(self, other):
+    """Get expression of difference"""
+    other = Expression._wrap(other)
+    if other is None:
+      return NotImplemented
+    return other - self
+  
+  def __mul__(self, other):
+    """Get expression of product with scalar, Vector, Matrix or Expression"""
+    wrapped = Expression._wrap(other)
+    if wrapped is None:
+      try:
+        factor = float(other)
+      except:
+        return NotImplemented
+      return Expression._node("scale", (factor, self), self._shape)
+    return Expression._product(self, wrapped)
+  
+  def __rmul__(self, other):
+    """Get expression of product of scalar, Vector or Matrix and expression"""
+    wrapped = Expression._wrap(other)
+    if wrapped is None:
+      return self.__mul__(other)
+    return Expression._product(wrapped, self)
+  
+  def __truediv__(self, other):
+    """Get expression of division by scalar"""
+    try:
+      return self*(1.0/float(other))
+    except ZeroDivisionError:
+      raise
+    except:
+      return NotImplemented
+  
+  __div__ = __truediv__
+  
+  def _checkSameShape(self, other, action):
+    """Raise error if expressions can't be added"""
+    if self._shape != other._shape:
+      if len(self._shape) == 2 and len(other._shape) == 2:
+        raise MatrixError("Trying to {0} matrixes of different size".format(action))
+      if len(self._shape) == 1 and len(other._shape) == 1:
+        raise VectorError("Can't {0} vectors of different size".format(action))
+      raise TypeError("Can't {0} expressions of {1} and {2}".format(action, self, other))
+  
+  @staticmethod
+  def _product(left, right):
+    """
+      Get expression of product (same rules as for Vector and Matrix operators).
+      Scalar expression (i.e. dot product) is kept as factor of "scale" node and evaluated with it
+    """
+    if not left._shape:
+      return Expression._node("scale", (left, right), right._shape)
+    if not right._shape:
+      return Expression._node("scale", (right, left), left._shape)
+    if len(left._shape) == 1 and len(right._shape) == 1:
+      if left._shape != right._shape:
+        raise VectorError("Can't multiply (dot product) vectors of different size")
+      return Expression._node("dot", (left, right), ())
+    if len(left._shape) == 1:
+      left = Expression._node("row", (left,), (1, left._shape[0]))
+    if len(right._shape) == 1:
+      right = Expression._node("col", (right,), (right._shape[0], 1))
+    if left._shape[1] != right._shape[0]:
+      raise MatrixError("Matrices cannot be multipled. Sizes are inconsistent")
+    return Expression._node("mul", (left, right), (left._shape[0], right._shape[1]))
+
+def _chainOrder(dims):
+  """
+    Optimal parenthesization of matrix chain, where matrix i has size dims[i] x dims[i+1].
+    Returns table split: product of matrices i..j is (i..split[i][j]) * (split[i][j]+1..j). O(k^3)
+  """
+  count = len(dims) - 1
+  cost = [[0]*count for i in range(count)]
+  split = [[0]*count for i in range(count)]
+  for length in range(1, count):
+    for i in range(count - length):
+      j = i + length
+      cost[i][j] = None
+      for s in range(i, j):
+        c = cost[i][s] + cost[s+1][j] + dims[i]*dims[s+1]*dims[j+1]
+        if cost[i][j] is None or c < cost[i][j]:
+          cost[i][j] = c
+          split[i][j] = s
+  return split
+
+def _mulFlat(a, b, m, k, n, blockSize=_MUL_BLOCK_SIZE):
+  """
+    Multiplication kernel for flat row-major matrices a (m x k) and b (k x n).
+    Returns flat list of components of a*b.
+    The right operand is transposed once (strided slices are its columns),
+    so every component of the result is a dot product of two contiguous
+    sequences. The result is filled tile by tile (blockSize x blockSize),
+    so a block of columns of b is reused for a block of rows of a while
+    it is still hot.
+  """
+  rows = [a[i:i+k] for i in range(0, m*k, k)]
+  cols = [b[j::n] for j in range(n)]
+  res = [0.]*(m*n)
+  for i0 in range(0, m, blockSize):
+    rowsA = rows[i0:i0+blockSize]
+    for j0 in range(0, n, blockSize):
+      colsB = cols[j0:j0+blockSize]
+      for i, rowA in enumerate(rowsA, i0):
+        start = i*n + j0
+        res[start:start+len(colsB)] = [sum(map(mul, rowA, col)) for col in colsB]
+  return res
+
+def _mulStrassen(a, b, m, k, n, crossover):
+  """
+    Strassen-Winograd multiplication of flat row-major matrices a (m x k) and b (k x n).
+    Returns flat list of components of a*b.
+  """
+  rowsA = [list(a[i:i+k]) for i in range(0, m*k, k)]
+  rowsB = [list(b[i:i+n]) for i in range(0, k*n, n)]
+  return [x for row in _strassenRows(rowsA, rowsB, crossover) for x in row]
+
+def _strassenRows(a, b, crossover):
+  """
+    Strassen-Winograd recursion for matrices given as lists of rows: 7 half-size products
+    and 15 additions per level. Odd dimensions are padded with zero row or column.
+    Below crossover size the classical kernel is used.
+  """
+  m, k, n = len(a), len(b), len(b[0])
+  if min(m, k, n) <= crossover:
+    flat = _mulFlat([x for row in a for x in row], [x for row in b for x in row], m, k, n)
+    return [flat[i:i+n] for i in range(0, m*n, n)]
+  if m % 2 or k % 2 or n % 2:
+    a = [row + [0.]*(k % 2) for row in a] + [[0.]*(k + k % 2)]*(m % 2)
+    b = [row + [0.]*(n % 2) for row in b] + [[0.]*(n + n % 2)]*(k % 2)
+    return [row[:n] for row in _strassenRows(a, b, crossover)[:m]]
+  mh, kh, nh = m // 2, k // 2, n // 2
+  plus = lambda x, y: [list(map(add, r, s)) for r, s in zip(x, y)]
+  minus = lambda x, y: [list(map(sub, r, s)) for r, s in zip(x, y)]
+  a11, a12 = [row[:kh] for row in a[:mh]], [row[kh:] for row in a[:mh]]
+  a21, a22 = [row[:kh] for row in a[mh:]], [row[kh:] for row in a[mh:]]
+  b11, b12 = [row[:nh] for row in b[:kh]], [row[nh:] for row in b[:kh]]
+  b21, b22 = [row[:nh] for row in b[kh:]], [row[nh:] for row in b[kh:]]
+  s1 = plus(a21, a22)
+  s2 = minus(s1, a11)
+  s3 = minus(a11, a21)
+  s4 = minus(a12, s2)
+  t1 = minus(b12, b11)
+  t2 = minus(b22, t1)
+  t3 = minus(b22, b12)
+  t4 = minus(t2, b21)
+  p1 = _strassenRows(a11, b11, crossover)
+  p2 = _strassenRows(a12, b21, crossover)
+  p3 = _strassenRows(s4, b22, crossover)
+  p4 = _strassenRows(a22, t4, crossover)
+  p5 = _strassenRows(s1, t1, crossover)
+  p6 = _strassenRows(s2, t2, crossover)
+  p7 = _strassenRows(s3, t3, crossover)
+  u2 = plus(p1, p6)
+  u3 = plus(u2, p7)
+  c11 = plus(p1, p2)
+  c12 = plus(plus(u2, p5), p3)
+  c21 = minus(u3, p4)
+  c22 = plus(u3, p5)
+  return [r + s for r, s in zip(c11, c12)] + [r + s for r, s in zip(c21, c22)]
+
+
+
+#========
+#  Views 
+#========
+
+class _View(object):
+  """
+    Flat row-major sequence of components of window (rows x cols) of parent storage without copying:
+    component k = i*cols + j is base[offset + i*rowStride + j*colStride].
+    Used as storage of views (rows, columns, slices, submatrices) of vectors and matrices which
+    components are not a single strided run of numpy.ndarray. Slices of view are copies (array('d')).
+  """
+  
+  __slots__ = ("_base", "_offset", "_rows", "_cols", "_rowStride", "_colStride")
+  
+  def __init__(self, base, offset, rows, cols, rowStride, colStride):
+    self._base = base
+    self._offset = offset
+    self._rows = rows
+    self._cols = cols
+    self._rowStride = rowStride
+    self._colStride = colStride
+  
+  def _at(self, k):
+    """Get index in parent storage of component k"""
+    i, j = divmod(k, self._cols)
+    return self._offset + i*self._rowStride + j*self._colStride
+  
+  def _rowSlice(self, i):
+    """Get slice of parent storage with components of row i (colStride should be positive)"""
+    start = self._offset + i*self._rowStride
+    return slice(start, start + (self._cols - 1)*self._colStride + 1, self._colStride)
+  
+  def tolist(self):
+    """Get list of components"""
+    return self[:].tolist()
+  
+  def __len__(self):
+    """Get number of components"""
+    return self._rows*self._cols
+  
+  def __iter__(self):
+    """Get iterator over the components"""
+    return iter(self[:])
+  
+  def __getitem__(self, key):
+    """Get component by index or array('d') of components by slice"""
+    if not isinstance(key, slice):
+      if not -len(self) <= key < len(self):
+        raise IndexError("View index out of range")
+      return self._base[self._at(key % len(self))]
+    start, stop, step = key.indices(len(self))
+    if step > 0 and self._colStride > 0:
+      if self._rows == 1:
+        cs = self._colStride
+        res = self._base[self._offset + start*cs:self._offset + stop*cs:step*cs]
+        return res if isinstance(res, array) else array('d', res)
+      if step == 1:
+        res = array('d')
+        while start < stop:
+          i, j = divmod(start, self._cols)
+          count = min(stop - start, self._cols - j)
+          row = self._rowSlice(i)
+          res.extend(self._base[row.start + j*self._colStride:row.start + (j + count)*self._colStride:self._colStride])
+          start += count
+        return res
+    return array('d', [self._base[self._at(k)] for k in range(start, stop, step)])
+  
+  def __setitem__(self, key, value):
+    """Modify component in parent storage by index or slice"""
+    if not isinstance(key, slice):
+      if not -len(self) <= key < len(self):
+        raise IndexError("View index out of range")
+      self._base[self._at(key % len(self))] = value
+      return
+    indexes = range(*key.indices(len(self)))
+    if len(indexes) != len(value):
+      raise ValueError("Can't assign sequence of size {0} to slice of size {1}".format(len(value), len(indexes)))
+    for k, x in zip(indexes, value):
+      self._base[self._at(k)] = x
+  
+  def __eq__(self, other):
+    """Check for equality of components with any sequence"""
+    return list(self) == list(other)
+  
+  def __ne__(self, other):
+    """Check for non-equality"""
+    return not self.__eq__(other)
+
+def _makeView(base, offset, rows, cols, rowStride, colStride):
+  """
+    Get flat storage sharing components of window of base: 1-D slice (view) of numpy.ndarray
+    if window is a single strided run, otherwise _View
+  """
+  if isinstance(base, _View):
+    return _makeView(base._base, base._offset + offset, rows, cols, rowStride, colStride)
+  if isinstance(base, _ndarray) and (rows == 1 or rowStride == cols*colStride):
+    stop = offset + (rows*cols - 1)*colStride + (1 if colStride > 0 else -1)
+    return base[offset:(stop if stop >= 0 else None):colStride]
+  return _View(base, offset, rows, cols, rowStride, colStride)
+
+def _strides(vals, n):
+  """Get (rowStride, colStride) of storage of matrix with n columns (in parent storage for _View)"""
+  if isinstance(vals, _View):
+    return (vals._rowStride, vals._colStride)
+  return (n, 1)
+
+def _storageBase(vals):
+  """Get storage which components are stored in (parent storage for _View)"""
+  return vals._base if isinstance(vals, _View) else vals
+
+
+#=================
+#  Out-of-core LU 
+#=================
+
+def _temporaryPath(directory):
+  """Get path of new empty temporary file in directory (system default if None)"""
+  import tempfile
+  handle, path = tempfile.mkstemp(suffix=".tiles", dir=directory)
+  os.close(handle)
+  return path
+
+def _swapRows(rows, pivots, start):
+  """Apply row swaps pivots[start:] (row k is swapped with row pivots[k]) to list of rows in place"""
+  for k in range(start, len(pivots)):
+    p = pivots[k]
+    if p != k:
+      rows[k], rows[p] = rows[p], rows[k]
+
+def _solveBlock(rows, coefficients, start, stop, lower):
+  """
+    Solve triangular system for rows start..stop-1 of list of rows in place. Coefficients (list of rows,
+    column c holds coefficient of row start+c) hold unit lower triangle if lower, otherwise upper triangle
+  """
+  for i in (range(start, stop) if lower else reversed(range(start, stop))):
+    c = coefficients[i]
+    row = rows[i]
+    for k in (range(start, i) if lower else range(i+1, stop)):
+      factor = c[k-start]
+      if factor != 0:
+        row = list(map(sub, row, [factor*x for x in rows[k]]))
+    rows[i] = row if lower else [x / c[i-start] for x in row]
+
+def _subtractProduct(rows, coefficients, target, source, backend):
+  """
+    Subtract products of coefficients (list of rows, column c holds coefficient of row source[c]) and rows
+    in source range from rows in target range of list of rows in place. Product is computed by Matrix
+  """
+  if len(target) == 0:
+    return
+  width = len(rows[source[0]])
+  a = Matrix._fromFlat(len(target), len(source), [x for i in target for x in coefficients[i]], backend)
+  b = Matrix._fromFlat(len(source), width, [x for i in source for x in rows[i]], backend)
+  product = (a*b)._vals
+  for k, i in enumerate(target):
+    rows[i] = list(map(sub, rows[i], product[k*width:(k+1)*width]))
+
+
+#==================
+#  Instrumentation 
+#==================
+
+# Special methods which are not instrumented
+_UNINSTRUMENTED = ("__new__", "__init_subclass__", "__getattribute__", "__getattr__", "__setattr__", "__delattr__",
+                   "__del__", "__reduce__", "__reduce_ex__", "__getstate__", "__setstate__", "__subclasshook__")
+
+# Methods constructing objects of their class (counted as constructed objects while instrumented)
+_CONSTRUCTORS = ("__init__", "_fromFlat", "_adopt", "_like", "_fromCSR", "_node", "Open")
+
+def _instrumentedClasses():
+  """Get public classes which methods and operators are instrumented"""
+  return (Vector, Matrix, DiagonalMatrix, TriangularMatrix, SymmetricMatrix, BandedMatrix, SparseMatrix, TiledMatrix,
+          VectorArray, LUFactorization, CholeskyFactorization, LDLFactorization, Expression)
+
+def _instrumentClasses():
+  """Replace public methods, properties and operators and constructors of public classes by counting wrappers"""
+  for cls in _instrumentedClasses():
+    names = set()
+    for base in cls.__mro__[:-1]:
+      for name, attr in list(base.__dict__.items()):
+        if name in names:
+          continue
+        names.add(name)
+        wrapper = None
+        if name not in _UNINSTRUMENTED and (not name.startswith("_") or name.endswith("__")):
+          key = "{0}.{1}".format(cls.__name__, name)
+          wrapper = _wrapAttribute(attr, lambda func, suffix, key=key: _countingWrapper(key + suffix, func))
+        if name in _CONSTRUCTORS:
+          wrapper = _wrapAttribute(wrapper or attr, lambda func, suffix, cls=cls: _constructingWrapper(cls.__name__, func))
+        if wrapper is not None:
+          _replacedAttributes.append((cls, name, attr if base is cls else None))
+          setattr(cls, name, wrapper)
+
+def _wrapAttribute(attr, wrap):
+  """Get class attribute with functions of method, static method or property wrapped by wrap(func, suffix) (None for others)"""
+  if isinstance(attr, property):
+    return property(attr.fget and wrap(attr.fget, ""), attr.fset and wrap(attr.fset, "="), attr.fdel, attr.__doc__)
+  if isinstance(attr, staticmethod):
+    return staticmethod(wrap(attr.__func__, ""))
+  if isinstance(attr, classmethod):
+    return classmethod(wrap(attr.__func__, ""))
+  if callable(attr) and not isinstance(attr, type):
+    return wrap(attr, "")
+  return None
+
+def _restoreClasses():
+  """Restore original attributes of classes replaced by _instrumentClasses"""
+  while _replacedAttributes:
+    cls, name, original = _replacedAttributes.pop()
+    if original is None:
+      delattr(cls, name)
+    else:
+      setattr(cls, name, original)
+
+def _constructingWrapper(className, func):
+  """Get function calling func and counting constructed object of class className"""
+  @wraps(func)
+  def wrapper(*args, **kwargs):
+    global _objectsConstructed
+    res = func(*args, **kwargs)
+    _objectsConstructed += 1
+    _constructedCounters[className] = _constructedCounters.get(className, 0) + 1
+    return res
+  return wrapper
+
+def _countingWrapper(key, func):
+  """Get function calling func and adding call to counters of operation key"""
+  @wraps(func)
+  def wrapper(*args, **kwargs):
+    objects = _objectsConstructed
+    start = default_timer()
+    try:
+      return func(*args, **kwargs)
+    finally:
+      elapsed = default_timer() - start
+      counters = _operationCounters.get(key)
+      if counters is None:
+        counters = _operationCounters[key] = [0, 0., 0, 0]
+      counters[0] += 1
+      counters[1] += elapsed
+      counters[2] += sum(_componentsCount(arg) for arg in args)
+      counters[3] += _objectsConstructed - objects
+  return wrapper
+
+def _componentsCount(obj):
+  """Get number of components of vector or matrix (0 for other objects or uninitialized ones)"""
+  try:
+    if isinstance(obj, Vector):
+      return len(obj._vals)
+    if isinstance(obj, (Matrix, SparseMatrix, TiledMatrix)):
+      return obj._rowsCount*obj._columnsCount
+    if isinstance(obj, VectorArray):
+      return obj._count*obj._dim
+  except AttributeError:
+    pass
+  return 0
+
+def _subtractCounters(after, before):
+  """Get counters (see getCounters) collected between snapshots before and after"""
+  operations = {}
+  for name, counters in after["operations"].items():
+    previous = before["operations"].get(name)
+    if previous is not None:
+      counters = dict((metric, value - previous[metric]) for metric, value in counters.items())
+    if counters["calls"]:
+      operations[name] = counters
+  constructed = dict((name, value - before["constructed"].get(name, 0)) for name, value in after["constructed"].items())
+  return {"operations": operations, "constructed": dict((name, value) for name, value in constructed.items() if value)}
+
+
+#=====================
+#  Parallel execution 
+#=====================
+
+# Shared arrays of the current pool: operands followed by result (set in worker processes)
+_workerArrays = None
+
+def _isParallel(operations):
+  """Check if operation with specified number of scalar operations should run in worker processes"""
+  return _parallelProcesses > 1 and operations >= _parallelThreshold
+
+def _sharedArray(vals):
+  """Get copy of flat sequence of floats in shared memory"""
+  import ctypes
+  from multiprocessing.sharedctypes import RawArray
+  res = RawArray('d', len(vals))
+  if isinstance(vals, array):
+    ctypes.memmove(res, vals.buffer_info()[0], len(vals)*vals.itemsize)
+  else:
+    res[:] = vals
+  return res
+
+def _initWorker(arrays):
+  """Pool initializer: keep shared arrays inherited from parent process"""
+  global _workerArrays
+  _workerArrays = arrays
+
+def _openPool(processes):
+  """Get persistent pool of worker processes (None if multiprocessing.shared_memory can't be imported)"""
+  try:
+    from multiprocessing import shared_memory
+  except ImportError:
+    return None
+  import multiprocessing
+  if os.name == "posix":
+    # Workers inherit tracker of parent process, so blocks they attach aren't reported as leaked by them
+    from multiprocessing import resource_tracker
+    resource_tracker.ensure_running()
+  return multiprocessing.Pool(processes)
+
+def _closePool():
+  """Stop workers of persistent pool"""
+  global _workerPool
+  if _workerPool is not None:
+    _workerPool.terminate()
+    _workerPool.join()
+    _workerPool = None
+
+def _runParallel(task, operands, resultSize, chunks):
+  """
+    Run task(chunk) for every chunk in pool of _parallelProcesses workers.
+    Operands and result are shared (not pickled), workers write their chunks of result in place.
+    Returns flat result (array('d') or shared array).
+  """
+  if _workerPool is not None:
+    return _runInPool(task, operands, resultSize, chunks)
+  import multiprocessing
+  from multiprocessing.sharedctypes import RawArray
+  shared = [_sharedArray(x) for x in operands] + [RawArray('d', resultSize)]
+  pool = multiprocessing.Pool(_parallelProcesses, _initWorker, (shared,))
+  try:
+    pool.map(task, chunks)
+  finally:
+    pool.terminate()
+    pool.join()
+  return shared[-1]
+
+def _runInPool(task, operands, resultSize, chunks):
+  """Run task(chunk) for every chunk in persistent pool, operands and result are passed in named shared memory blocks"""
+  from multiprocessing import shared_memory
+  blocks = []
+  try:
+    for vals in operands:
+      blocks.append(shared_memory.SharedMemory(create=True, size=max(len(vals), 1)*8))
+      blocks[-1].buf[:len(vals)*8] = memoryview(vals if isinstance(vals, array) else array('d', vals)).cast('B')
+    blocks.append(shared_memory.SharedMemory(create=True, size=max(resultSize, 1)*8))
+    layout = [(block.name, len(vals)) for block, vals in zip(blocks, operands)] + [(blocks[-1].name, resultSize)]
+    _workerPool.map(_blockTask, [(task, layout, chunk) for chunk in chunks])
+    res = array('d')
+    res.frombytes(blocks[-1].buf[:resultSize*8])
+    return res
+  finally:
+    for block in blocks:
+      block.close()
+      block.unlink()
+
+def _blockTask(args):
+  """Worker: attach shared memory blocks of operands and result, run task(chunk) and detach"""
+  global _workerArrays
+  from multiprocessing import shared_memory
+  task, layout, chunk = args
+  blocks = [shared_memory.SharedMemory(name) for name, size in layout]
+  _workerArrays = [block.buf[:size*8].cast('d') for block, (name, size) in zip(blocks, layout)]
+  try:
+    task(chunk)
+  finally:
+    for view in _workerArrays:
+      view.release()
+    _workerArrays = None
+    for block in blocks:
+      block.close()
+
+def _splitRange(count, parts):
+  """Split range(count) into at most parts contiguous (start, end) ranges of close size"""
+  parts = min(parts, count)
+  return [(count*i//parts, count*(i+1)//parts) for i in range(parts)]
+
+def _mulParallel(a, b, m, k, n):
+  """Multiply flat row-major matrices a (m x k) and b (k x n) splitting rows of a between worker processes"""
+  chunks = [(i0, i1, k, n) for i0, i1 in _splitRange(m, _parallelProcesses)]
+  return _runParallel(_mulTask, [a, b], m*n, chunks)
+
+def _mulTask(chunk):
+  """Worker: multiply rows i0:i1 of shared a to shared b"""
+  i0, i1, k, n = chunk
+  a, b, res = _workerArrays
+  res[i0*n:i1*n] = array('d', _mulFlat(a[i0*k:i1*k], b[:], i1 - i0, k, n))
+
+def _mapParallel(op, *operands, **kwargs):
+  """Apply elementwise operation ("add", "sub", "round" or "floor") to flat operands in worker processes"""
+  chunks = [(op, start, end, kwargs.get("ndigits")) for start, end in _splitRange(len(operands[0]), _parallelProcesses)]
+  return _runParallel(_mapTask, operands, len(operands[0]), chunks)
+
+def _mapTask(chunk):
+  """Worker: apply elementwise operation to components start:end of shared operands"""
+  op, start, end, ndigits = chunk
+  operands, res = _workerArrays[:-1], _workerArrays[-1]
+  if op == "add":
+    res[start:end] = array('d', map(add, operands[0][start:end], operands[1][start:end]))
+  elif op == "sub":
+    res[start:end] = array('d', map(sub, operands[0][start:end], operands[1][start:end]))
+  elif op == "round":
+    res[start:end] = array('d', (round(x, ndigits) for x in operands[0][start:end]))
+  elif op == "floor":
+    res[start:end] = array('d', (float(math.floor(x)) for x in operands[0][start:end]))
+
+
+#=====================
+#  Eigenvalue solvers 
+#=====================
+
+def _sortEigenvalues(vals):
+  """Sort eigenvalues in descending order (by real part, then by imaginary part)"""
+  return sorted(vals, key=lambda z: (z.real, z.imag), reverse=True)
+
+def _eigenvaluesSymmetric(a, tolerance, maxIterations):
+  """
+    Get eigenvalues of symmetric matrix given as list of rows (destroyed).
+    Householder reduction to tridiagonal form, then QL iteration with implicit shifts. O(n^3).
+  """
+  n = len(a)
+  d = [0.]*n
+  e = [0.]*n
+  for i in range(n-1, 0, -1):
+    l = i - 1
+    h = 0.
+    if l > 0:
+      scale = sum(abs(a[i][k]) for k in range(l+1))
+      if scale == 0:
+        e[i] = a[i][l]
+      else:
+        for k in range(l+1):
+          a[i][k] /= scale
+          h += a[i][k]*a[i][k]
+        f = a[i][l]
+        g = -math.sqrt(h) if f >= 0 else math.sqrt(h)
+        e[i] = scale*g
+        h -= f*g
+        a[i][l] = f - g
+        f = 0.
+        for j in range(l+1):
+          g = 0.
+          for k in range(j+1):
+            g += a[j][k]*a[i][k]
+          for k in range(j+1, l+1):
+            g += a[k][j]*a[i][k]
+          e[j] = g/h
+          f += e[j]*a[i][j]
+        hh = f/(h+h)
+        for j in range(l+1):
+          f = a[i][j]
+          e[j] = g = e[j] - hh*f
+          for k in range(j+1):
+            a[j][k] -= f*e[k] + g*a[i][k]
+    else:
+      e[i] = a[i][l]
+  for i in range(n):
+    d[i] = a[i][i]
+
+  # QL iteration on tridiagonal matrix: diagonal d, subdiagonal e
+  e = e[1:] + [0.]
+  for l in range(n):
+    iterations = 0
+    while True:
+      m = l
+      while m < n-1:
+        dd = abs(d[m]) + abs(d[m+1])
+        if abs(e[m]) <= tolerance*dd:
+          break
+        m += 1
+      if m == l:
+        break
+      if iterations == maxIterations:
+        raise MatrixError("Eigenvalues didn't converge in {0} iterations".format(maxIterations))
+      iterations += 1
+      g = (d[l+1] - d[l])/(2.*e[l])
+      r = math.hypot(g, 1.)
+      g = d[m] - d[l] + e[l]/(g + math.copysign(r, g))
+      s = c = 1.
+      p = 0.
+      i = m - 1
+      while i >= l:
+        f = s*e[i]
+        b = c*e[i]
+        r = math.hypot(f, g)
+        e[i+1] = r
+        if r == 0:
+          d[i+1] -= p
+          e[m] = 0.
+          break
+        s = f/r
+        c = g/r
+        g = d[i+1] - p
+        r = (d[i] - g)*s + 2.*c*b
+        p = s*r
+        d[i+1] = g + p
+        g = c*r - b
+        i -= 1
+      if r == 0 and i >= l:
+        continue
+      d[l] -= p
+      e[l] = g
+      e[m] = 0.
+  return d
+
+def _eigenvaluesGeneral(a, tolerance, maxIterations):
+  """
+    Get eigenvalues of square matrix given as list of rows (destroyed).
+    Balancing, reduction to upper Hessenberg form by elimination with pivoting,
+    then Francis double shift QR iteration. O(n^3).
+    Complex eigenvalues are returned as conjugate pairs of complex numbers.
+  """
+  n = len(a)
+
+  # Balancing: scale rows and columns by powers of 2 to make their norms close
+  done = False
+  while not done:
+    done = True
+    for i in range(n):
+      c = sum(abs(a[j][i]) for j in range(n) if j != i)
+      r = sum(abs(a[i][j]) for j in range(n) if j != i)
+      if c and r:
+        s = c + r
+        f = 1.
+        g = r/2.
+        while c < g:
+          f *= 2.
+          c *= 4.
+        g = r*2.
+        while c > g:
+          f /= 2.
+          c /= 4.
+        if (c + r)/f < 0.95*s:
+          done = False
+          for j in range(n):
+            a[i][j] /= f
+            a[j][i] *= f
+
+  # Reduction to upper Hessenberg form
+  for m in range(1, n-1):
+    x = 0.
+    i = m
+    for j in range(m, n):
+      if abs(a[j][m-1]) > abs(x):
+        x = a[j][m-1]
+        i = j
+    if i != m:
+      a[i], a[m] = a[m], a[i]
+      for row in a:
+        row[i], row[m] = row[m], row[i]
+    if x:
+      for i in range(m+1, n):
+        y = a[i][m-1]
+        if y:
+          y /= x
+          a[i][m-1] = 0.
+          for j in range(m, n):
+            a[i][j] -= y*a[m][j]
+          for j in range(n):
+            a[j][m] += y*a[j][i]
+
+  # Shifted QR iteration
+  anorm = sum(abs(a[i][j]) for i in range(n) for j in range(max(i-1, 0), n))
+  res = []
+  nn = n - 1
+  t = 0.
+  while nn >= 0:
+    iterations = 0
+    while True:
+      l = nn
+      while l > 0:
+        s = abs(a[l-1][l-1]) + abs(a[l][l])
+        if s == 0:
+          s = anorm
+        if abs(a[l][l-1]) <= tolerance*s:
+          a[l][l-1] = 0.
+          break
+        l -= 1
+      x = a[nn][nn]
+      if l == nn:
+        # one real eigenvalue found
+        res.append(x + t)
+        nn -= 1
+        break
+      y = a[nn-1][nn-1]
+      w = a[nn][nn-1]*a[nn-1][nn]
+      if l == nn - 1:
+        # pair of eigenvalues found
+        p = 0.5*(y - x)
+        q = p*p + w
+        z = math.sqrt(abs(q))
+        x += t
+        if q >= 0:
+          z = p + math.copysign(z, p)
+          res.append(x + z)
+          res.append(x - w/z if z else x + z)
+        else:
+          res.append(complex(x + p, z))
+          res.append(complex(x + p, -z))
+        nn -= 2
+        break
+      if iterations == maxIterations:
+        raise MatrixError("Eigenvalues didn't converge in {0} iterations".format(maxIterations))
+      if iterations in (10, 20):
+        # exceptional shift
+        t += x
+        for i in range(nn+1):
+          a[i][i] -= x
+        s = abs(a[nn][nn-1]) + abs(a[nn-1][nn-2])
+        x = y = 0.75*s
+        w = -0.4375*s*s
+      iterations += 1
+      m = nn - 2
+      while m >= l:
+        z = a[m][m]
+        r = x - z
+        s = y - z
+        p = (r*s - w)/a[m+1][m] + a[m][m+1]
+        q = a[m+1][m+1] - z - r - s
+        r = a[m+2][m+1]
+        s = abs(p) + abs(q) + abs(r)
+        p /= s
+        q /= s
+        r /= s
+        if m == l:
+          break
+        u = abs(a[m][m-1])*(abs(q) + abs(r))
+        v = abs(p)*(abs(a[m-1][m-1]) + abs(z) + abs(a[m+1][m+1]))
+        if u <= tolerance*v:
+          break
+        m -= 1
+      for i in range(m+2, nn+1):
+        a[i][i-2] = 0.
+        if i != m+2:
+          a[i][i-3] = 0.
+      for k in range(m, nn):
+        if k != m:
+          p = a[k][k-1]
+          q = a[k+1][k-1]
+          r = a[k+2][k-1] if k != nn-1 else 0.
+          x = abs(p) + abs(q) + abs(r)
+          if x != 0:
+            p /= x
+            q /= x
+            r /= x
+        s = math.copysign(math.sqrt(p*p + q*q + r*r), p)
+        if s != 0:
+          if k == m:
+            if l != m:
+              a[k][k-1] = -a[k][k-1]
+          else:
+            a[k][k-1] = -s*x
+          p += s
+          x = p/s
+          y = q/s
+          z = r/s
+          q /= p
+          r /= p
+          for j in range(k, nn+1):
+            p = a[k][j] + q*a[k+1][j]
+            if k != nn-1:
+              p += r*a[k+2][j]
+              a[k+2][j] -= p*z
+            a[k+1][j] -= p*y
+            a[k][j] -= p*x
+          for i in range(l, min(nn, k+3)+1):
+            p = x*a[i][k] + y*a[i][k+1]
+            if k != nn-1:
+              p += z*a[i][k+2]
+              a[i][k+2] -= p*r
+            a[i][k+1] -= p*q
+            a[i][k] -= p
+  return res
+
+
+#==================
+#  Krylov solvers 
+#==================
+
+def solveCG(operator, b, x0=None, tolerance=1e-8, maxIterations=None, preconditioner=None, callback=None):
+  """
+    Get solution x (Vector) of linear system operator*x == b with symmetric positive-definite operator
+    by preconditioned conjugate gradient method. Operator is used only through products with vectors,
+    so it is never densified.
+    operator: square Matrix (including structured ones), SparseMatrix, TiledMatrix or callable getting
+              product with a Vector (Vector or iterable of numbers is expected)
+    b: right-hand side Vector
+    x0: initial guess Vector (zero vector if omitted)
+    tolerance: relative residual norm ||b - operator*x|| / ||b|| to stop at
+    maxIterations: max number of iterations (10*n if omitted), MatrixError is raised if exceeded
+    preconditioner: "jacobi", "ilu" (see PRECONDITIONERS), callable getting approximate solution of
+                    operator*z == r for a Vector r or None. "jacobi" needs a matrix operator, "ilu" an
+                    in-memory one (not TiledMatrix), TypeError is raised for other operators
+    callback: callable called after each iteration with its number (from 1) and residual norm
+  """
+  product, precondition, rhs, x, maxIterations = _krylovArguments(operator, b, x0, maxIterations, preconditioner)
+  limit = tolerance*(_norm(rhs) or 1.)
+  r = _combine(rhs, -1., product(x))
+  if _norm(r) <= limit:
+    return Vector._fromFlat(x, b.backend)
+  z = precondition(r) if precondition else r
+  p = z
+  rz = _dot(r, z)
+  for iteration in range(1, maxIterations+1):
+    q = product(p)
+    pq = _dot(p, q)
+    if pq == 0:
+      raise MatrixError("Conjugate gradient method broke down. Operator isn't positive-definite")
+    alpha = rz / pq
+    x = _combine(x, alpha, p)
+    r = _combine(r, -alpha, q)
+    residual = _norm(r)
+    if callback is not None:
+      callback(iteration, residual)
+    if residual <= limit:
+      return Vector._fromFlat(x, b.backend)
+    z = precondition(r) if precondition else r
+    rzNext = _dot(r, z)
+    p = _combine(z, rzNext / rz, p)
+    rz = rzNext
+  raise MatrixError("Conjugate gradient method didn't converge in {0} iterations".format(maxIterations))
+
+def solveGMRES(operator, b, x0=None, tolerance=1e-8, maxIterations=None, preconditioner=None, callback=None, restart=30):
+  """
+    Get solution x (Vector) of linear system operator*x == b with any non-singular operator by restarted
+    GMRES method with right preconditioning (callback gets estimated norm of true residual).
+    Arguments are the same as for solveCG.
+    restart: number of iterations between restarts (size of Krylov subspace)
+  """
+  if not (isinstance(restart, numbers.Integral) and restart > 0):
+    raise ValueError("Restart should be an int > 0. {0} passed instead".format(restart))
+  product, precondition, rhs, x, maxIterations = _krylovArguments(operator, b, x0, maxIterations, preconditioner)
+  limit = tolerance*(_norm(rhs) or 1.)
+  iteration = 0
+  while True:
+    r = _combine(rhs, -1., product(x))
+    beta = _norm(r)
+    if beta <= limit:
+      return Vector._fromFlat(x, b.backend)
+    if iteration >= maxIterations:
+      raise MatrixError("GMRES method didn't converge in {0} iterations".format(maxIterations))
+    # Arnoldi process with modified Gram-Schmidt, Hessenberg matrix is reduced to triangular one R by
+    # Givens rotations (cs, sn) applied to residual vector g as well
+    basis = [[v / beta for v in r]]
+    directions, columns, cs, sn, g = [], [], [], [], [beta]
+    for j in range(min(restart, maxIterations - iteration)):
+      z = precondition(basis[j]) if precondition else basis[j]
+      w = product(z)
+      h = []
+      for v in basis:
+        hij = _dot(w, v)
+        w = _combine(w, -hij, v)
+        h.append(hij)
+      hNext = _norm(w)
+      for i in range(j):
+        h[i], h[i+1] = cs[i]*h[i] + sn[i]*h[i+1], cs[i]*h[i+1] - sn[i]*h[i]
+      rho = math.hypot(h[j], hNext)
+      if rho == 0:
+        raise MatrixError("GMRES method broke down. Operator is singular")
+      cs.append(h[j] / rho)
+      sn.append(hNext / rho)
+      h[j] = rho
+      g.append(-sn[j]*g[j])
+      g[j] *= cs[j]
+      directions.append(z)
+      columns.append(h)
+      iteration += 1
+      if callback is not None:
+        callback(iteration, abs(g[j+1]))
+      if abs(g[j+1]) <= limit or hNext == 0:
+        break
+      basis.append([v / hNext for v in w])
+    y = [0.]*len(columns)
+    for i in range(len(columns)-1, -1, -1):
+      y[i] = (g[i] - sum(columns[k][i]*y[k] for k in range(i+1, len(columns)))) / columns[i][i]
+    for yi, z in zip(y, directions):
+      x = _combine(x, yi, z)
+
+def solveBiCGSTAB(operator, b, x0=None, tolerance=1e-8, maxIterations=None, preconditioner=None, callback=None):
+  """
+    Get solution x (Vector) of linear system operator*x == b with any non-singular operator by
+    biconjugate gradient stabilized method with right preconditioning (two products per iteration).
+    Arguments are the same as for solveCG.
+  """
+  product, precondition, rhs, x, maxIterations = _krylovArguments(operator, b, x0, maxIterations, preconditioner)
+  limit = tolerance*(_norm(rhs) or 1.)
+  r = _combine(rhs, -1., product(x))
+  if _norm(r) <= limit:
+    return Vector._fromFlat(x, b.backend)
+  shadow = r
+  rho = alpha = omega = 1.
+  p = v = [0.]*len(r)
+  for iteration in range(1, maxIterations+1):
+    rhoNext = _dot(shadow, r)
+    if rhoNext == 0 or omega == 0:
+      raise MatrixError("BiCGSTAB method broke down")
+    p = _combine(r, (rhoNext / rho)*(alpha / omega), _combine(p, -omega, v))
+    rho = rhoNext
+    pHat = precondition(p) if precondition else p
+    v = product(pHat)
+    sv = _dot(shadow, v)
+    if sv == 0:
+      raise MatrixError("BiCGSTAB method broke down")
+    alpha = rho / sv
+    x = _combine(x, alpha, pHat)
+    s = _combine(r, -alpha, v)
+    residual = _norm(s)
+    if residual <= limit:
+      if callback is not None:
+        callback(iteration, residual)
+      return Vector._fromFlat(x, b.backend)
+    sHat = precondition(s) if precondition else s
+    t = product(sHat)
+    tt = _dot(t, t)
+    omega = _dot(t, s) / tt if tt else 0.
+    x = _combine(x, omega, sHat)
+    r = _combine(s, -omega, t)
+    residual = _norm(r)
+    if callback is not None:
+      callback(iteration, residual)
+    if residual <= limit:
+      return Vector._fromFlat(x, b.backend)
+  raise MatrixError("BiCGSTAB method didn't converge in {0} iterations".format(maxIterations))
+
+def _krylovArguments(operator, b, x0, maxIterations, preconditioner):
+  """Get tuple (product, precondition, rhs, x, maxIterations) of validated arguments of Krylov solvers (lists for vectors)"""
+  if not isinstance(b, Vector):
+    raise TypeError("Right-hand side should be a Vector. {0} passed instead".format(type(b)))
+  n = len(b)
+  if x0 is None:
+    x = [0.]*n
+  elif isinstance(x0, Vector) and len(x0) == n:
+    x = list(x0._vals)
+  else:
+    raise MatrixError("Initial guess should be a Vector of size {0}".format(n))
+  if maxIterations is None:
+    maxIterations = 10*n
+  elif not (isinstance(maxIterations, numbers.Integral) and maxIterations > 0):
+    raise ValueError("Max number of iterations should be an int > 0. {0} passed instead".format(maxIterations))
+  product = _operatorProduct(operator, n)
+  return product, _preconditioner(preconditioner, operator, n), list(b._vals), x, maxIterations
+
+def _operatorProduct(operator, n):
+  """Get function computing list of components of operator*x for list x"""
+  if isinstance(operator, (Matrix, SparseMatrix, TiledMatrix)):
+    if operator.size != (n, n):
+      raise MatrixError("Operator should be a square matrix of size {0}. Size is {1}".format(n, operator.size))
+    return lambda x: list((operator*Vector._fromFlat(x, "python"))._vals)
+  if callable(operator):
+    return _callableProduct(operator, n)
+  raise TypeError("Operator should be a Matrix, a SparseMatrix, a TiledMatrix or a callable. {0} passed instead".format(type(operator)))
+
+def _callableProduct(func, n):
+  """Get function computing list of components of func(Vector) for list x, func returns Vector or iterable of numbers"""
+  def product(x):
+    res = func(Vector._fromFlat(x, "python"))
+    if isinstance(res, Matrix):
+      res = res.asVector()
+    res = [float(v) for v in res]
+    if len(res) != n:
+      raise MatrixError("Operator returned {0} components, {1} expected".format(len(res), n))
+    return res
+  return product
+
+def _preconditioner(preconditioner, operator, n):
+  """Get function computing approximate solution list of operator*z == r for list r (None if there is no preconditioner)"""
+  if preconditioner is None:
+    return None
+  if preconditioner in PRECONDITIONERS:
+    supported = (Matrix, SparseMatrix, TiledMatrix) if preconditioner == "jacobi" else (Matrix, SparseMatrix)
+    if not isinstance(operator, supported):
+      raise TypeError("Preconditioner {0!r} can't be used with {1} operator".format(preconditioner, type(operator).__name__))
+  if preconditioner == "jacobi":
+    diagonal = list(operator.getDiagonal())
+    if not all(diagonal):
+      raise MatrixError("Jacobi preconditioner can't be used. Operator has zero on the diagonal")
+    inverse = [1./d for d in diagonal]
+    return lambda r: list(map(mul, inverse, r))
+  if preconditioner == "ilu":
+    if isinstance(operator, SparseMatrix):
+      return _incompleteLU(operator)
+    if isinstance(operator, _StructuredMatrix):
+      return _incompleteLU(operator._sparse())
+    return _incompleteLU(SparseMatrix.FromDense(operator))
+  if callable(preconditioner):
+    return _callableProduct(preconditioner, n)
+  raise ValueError("Preconditioner should be one of {0}, a callable or None. {1!r} passed instead".format(PRECONDITIONERS, preconditioner))
+
+def _incompleteLU(a):
+  """
+    Get function solving L*U*z == r for list r, where unit lower L and upper U are incomplete LU
+    factors of square SparseMatrix a keeping its sparsity pattern (ILU(0), IKJ variant). O(nnz) per solve.
+  """
+  n = a._rowsCount
+  rows = []
+  diagonal = []
+  for i in range(n):
+    start, stop = a._indptr[i], a._indptr[i+1]
+    cols, vals = a._indices[start:stop].tolist(), a._data[start:stop].tolist()
+    positions = dict((j, k) for k, j in enumerate(cols))
+    for k, j in enumerate(cols):
+      if j >= i:
+        break
+      pivotCols, pivotVals = rows[j]
+      factor = vals[k] = vals[k] / pivotVals[diagonal[j]]
+      for kk in range(diagonal[j]+1, len(pivotCols)):
+        p = positions.get(pivotCols[kk])
+        if p is not None:
+          vals[p] -= factor*pivotVals[kk]
+    d = positions.get(i)
+    if d is None or vals[d] == 0:
+      raise MatrixError("ILU preconditioner can't be computed. Zero pivot in row {0}".format(i))
+    rows.append((cols, vals))
+    diagonal.append(d)
+  
+  def solve(r):
+    z = list(r)
+    for i in range(n):
+      cols, vals = rows[i]
+      z[i] -= sum(vals[k]*z[cols[k]] for k in range(diagonal[i]))
+    for i in range(n-1, -1, -1):
+      cols, vals = rows[i]
+      d = diagonal[i]
+      z[i] = (z[i] - sum(vals[k]*z[cols[k]] for k in range(d+1, len(cols)))) / vals[d]
+    return z
+  return solve
+
+def _dot(x, y):
+  """Get dot product of lists x and y"""
+  return sum(map(mul, x, y))
+
+def _combine(x, factor, y):
+  """Get list x + factor*y for lists x and y"""
+  return [u + factor*v for u, v in zip(x, y)]